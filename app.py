@@ -5,37 +5,58 @@ Modern GUI untuk membuat short-form content dari video YouTube
 
 import os
 import sys
-import json
 import threading
-import queue
 import customtkinter as ctk
 from tkinter import filedialog, colorchooser
-import cv2
-import numpy as np
-import mediapipe as mp
-import whisper
-import yt_dlp
-import torch
-import shutil
-from groq import Groq
-from moviepy.editor import VideoFileClip, TextClip, CompositeVideoClip, ImageClip
-from PIL import Image, ImageDraw, ImageFont
+from job_manifest import JobManifest
+from pipeline_scheduler import Scheduler
+from workspace import WorkspaceManager, WorkspaceBusy
+from cancellation import CancelToken
+from ui_channel import UIChannel
+from progress import format_eta
+from stage_profiler import Profiler
+from lazy_imports import prewarm
+import core
 
 # Set appearance
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+LOG_MAX_LINES = 2000  # Scrollback log di GUI (baris lama dibuang)
+PROGRESS_INTERVAL = 0.5  # Detik antar update speed/ETA dari tracking, transkripsi, encode
+PREWARM_MODULES = ("torch", "whisper", "cv2", "moviepy.editor", "yt_dlp", "groq")
+
+# Rentang progress bar per stage: (awal, akhir)
+PROGRESS_STAGES = {
+    'source': (0.1, 0.2),
+    'audio': (0.2, 0.3),
+    'transcribe': (0.3, 0.4),
+    'plan': (0.4, 0.5),
+    'clips': (0.5, 1.0),
+    'done': (1.0, 1.0),
+}
+PROGRESS_ICONS = {'source': "📥 ", 'transcribe': "🎤 ", 'plan': "🤖 ", 'clips': "🎬 ", 'done': "✅ "}
+
 class LogRedirector:
-    """Redirect print output to GUI log"""
-    def __init__(self, log_queue):
-        self.log_queue = log_queue
+    """Redirect print output to GUI log (satu pesan per baris, bukan per fragmen write)"""
+    def __init__(self, channel):
+        self.channel = channel
+        self._buffer = ""
+        self._lock = threading.Lock()
 
     def write(self, text):
-        if text.strip():
-            self.log_queue.put(("INFO", text.strip()))
+        with self._lock:
+            self._buffer += text
+            *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                self.channel.log("INFO", line.strip())
 
     def flush(self):
-        pass
+        with self._lock:
+            line, self._buffer = self._buffer, ""
+        if line.strip():
+            self.channel.log("INFO", line.strip())
 
 class AIAutoShortsApp(ctk.CTk):
     def __init__(self):
@@ -45,10 +66,14 @@ class AIAutoShortsApp(ctk.CTk):
         self.geometry("900x750")
         self.minsize(800, 700)
 
-        # Queue untuk log messages
-        self.log_queue = queue.Queue()
+        # Channel log + progress dari worker thread, dibaca GUI tiap tick
+        self.ui = UIChannel()
+        self.log_lines = 0
+        self.progress_value = 0.0
         self.is_processing = False
-        self.cancel_flag = False
+        self.cancel_token = CancelToken()
+        # Log, progress stage, dan speed/ETA dari engine (core.py) masuk ke channel yang sama
+        core.set_reporter(log=self.log, progress=self.progress, emit=self.ui.meter_event, interval=PROGRESS_INTERVAL)
 
         # Default values
         self.default_config = {
@@ -58,11 +83,27 @@ class AIAutoShortsApp(ctk.CTk):
             'stroke_color': '#000000',
             'stroke_width': 3,
             'text_position': 0.75,
+            'dedupe_iou': 0.6,  # Klip AI dengan IoU di atas ini dianggap duplikat
+            'workers': max(1, (os.cpu_count() or 2) // 2),  # Tracking/render paralel
+            'scratch_budget_mb': 4096,  # Maks file sementara per job (tmpfs jika muat)
+            'cache_budget_mb': 20480,   # Maks total cache video sumber di temp/jobs
+            # Profiling per tahap (opt-in): laporan JSON di folder profiles/
+            'profile': os.getenv("AUTOSHORTS_PROFILE") == "1",
+            'profile_capture': os.getenv("AUTOSHORTS_PROFILE_CAPTURE"),  # misal "render:0" -> cProfile
+            # Engine (lihat core.DEFAULTS): GUI memakai Haar + subtitle PIL (tanpa ImageMagick)
+            'language': None,  # Auto-detect bahasa
+            'detector': 'haar',
+            'smooth_window': 30,  # Lebih halus dari CLI
+            'subtitle_renderer': 'pil',
+            'clip_name': '{title}',  # Judul dari AI langsung jadi nama file
+            'save_transcript': True,
             'output_dir': os.path.join(os.getcwd(), 'hasil_shorts')
         }
 
         self.create_widgets()
         self.check_log_queue()
+        # Setelah jendela tampil: import backend di background selagi user mengisi form
+        self.after(300, lambda: prewarm(*PREWARM_MODULES, log=lambda msg: self.log("WARNING", msg)))
 
     def create_widgets(self):
         # Main container with scrollable frame
@@ -447,31 +488,51 @@ class AIAutoShortsApp(ctk.CTk):
             self.log("ERROR", f"Folder tidak ditemukan: {folder}")
 
     def log(self, level, message):
-        self.log_queue.put((level, message))
+        self.ui.log(level, message)
+
+    def progress(self, stage, done=0, total=None, text=None):
+        """Structured progress event (aman dipanggil dari worker thread)"""
+        self.ui.progress(stage, done, total, text)
 
     def check_log_queue(self):
-        """Check log queue and update GUI"""
-        try:
-            while True:
-                level, message = self.log_queue.get_nowait()
-
-                # Color coding
-                if level == "SUCCESS":
-                    tag = "✅ "
-                elif level == "ERROR":
-                    tag = "❌ "
-                elif level == "WARNING":
-                    tag = "⚠️ "
-                else:
-                    tag = "ℹ️ "
-
-                self.log_text.insert("end", f"{tag}{message}\n")
-                self.log_text.see("end")
-        except queue.Empty:
-            pass
+        """Drain the UI channel once per tick: one textbox insert, latest progress only"""
+        lines, latest = self.ui.drain()
+
+        if lines:
+            # Color coding
+            tags = {"SUCCESS": "✅ ", "ERROR": "❌ ", "WARNING": "⚠️ "}
+            chunk = "".join(f"{tags.get(level, 'ℹ️ ')}{message}\n" for level, message in lines)
+            self.log_text.insert("end", chunk)
+            self.log_lines += chunk.count("\n")
+            # Ring buffer: buang baris terlama (per blok 10% supaya tidak delete tiap tick)
+            if self.log_lines > LOG_MAX_LINES * 1.1:
+                excess = self.log_lines - LOG_MAX_LINES
+                self.log_text.delete("1.0", f"{excess + 1}.0")
+                self.log_lines -= excess
+            self.log_text.see("end")
+
+        if latest:
+            self.apply_progress(max(latest.values(), key=lambda e: e['time']))
 
         self.after(100, self.check_log_queue)
 
+    def apply_progress(self, event):
+        lo, hi = PROGRESS_STAGES.get(event['stage'], (self.progress_value, self.progress_value))
+        fraction = event['done'] / event['total'] if event['total'] else 0.0
+        # Stage bisa overlap, bar tidak pernah mundur dalam satu job
+        self.progress_value = max(self.progress_value, lo + (hi - lo) * fraction)
+
+        text = PROGRESS_ICONS.get(event['stage'], "") + (event['text'] or event['stage'])
+        if event['total'] and event['stage'] != 'done':
+            text += f"  {event['done']:.0f}/{event['total']:.0f}"
+            if event['unit']:
+                text += f" {event['unit']}"
+            if event['rate']:
+                text += f"  ⚡ {event['rate']:.1f} {event['unit']}/s"
+            if event['eta'] is not None:
+                text += f"  ETA {format_eta(event['eta'])}"
+        self.update_progress(self.progress_value, text)
+
     def start_processing(self):
         # Validation
         if not self.api_key_var.get().strip():
@@ -494,14 +555,17 @@ class AIAutoShortsApp(ctk.CTk):
 
         # Update UI
         self.is_processing = True
-        self.cancel_flag = False
+        self.cancel_token = CancelToken()
         self.start_btn.configure(state="disabled")
         self.stop_btn.configure(state="normal")
         self.progress_bar.set(0)
+        self.progress_value = 0.0
+        self.ui.reset()
         self.progress_label.configure(text="Starting...")
 
         # Clear log
         self.log_text.delete("1.0", "end")
+        self.log_lines = 0
 
         # Get config
         config = {
@@ -518,16 +582,25 @@ class AIAutoShortsApp(ctk.CTk):
             'stroke_color': self.stroke_color_var.get(),
             'stroke_width': self.stroke_width_var.get(),
             'text_position': self.text_pos_var.get(),
+            'dedupe_iou': self.default_config['dedupe_iou'],
+            'workers': self.default_config['workers'],
+            'scratch_budget_mb': self.default_config['scratch_budget_mb'],
+            'cache_budget_mb': self.default_config['cache_budget_mb'],
+            'profile': self.default_config['profile'],
+            'profile_capture': self.default_config['profile_capture'],
             'output_dir': self.output_dir_var.get()
         }
+        for key in ('language', 'detector', 'smooth_window', 'subtitle_renderer', 'clip_name', 'save_transcript'):
+            config[key] = self.default_config[key]
 
         # Start processing in thread
-        thread = threading.Thread(target=self.process_video, args=(config,), daemon=True)
+        thread = threading.Thread(target=self.process_video, args=(config, self.cancel_token), daemon=True)
         thread.start()
 
     def stop_processing(self):
-        self.cancel_flag = True
-        self.log("WARNING", "Stopping... Please wait for current operation to finish.")
+        # Tahap yang sedang jalan (transkripsi, tracking, encode) berhenti dalam 1-2 detik
+        self.cancel_token.cancel()
+        self.log("WARNING", "Stopping current operation...")
         self.progress_label.configure(text="Stopping...")
 
     def update_progress(self, value, text):
@@ -539,7 +612,7 @@ class AIAutoShortsApp(ctk.CTk):
         self.start_btn.configure(state="normal")
         self.stop_btn.configure(state="disabled")
 
-    def process_video(self, config):
+    def process_video(self, config, token):
         """Main processing logic - runs in separate thread"""
         temp_dir = "temp"
         output_dir = config['output_dir']
@@ -551,506 +624,47 @@ class AIAutoShortsApp(ctk.CTk):
             os.makedirs(output_dir)
 
         try:
-            # 1. Get Source Video
-            source_path = None
-
-            if config['source_type'] == 'youtube':
-                # Download from YouTube
-                self.after(0, lambda: self.update_progress(0.1, "📥 Downloading video..."))
-                self.log("INFO", f"Downloading: {config['youtube_url']}")
-
-                source_path = self.download_video(config['youtube_url'], temp_dir)
-                if not source_path or self.cancel_flag:
-                    if self.cancel_flag:
-                        self.log("WARNING", "Cancelled by user")
-                    self.after(0, self.processing_finished)
-                    return
-            else:
-                # Use local file
-                self.after(0, lambda: self.update_progress(0.1, "📂 Loading local file..."))
-                self.log("INFO", f"Using local file: {config['local_file']}")
-
-                # Copy to temp dir for processing
-                source_path = f"{temp_dir}/source_video.mp4"
-                shutil.copy2(config['local_file'], source_path)
-                self.log("SUCCESS", "Local file loaded!")
-
-            self.log("SUCCESS", "Video downloaded successfully!")
-
-            # 2. Extract Audio
-            self.after(0, lambda: self.update_progress(0.2, "🎵 Extracting audio..."))
-            self.log("INFO", "Extracting audio for transcription...")
-
-            video = VideoFileClip(source_path)
-            video_duration = video.duration
-            audio_path = f"{temp_dir}/source_audio.wav"
-
-            # Check if video has audio
-            if video.audio is None:
-                self.log("ERROR", "Video tidak memiliki audio track! Coba video lain.")
-                video.close()
-                self.after(0, self.processing_finished)
-                return
-
-            video.audio.write_audiofile(audio_path, verbose=False, logger=None)
-            video.close()
-
-            # Use auto clip count or manual setting
+            # Manifest job: tahap yang sudah selesai di run sebelumnya akan di-skip
+            source = core.job_source(config)
+            workspaces = WorkspaceManager(temp_dir, scratch_budget_mb=config['scratch_budget_mb'],
+                                          cache_budget_mb=config['cache_budget_mb'])
+            manifest = JobManifest.open(workspaces.jobs_root, source)
+            self.log("INFO", f"Job ID: {manifest.job_id}")
             if config['auto_clip']:
-                # Auto mode: let user decide via slider, use that value
                 self.log("INFO", f"Auto mode: menggunakan {config['clip_count']} klip")
 
-            # No limit on clip count - user decides
-
-            self.log("SUCCESS", f"Audio extracted! Duration: {int(video_duration/60)} minutes")
-
-            if self.cancel_flag:
-                self.after(0, self.processing_finished)
-                return
-
-            # 3. Transcribe
-            self.after(0, lambda: self.update_progress(0.3, "🎤 Transcribing audio..."))
-            self.log("INFO", "Transcribing with Whisper (this may take a while)...")
-
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-            self.log("INFO", f"Using device: {device.upper()}")
-
-            model = whisper.load_model("base", device=device)
-            # language=None untuk auto-detect, task='transcribe' untuk transkripsi bahasa asli
-            whisper_result = model.transcribe(
-                audio_path,
-                language=None,  # Auto-detect language
-                task='transcribe',  # 'transcribe' = bahasa asli, 'translate' = terjemah ke English
-                fp16=False,
-                word_timestamps=True  # Enable per-word timing for subtitles
-            )
-
-            if not whisper_result:
-                self.log("ERROR", "Transcription failed!")
-                self.after(0, self.processing_finished)
-                return
-
-            # Log detected language
-            detected_lang = whisper_result.get('language', 'unknown')
-            self.log("INFO", f"Detected language: {detected_lang.upper()}")
-
-            full_text = ""
-            for seg in whisper_result['segments']:
-                full_text += f"[{seg['start']:.1f}s - {seg['end']:.1f}s] {seg['text']}\n"
-            all_words = [w for seg in whisper_result['segments'] for w in seg['words']]
-
-            # Save transcript to file with word timestamps
-            transcript_file = f"{output_dir}/transcript.txt"
-            with open(transcript_file, 'w', encoding='utf-8') as f:
-                f.write(f"=== WHISPER TRANSCRIPT ===\n")
-                f.write(f"Language: {detected_lang.upper()}\n\n")
-                f.write("--- SEGMENTS ---\n")
-                f.write(full_text)
-                f.write(f"\n--- WORD TIMESTAMPS (for subtitle) ---\n")
-                for word in all_words[:50]:  # First 50 words as sample
-                    f.write(f"[{word['start']:.2f} - {word['end']:.2f}] {word.get('word', word.get('text', ''))}\n")
-                if len(all_words) > 50:
-                    f.write(f"... and {len(all_words) - 50} more words\n")
-                f.write(f"\n=== TOTAL WORDS: {len(all_words)} ===\n")
-            self.log("INFO", f"Transcript saved to: {transcript_file}")
-
-            self.log("SUCCESS", f"Transcription complete! {len(all_words)} words detected")
-
-            if self.cancel_flag:
-                self.after(0, self.processing_finished)
-                return
-
-            # 4. Analyze with AI
-            self.after(0, lambda: self.update_progress(0.4, "🤖 AI analyzing hooks..."))
-            self.log("INFO", f"Sending to Groq AI for analysis...")
-
-            clips_data = self.analyze_hooks_with_groq(config['api_key'], full_text, config['clip_count'])
-
-            if not clips_data:
-                self.log("ERROR", "AI could not find any clips!")
-                self.after(0, self.processing_finished)
-                return
-
-            self.log("SUCCESS", f"Found {len(clips_data)} viral segments!")
-
-            if self.cancel_flag:
-                self.after(0, self.processing_finished)
-                return
-
-            # 5. Process each clip
-            total_clips = len(clips_data)
-            for i, data in enumerate(clips_data):
-                if self.cancel_flag:
-                    break
-
-                progress = 0.5 + (0.5 * i / total_clips)
-                clip_name = data.get('title', f'Clip_{i+1}')
-                self.after(0, lambda p=progress, n=clip_name: self.update_progress(p, f"🎬 Processing: {n}"))
-                self.log("INFO", f"Processing clip {i+1}/{total_clips}: {clip_name}")
-
-                self.process_single_clip(
-                    source_path,
-                    float(data['start']),
-                    float(data['end']),
-                    clip_name,  # Use hookable title from AI as filename
-                    all_words,
-                    config,
-                    temp_dir,
-                    output_dir
-                )
-
-            if self.cancel_flag:
+            # Workspace unik per job (aman untuk beberapa GUI sekaligus), scratch-nya
+            # selalu dihapus saat selesai, gagal, atau Stop.
+            # Tahap-tahap berjalan lewat scheduler supaya tracking klip berikutnya
+            # bisa overlap dengan render klip sebelumnya
+            with workspaces.open(manifest.job_dir) as ws:
+                self.log("INFO", f"Workspace: {ws.scratch_dir}{' (tmpfs)' if ws.on_tmpfs else ''}")
+                profiler = Profiler("profiles", config['profile_capture']) if config['profile'] else None
+                with Scheduler(io_workers=2, cpu_workers=config['workers'], cpu_processes=False, log=self.log,
+                               profiler=profiler) as sched:
+                    core.schedule_job(sched, manifest, config, ws, token)
+                    errors = sched.run(cancel=token.cancelled)
+                # Decoder video sumber job ini tidak dipakai lagi (GUI tetap hidup antar job)
+                core.close_sources()
+
+            if profiler is not None:
+                self.log("INFO", f"Profile report: {profiler.write_report(manifest.job_id, source=source)}")
+
+            if token.cancelled():
                 self.log("WARNING", "Processing cancelled by user")
+            elif errors:
+                self.log("ERROR", f"{len(errors)} step(s) failed - run again to resume from the last finished step")
             else:
                 self.log("SUCCESS", f"🎉 All done! Check folder: {output_dir}")
-                self.after(0, lambda: self.update_progress(1.0, "✅ Complete!"))
+                self.progress('done', text="Complete!")
 
+        except WorkspaceBusy as e:
+            self.log("ERROR", f"{e} - tunggu proses lain selesai")
         except Exception as e:
             self.log("ERROR", f"Error: {str(e)}")
         finally:
             self.after(0, self.processing_finished)
 
-    def download_video(self, url, temp_dir):
-        """Download YouTube video"""
-        output_path = f"{temp_dir}/source_video.mp4"
-        if os.path.exists(output_path):
-            os.remove(output_path)
-
-        ydl_opts = {
-            # Prioritize 1080p, then 720p, with audio merged
-            'format': 'bestvideo[height>=720][height<=1080]+bestaudio/bestvideo+bestaudio/best',
-            'outtmpl': f"{temp_dir}/raw_video.%(ext)s",
-            'merge_output_format': 'mp4',
-            'quiet': True,
-            'no_warnings': True,
-            'socket_timeout': 30,
-            'retries': 5,
-            'postprocessors': [{
-                'key': 'FFmpegVideoConvertor',
-                'preferedformat': 'mp4',
-            }],
-        }
-
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
-
-            for file in os.listdir(temp_dir):
-                if file.startswith("raw_video"):
-                    src = os.path.join(temp_dir, file)
-                    if file.endswith(".mp4"):
-                        shutil.move(src, output_path)
-                        return output_path
-                    elif os.path.exists(src):
-                        # Convert to mp4 if needed
-                        shutil.move(src, output_path)
-                        return output_path
-            return None
-        except Exception as e:
-            self.log("ERROR", f"Download failed: {str(e)}")
-            return None
-
-    def analyze_hooks_with_groq(self, api_key, transcript_text, num_clips):
-        """Analyze transcript with Groq AI"""
-        client = Groq(api_key=api_key)
-        safe_text = transcript_text[:25000]
-
-        prompt = f"""
-        You are a professional Video Editor specialized in creating viral short-form content.
-        Analyze this transcript and find exactly {num_clips} compelling segments for TikTok/YouTube Shorts.
-
-        DURATION RULES:
-        - Each clip MUST be 30-60 seconds long
-        - Duration = end - start must be between 30 and 60 seconds
-
-        CUTTING RULES (VERY IMPORTANT):
-        - Use the EXACT timestamps from the transcript to determine start/end points
-        - START each clip at the BEGINNING of a sentence (use the start timestamp of that line)
-        - END each clip at the END of a complete sentence (use the end timestamp of that line)
-        - NEVER cut in the middle of a sentence
-        - Look for natural pauses, transitions, or topic changes between lines
-
-        CONTENT CRITERIA:
-        1. Strong hook in first 3-5 seconds (question, bold statement, surprising fact)
-        2. Self-contained context - viewer should understand without prior context
-        3. Emotional impact or valuable information
-        4. Clear beginning and satisfying ending
-
-        TRANSCRIPT FORMAT: [start_time - end_time] text
-        Each line shows when that sentence starts and ends.
-
-        TRANSCRIPT:
-        {safe_text}
-
-        OUTPUT FORMAT - Return STRICT JSON ONLY:
-        [
-          {{ "start": 120.0, "end": 165.0, "title": "Rahasia Sukses Terungkap" }},
-          {{ "start": 300.5, "end": 350.0, "title": "Jangan Lakukan Ini" }}
-        ]
-
-        TITLE RULES:
-        - Create CATCHY, HOOKABLE titles that make people want to watch
-        - Use Indonesian language for titles
-        - Use NORMAL SPACES between words (NOT underscores)
-        - Keep titles short (3-6 words)
-        - Examples: "Rahasia Sukses Terungkap", "Jangan Lakukan Ini", "Fakta Mengejutkan"
-
-        Make sure each segment starts and ends at natural speech boundaries!
-        """
-
-        try:
-            chat_completion = client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that outputs only valid JSON. Each clip MUST be 30-60 seconds long."},
-                    {"role": "user", "content": prompt}
-                ],
-                model="llama-3.3-70b-versatile",
-                temperature=0.6,
-                response_format={"type": "json_object"},
-            )
-            result_content = chat_completion.choices[0].message.content
-            data = json.loads(result_content)
-
-            clips = []
-            if isinstance(data, list):
-                clips = data
-            elif isinstance(data, dict):
-                for k, v in data.items():
-                    if isinstance(v, list):
-                        clips = v
-                        break
-
-            # Validate and filter clips - enforce 30-60 second rule
-            valid_clips = []
-            for clip in clips:
-                try:
-                    start = float(clip.get('start', 0))
-                    end = float(clip.get('end', 0))
-                    duration = end - start
-
-                    if duration < 30:
-                        # Extend clip to 30 seconds if too short
-                        self.log("WARNING", f"Clip '{clip.get('title', 'Unknown')}' too short ({duration:.1f}s), extending to 30s")
-                        clip['end'] = start + 30
-                    elif duration > 60:
-                        # Trim clip to 60 seconds if too long
-                        self.log("WARNING", f"Clip '{clip.get('title', 'Unknown')}' too long ({duration:.1f}s), trimming to 60s")
-                        clip['end'] = start + 60
-
-                    valid_clips.append(clip)
-                except:
-                    continue
-
-            return valid_clips
-        except Exception as e:
-            self.log("ERROR", f"Groq API Error: {str(e)}")
-            return []
-
-    def process_single_clip(self, source_video, start_t, end_t, clip_name, segment_words, config, temp_dir, output_dir):
-        """Process a single clip with face tracking and subtitles"""
-        try:
-            full_clip = VideoFileClip(source_video)
-            if end_t > full_clip.duration:
-                end_t = full_clip.duration
-            clip = full_clip.subclip(start_t, end_t)
-
-            # Save temp file for face detection
-            temp_sub = f"{temp_dir}/temp_{clip_name}.mp4"
-            clip.write_videofile(temp_sub, codec='libx264', audio_codec='aac', logger=None)
-
-            # Face tracking with OpenCV Haar Cascade (more reliable than mediapipe)
-            cap = cv2.VideoCapture(temp_sub)
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-
-            centers = []
-
-            try:
-                # Use OpenCV's built-in Haar Cascade face detector
-                face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-
-                frame_skip = 2  # Process every 2nd frame for better accuracy
-                frame_idx = 0
-                last_x_c = width // 2
-                face_found_count = 0
-
-                while True:
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
-
-                    if frame_idx % frame_skip == 0:
-                        # Resize for faster detection (keeping more resolution for accuracy)
-                        scale = 0.4
-                        small_frame = cv2.resize(frame, (0, 0), fx=scale, fy=scale)
-                        gray = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY)
-
-                        # Use lower scaleFactor for more accurate detection
-                        faces = face_cascade.detectMultiScale(
-                            gray,
-                            scaleFactor=1.05,  # More accurate
-                            minNeighbors=4,    # More sensitive
-                            minSize=(20, 20)   # Detect smaller faces
-                        )
-
-                        if len(faces) > 0:
-                            # Get the largest face
-                            largest_face = max(faces, key=lambda f: f[2] * f[3])
-                            x, y, w, h = largest_face
-                            # Scale back to original size and get face center
-                            face_center_x = int((x + w/2) / scale)
-
-                            # Smooth transition - don't jump too fast
-                            max_jump = width * 0.05  # Max 5% of width per detection
-                            diff = face_center_x - last_x_c
-                            if abs(diff) > max_jump:
-                                face_center_x = last_x_c + (max_jump if diff > 0 else -max_jump)
-
-                            last_x_c = int(face_center_x)
-                            face_found_count += 1
-
-                    centers.append(last_x_c)
-                    frame_idx += 1
-
-                self.log("INFO", f"Face tracking: analyzed {len(centers)} frames, {face_found_count} faces detected")
-
-            except Exception as e:
-                # Fallback: use center crop if face detection fails
-                self.log("WARNING", f"Face tracking failed, using center crop: {str(e)[:50]}")
-                cap.release()
-                cap = cv2.VideoCapture(temp_sub)
-                frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                centers = [width // 2] * max(1, frame_count)
-
-            cap.release()
-
-            if not centers:
-                centers = [width//2]
-
-            # Apply stronger smoothing to prevent jerky movement
-            window = 30  # Larger window for smoother tracking
-            if len(centers) > window:
-                centers = np.convolve(centers, np.ones(window)/window, mode='same')
-
-            # Crop function for 9:16 portrait
-            def crop_fn(get_frame, t):
-                idx = int(t * fps)
-                safe_idx = min(idx, len(centers)-1)
-                cx = centers[safe_idx]
-                img = get_frame(t)
-                h, w = img.shape[:2]
-                target_width = int(h * 9/16)
-                # Ensure target_width is even (required by H.264 encoder)
-                target_width = target_width - (target_width % 2)
-                x1 = int(cx - target_width/2)
-                x1 = max(0, min(w - target_width, x1))
-                return img[:, x1:x1+target_width]
-
-            # Resize to 1080x1920 (even dimensions for H.264)
-            final_clip = clip.fl(crop_fn, apply_to=['mask']).resize((1080, 1920))
-
-            # Add subtitles (if enabled)
-            subs = []
-            if config.get('enable_subtitle', True):
-                vid_w, vid_h = final_clip.w, final_clip.h
-                valid_words = [w for w in segment_words if w['start'] >= start_t and w['end'] <= end_t]
-
-                self.log("INFO", f"Adding subtitles: {len(valid_words)} words found")
-
-                # Try to load font
-                try:
-                    font_path = "C:/Windows/Fonts/impact.ttf"
-                    if not os.path.exists(font_path):
-                        font_path = "C:/Windows/Fonts/arial.ttf"
-                    font = ImageFont.truetype(font_path, config['font_size'])
-                except:
-                    font = ImageFont.load_default()
-
-                for w in valid_words:
-                    try:
-                        raw_text = w.get('word', w.get('text', '')).strip()
-                        if not raw_text:
-                            continue
-
-                        text = raw_text.upper()
-                        color = config['font_color_alt'] if len(text) <= 3 else config['font_color']
-                        pos_y = int(vid_h * config['text_position'])
-
-                        # Create text image with PIL
-                        # Calculate text size
-                        dummy_img = Image.new('RGBA', (1, 1), (0, 0, 0, 0))
-                        dummy_draw = ImageDraw.Draw(dummy_img)
-                        bbox = dummy_draw.textbbox((0, 0), text, font=font)
-                        text_w = bbox[2] - bbox[0] + 20
-                        text_h = bbox[3] - bbox[1] + 20
-
-                        # Create transparent image with text
-                        txt_img = Image.new('RGBA', (text_w, text_h), (0, 0, 0, 0))
-                        draw = ImageDraw.Draw(txt_img)
-
-                        # Convert hex color to RGB
-                        stroke_c = config['stroke_color'].lstrip('#')
-                        stroke_rgb = tuple(int(stroke_c[i:i+2], 16) for i in (0, 2, 4))
-                        font_c = color.lstrip('#')
-                        font_rgb = tuple(int(font_c[i:i+2], 16) for i in (0, 2, 4))
-
-                        # Draw text with stroke
-                        x, y = 10, 10
-                        stroke_w = config['stroke_width']
-                        for dx in range(-stroke_w, stroke_w+1):
-                            for dy in range(-stroke_w, stroke_w+1):
-                                draw.text((x+dx, y+dy), text, font=font, fill=stroke_rgb)
-                        draw.text((x, y), text, font=font, fill=font_rgb)
-
-                        # Convert to numpy array and create ImageClip
-                        txt_array = np.array(txt_img)
-                        txt_clip = (ImageClip(txt_array, ismask=False)
-                            .set_position(('center', pos_y))
-                            .set_start(w['start'] - start_t)
-                            .set_end(w['end'] - start_t)
-                            .set_duration(w['end'] - w['start']))
-
-                        subs.append(txt_clip)
-                    except Exception as e:
-                        self.log("WARNING", f"Subtitle error: {str(e)[:50]}")
-                        continue
-
-                self.log("INFO", f"Created {len(subs)} subtitle clips")
-            else:
-                self.log("INFO", "Subtitles disabled")
-
-            final = CompositeVideoClip([final_clip] + subs)
-
-            # Output - replace spaces with underscores for filename
-            safe_name = "".join([c if c.isalnum() else '_' for c in clip_name]).strip('_')
-            # Remove multiple consecutive underscores
-            while '__' in safe_name:
-                safe_name = safe_name.replace('__', '_')
-            output_filename = f"{output_dir}/{safe_name}.mp4"
-
-            final.write_videofile(
-                output_filename,
-                codec='libx264',
-                audio_codec='aac',
-                fps=24,
-                preset='fast',
-                threads=4,
-                logger=None,
-                ffmpeg_params=['-pix_fmt', 'yuv420p', '-profile:v', 'baseline', '-level', '3.0']
-            )
-
-            full_clip.close()
-            final.close()
-
-            if os.path.exists(temp_sub):
-                os.remove(temp_sub)
-
-            self.log("SUCCESS", f"Saved: {output_filename}")
-
-        except Exception as e:
-            self.log("ERROR", f"Failed to process {clip_name}: {str(e)}")
-
 
 if __name__ == "__main__":
     # Load env if available
@@ -1061,4 +675,11 @@ if __name__ == "__main__":
         pass
 
     app = AIAutoShortsApp()
-    app.mainloop()
+    # print() dari library (yt-dlp, whisper, dll.) ikut tampil di log GUI, per baris utuh
+    stdout = sys.stdout
+    sys.stdout = LogRedirector(app.ui)
+    try:
+        app.mainloop()
+    finally:
+        sys.stdout.flush()
+        sys.stdout = stdout
@@ -0,0 +1,255 @@
+"""
+AI Auto Shorts - Headless Batch Mode
+Memproses banyak URL/file tanpa GUI lewat antrian job lokal yang persisten.
+
+Contoh:
+    python batch.py jobs.txt --concurrency 2
+    python batch.py --status
+
+Format jobs.txt (satu job per baris, '#' untuk komentar):
+    https://www.youtube.com/watch?v=xxxx
+    D:/video/podcast.mp4
+    {"source": "https://youtu.be/yyyy", "clip_count": 3, "font_color": "#FFFFFF"}
+File .json berisi list dengan isi yang sama juga didukung.
+
+Default config job = profil CLI (`main.DEFAULT_CONFIG`: nilai di atas main.py + .env, subtitle
+TextClip/ImageMagick, detektor mediapipe), bukan setting GUI. Pakai `--defaults gui` untuk
+pilihan engine GUI, dan/atau `--config` + override per baris untuk mengganti nilainya.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from contextlib import ExitStack
+
+import main as cli
+import core
+from job_queue import JobQueue
+from job_manifest import JobManifest
+from pipeline_scheduler import Scheduler
+from cancellation import CancelToken
+from stage_profiler import Profiler
+
+QUEUE_PATH = os.path.join(cli.TEMP_DIR, "queue.db")
+RESULTS_DIR = os.path.join(cli.OUT_DIR, "batch_results")
+
+# Profil default config job (--defaults): 'cli' = main.DEFAULT_CONFIG, 'gui' = pilihan engine
+# default GUI (app.py: Haar + subtitle PIL tanpa ImageMagick, nama file dari judul AI)
+DEFAULT_PROFILES = {
+    'cli': {},
+    'gui': {'language': None, 'detector': 'haar', 'smooth_window': 30, 'subtitle_renderer': 'pil',
+            'clip_name': '{title}', 'save_transcript': True, 'font_color_alt': '#FFFFFF',
+            'stroke_color': '#000000'},
+}
+
+
+def parse_job_file(path):
+    """Read a job manifest (text lines or JSON list) into [(source, overrides)]"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.lower().endswith('.json'):
+            entries = json.load(f)
+        else:
+            entries = []
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                entries.append(json.loads(line) if line.startswith('{') else line)
+
+    jobs = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {'source': entry}
+        overrides = dict(entry)
+        source = overrides.pop('source')
+        jobs.append((source, overrides))
+    return jobs
+
+
+def build_config(source, overrides, defaults):
+    """Config job = profil default (--defaults) + --config + override per baris"""
+    config = {**defaults, **overrides}
+    if os.path.exists(source):
+        config['source_type'] = 'file'
+        config['local_file'] = os.path.abspath(source)
+        config['youtube_url'] = ''
+    else:
+        config['source_type'] = 'youtube'
+        config['youtube_url'] = source
+        config['local_file'] = ''
+    # API key tidak pernah disimpan di database antrian
+    config.pop('api_key', None)
+    return config
+
+
+def write_json(path, data):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+    os.replace(tmp, path)
+
+
+def run_queue(queue, api_key, concurrency, cpu_workers, io_workers, results_dir, profiler=None):
+    """Drain the queue, keeping up to `concurrency` jobs in the shared scheduler"""
+    os.makedirs(results_dir, exist_ok=True)
+    recovered = queue.recover()
+    if recovered:
+        cli.log_info(f"{recovered} job dari run sebelumnya dilanjutkan")
+
+    active = {}
+
+    def finish(qid, info, error=None):
+        errors = {name: str(e) for name, e in sched.errors_for(info['prefix']).items()} if info['prefix'] else {}
+        if error:
+            errors['schedule'] = error
+        manifest = info.get('manifest')
+        result = {
+            'queue_id': qid,
+            'job_id': manifest.job_id if manifest else None,
+            'source': info['source'],
+            'status': 'failed' if errors else 'done',
+            'errors': errors,
+            # Hanya output config job ini; manifest juga mencatat output run dengan config lain
+            'outputs': list(info.get('outputs', [])),
+            'started_at': info['started_at'],
+            'finished_at': time.time(),
+            'duration': round(time.time() - info['started_at'], 1),
+        }
+        if profiler is not None and manifest:
+            result['profile'] = profiler.write_report(manifest.job_id, info['prefix'], source=info['source'])
+        # Scratch workspace job dibersihkan begitu job selesai/gagal
+        if info.get('stack'):
+            info['stack'].close()
+        write_json(os.path.join(results_dir, f"job_{qid}.json"), result)
+        queue.finish(qid, result, error='; '.join(errors.values()) if errors else None)
+        if errors:
+            cli.log_error(f"Job #{qid} gagal: {info['source']}")
+        else:
+            cli.log_success(f"Job #{qid} selesai: {len(result['outputs'])} klip ({result['duration']}s)")
+
+    def tick():
+        for qid, info in list(active.items()):
+            if sched.pending(info['prefix']) == 0:
+                del active[qid]
+                finish(qid, info)
+
+        while len(active) < concurrency:
+            job = queue.claim(exclude_sources=[a['source'] for a in active.values()])
+            if not job:
+                break
+            qid, source = job['id'], job['source']
+            info = {'source': source, 'started_at': time.time(), 'prefix': None}
+            try:
+                config = dict(job['config'], api_key=api_key)
+                manifest = JobManifest.open(cli.JOBS_DIR, source)
+                info.update(manifest=manifest, prefix=f"{manifest.job_id}:")
+                cli.log_info(f"Mulai job #{qid} ({manifest.job_id}): {source}")
+                info['stack'] = ExitStack()
+                ws = info['stack'].enter_context(cli.WORKSPACES.open(manifest.job_dir))
+                info['token'] = CancelToken(ws.path("cancel"))
+                info['outputs'] = core.schedule_job(sched, manifest, config, ws, info['token'])
+                active[qid] = info
+            except Exception as e:
+                finish(qid, info, error=str(e))
+
+    cli.WORKSPACES.cleanup_stale_scratch()
+    try:
+        with Scheduler(io_workers=io_workers, cpu_workers=cpu_workers,
+                       log=core.log, profiler=profiler) as sched:
+            try:
+                while True:
+                    sched.run(tick=tick)
+                    if not active:
+                        break
+            except KeyboardInterrupt:
+                # Hentikan tahap yang sedang jalan sebelum scheduler menunggu worker-nya
+                for info in active.values():
+                    info['token'].cancel()
+                raise
+    finally:
+        # Ctrl+C: job yang sedang jalan tetap 'running' (dilanjutkan run berikutnya),
+        # tapi scratch workspace-nya tetap dibersihkan
+        for info in active.values():
+            info['stack'].close()
+
+    summary = {'finished_at': time.time(), 'counts': queue.counts(), 'jobs': []}
+    for row in queue.jobs():
+        result = json.loads(row['result']) if row['result'] else {}
+        summary['jobs'].append({
+            'queue_id': row['id'],
+            'source': row['source'],
+            'status': row['status'],
+            'attempts': row['attempts'],
+            'outputs': len(result.get('outputs', [])),
+            'error': row['error'],
+        })
+    write_json(os.path.join(results_dir, "summary.json"), summary)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI Auto Shorts - headless batch mode")
+    parser.add_argument('jobs', nargs='?', help="File job (.txt satu URL/path per baris, atau .json)")
+    parser.add_argument('--defaults', choices=sorted(DEFAULT_PROFILES), default='cli',
+                        help="Profil default config job: 'cli' = main.DEFAULT_CONFIG (default), "
+                             "'gui' = detektor/subtitle/nama file seperti GUI")
+    parser.add_argument('--config', help="File JSON berisi config default untuk semua job (di atas --defaults)")
+    parser.add_argument('--concurrency', type=int, default=2, help="Jumlah job yang diproses bersamaan")
+    parser.add_argument('--cpu-workers', type=int, default=cli.CPU_WORKERS)
+    parser.add_argument('--io-workers', type=int, default=cli.IO_WORKERS)
+    parser.add_argument('--queue', default=QUEUE_PATH, help="Lokasi database antrian")
+    parser.add_argument('--results', default=RESULTS_DIR, help="Folder hasil per job + summary.json")
+    parser.add_argument('--force', action='store_true', help="Tambahkan job walau sudah pernah di-antrikan")
+    parser.add_argument('--retry-failed', action='store_true', help="Antrikan ulang job yang gagal")
+    parser.add_argument('--no-run', action='store_true', help="Hanya tambah ke antrian, jangan diproses")
+    parser.add_argument('--status', action='store_true', help="Tampilkan isi antrian lalu keluar")
+    parser.add_argument('--profile', action='store_true', default=cli.PROFILE_STAGES,
+                        help=f"Tulis laporan waktu/resource per tahap ke {cli.PROFILE_DIR}/")
+    parser.add_argument('--profile-capture', default=cli.PROFILE_CAPTURE, metavar='TASK',
+                        help="Rekam task ini dengan cProfile, misal 'render:0' atau '*transcribe'")
+    args = parser.parse_args(argv)
+
+    queue = JobQueue(args.queue)
+    try:
+        if args.status:
+            for row in queue.jobs():
+                print(f"#{row['id']:<4} {row['status']:<8} {row['source']}" + (f"  ({row['error']})" if row['error'] else ""))
+            print(queue.counts())
+            return 0
+
+        defaults = dict(cli.DEFAULT_CONFIG, **DEFAULT_PROFILES[args.defaults])
+        if args.config:
+            with open(args.config, 'r', encoding='utf-8') as f:
+                defaults.update(json.load(f))
+        api_key = defaults.get('api_key') or cli.GROQ_API_KEY
+
+        if args.jobs:
+            added = 0
+            for source, overrides in parse_job_file(args.jobs):
+                _, new = queue.enqueue(source, build_config(source, overrides, defaults), force=args.force)
+                added += int(new)
+            cli.log_info(f"{added} job baru ditambahkan ke antrian")
+
+        if args.retry_failed:
+            cli.log_info(f"{queue.retry_failed()} job gagal diantrikan ulang")
+
+        if args.no_run:
+            return 0
+
+        if not api_key:
+            cli.log_error("API Key Groq tidak ditemukan (set GROQ_API_KEY di .env atau 'api_key' di --config)")
+            return 1
+
+        profiler = Profiler(cli.PROFILE_DIR, args.profile_capture, cli.PROFILE_TOOL) if args.profile else None
+        summary = run_queue(queue, api_key, args.concurrency, args.cpu_workers, args.io_workers, args.results,
+                            profiler=profiler)
+        cli.log_success(f"Batch selesai: {summary['counts']} - ringkasan di {args.results}/summary.json")
+        return 0 if not summary['counts'].get('failed') else 1
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,558 @@
+"""
+AI Auto Shorts - Offline Benchmark
+Mengukur performa tiap tahap pipeline dengan input sintetis yang deterministik (tanpa internet):
+video test-pattern dengan "wajah" yang bergerak, audio mirip ucapan, transkrip palsu dengan
+timestamp per kata, dan stub LLM yang mengembalikan daftar klip tetap.
+
+Contoh:
+    python benchmark.py
+    python benchmark.py --stages track,encode --duration 20 --repeat 3
+    python benchmark.py --list
+    python benchmark.py --startup      # waktu import main/app/batch dan tiap backend
+    python benchmark.py --detectors    # deteksi/s dan hit rate tiap backend face detector
+
+Tiap run ditambahkan ke benchmarks/history.jsonl lalu dibandingkan dengan run sebelumnya
+(parameter + host yang sama). Metrik utama: detik proses per detik klip (lebih kecil = lebih cepat).
+"""
+
+import os
+import sys
+import json
+import time
+import math
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+from moviepy.editor import VideoClip, AudioClip
+
+import main as cli
+import core
+import face_detectors
+from cancellation import CancelToken
+from job_manifest import JobManifest
+from pipeline_scheduler import Scheduler
+from word_index import WordIndex
+from workspace import WorkspaceManager
+
+BENCH_DIR = "benchmarks"
+WIDTH, HEIGHT, FPS = 1280, 720, 25
+AUDIO_FPS = 44100
+SEED = 1234
+SYLLABLE = 0.2  # Detik per suku kata audio sintetis
+WORDS = ["ini", "adalah", "contoh", "kalimat", "untuk", "video", "pendek", "yang", "viral", "sekali", "kamu", "harus"]
+
+
+class Skip(Exception):
+    """Stage cannot run on this host (missing model, ImageMagick, ...)"""
+
+
+# ==========================================
+# INPUT SINTETIS
+# ==========================================
+
+def fake_transcript(duration, seed=SEED):
+    """Whisper-shaped result: 6 words of 2 syllables per sentence, 0.6 s pause between sentences"""
+    rng = np.random.default_rng(seed)
+    segments, t = [], 0.3
+    while t + 12 * SYLLABLE < duration:
+        words = []
+        for _ in range(6):
+            text = WORDS[rng.integers(len(WORDS))]
+            words.append({'word': ' ' + text, 'start': round(t, 3), 'end': round(t + 2 * SYLLABLE, 3),
+                          'probability': 1.0})
+            t += 2 * SYLLABLE
+        segments.append({'id': len(segments), 'start': words[0]['start'], 'end': words[-1]['end'],
+                         'text': ''.join(w['word'] for w in words), 'words': words})
+        t += 0.6
+    return {'text': ''.join(s['text'] for s in segments), 'segments': segments, 'language': 'id'}
+
+
+def speech_audio(transcript, duration, seed=SEED):
+    """Voiced, speech-like signal aligned with the fake transcript (returns samples, loudness envelope)"""
+    rng = np.random.default_rng(seed + 1)
+    n = int(duration * AUDIO_FPS)
+    env = np.zeros(n, np.float32)
+    f0 = np.full(n, 120.0)
+    for seg in transcript['segments']:
+        for w in seg['words']:
+            for k in range(2):
+                a = int((w['start'] + k * SYLLABLE) * AUDIO_FPS)
+                b = int((w['start'] + (k + 1) * SYLLABLE) * AUDIO_FPS)
+                env[a:b] = np.sin(np.linspace(0, np.pi, b - a)) ** 2
+                f0[a:b] = rng.uniform(110, 220)
+    phase = 2 * np.pi * np.cumsum(f0) / AUDIO_FPS
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    audio = 0.25 * voice * env + 0.002 * rng.standard_normal(n)
+    return audio.astype(np.float32), env
+
+
+def face_x(t):
+    """Horizontal face center (0..1): sweeps left/right so the crop path has to follow"""
+    return 0.5 + 0.3 * math.sin(2 * math.pi * t / 12.0)
+
+
+def make_background(seed=SEED):
+    rng = np.random.default_rng(seed + 2)
+    x = np.linspace(0, 1, WIDTH)[None, :]
+    y = np.linspace(0, 1, HEIGHT)[:, None]
+    base = np.stack(np.broadcast_arrays(40 + 60 * x, 50 + 40 * y, 100 - 30 * x), axis=-1)
+    noise = rng.integers(0, 12, (HEIGHT, WIDTH, 1))
+    return np.clip(base + noise, 0, 255).astype(np.uint8)
+
+
+def draw_face(frame, cx, cy, mouth):
+    cv2.ellipse(frame, (cx, cy), (110, 145), 0, 0, 360, (224, 172, 140), -1)   # Wajah
+    cv2.ellipse(frame, (cx, cy - 95), (115, 60), 0, 180, 360, (60, 40, 30), -1)  # Rambut
+    for dx in (-42, 42):
+        cv2.ellipse(frame, (cx + dx, cy - 25), (22, 12), 0, 0, 360, (255, 255, 255), -1)
+        cv2.circle(frame, (cx + dx, cy - 25), 9, (40, 30, 30), -1)
+    cv2.line(frame, (cx, cy - 10), (cx - 8, cy + 30), (180, 120, 100), 4)
+    cv2.ellipse(frame, (cx, cy + 65), (40, 6 + int(22 * mouth)), 0, 0, 360, (120, 30, 40), -1)
+
+
+def write_synthetic_video(path, duration, transcript, seed=SEED):
+    audio, env = speech_audio(transcript, duration, seed)
+    background = make_background(seed)
+
+    def make_frame(t):
+        frame = background.copy()
+        mouth = float(env[min(int(t * AUDIO_FPS), len(env) - 1)])
+        draw_face(frame, int(face_x(t) * WIDTH), HEIGHT // 2, mouth)
+        return frame
+
+    def make_audio(t):
+        idx = np.clip((np.asarray(t) * AUDIO_FPS).astype(int), 0, len(audio) - 1)
+        mono = audio[idx]
+        return np.column_stack([mono, mono]) if mono.ndim else np.array([mono, mono])
+
+    clip = VideoClip(make_frame, duration=duration).set_audio(
+        AudioClip(make_audio, duration=duration, fps=AUDIO_FPS))
+    clip.write_videofile(path, fps=FPS, codec='libx264', audio_codec='aac', preset='medium', logger=None,
+                         temp_audiofile=path + '.m4a')
+
+
+def synthetic_track(duration, fps=FPS):
+    """Crop path that follows the synthetic face exactly (so render stages do not need tracking)"""
+    t = np.arange(int(duration * fps)) / fps
+    centers = (0.5 + 0.3 * np.sin(2 * np.pi * t / 12.0)) * WIDTH
+    return {'centers': centers.astype(np.float32), 'fps': fps, 'end': duration}
+
+
+class StubGroq:
+    """Stand-in for groq.Groq that returns a fixed clip list without touching the network"""
+    clips = []
+
+    def __init__(self, api_key=None):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        content = json.dumps({'clips': StubGroq.clips})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def whisper_model_cached(name="base"):
+    root = os.path.join(os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "whisper")
+    return os.path.exists(os.path.join(root, f"{name}.pt"))
+
+
+class BenchContext:
+    """Synthetic media (cached per parameter set) plus shared objects for the stage benchmarks"""
+
+    def __init__(self, root, duration, clip_seconds, seed=SEED):
+        self.root = root
+        self.duration = duration
+        self.clip_seconds = clip_seconds
+        self.media_dir = os.path.join(root, "media", f"{duration}s-{WIDTH}x{HEIGHT}@{FPS}-{seed}")
+        self.video = os.path.join(self.media_dir, "synthetic.mp4")
+        self.transcript = fake_transcript(duration, seed)
+        self.words = WordIndex.from_segments(self.transcript['segments'])
+        self.workspaces = WorkspaceManager(os.path.join(root, "temp"))
+        # Durasi klip stub LLM = clip_seconds, jadi batas durasi klip disamakan
+        self.config = dict(cli.DEFAULT_CONFIG, output_dir=os.path.join(root, "out"), api_key='offline',
+                           min_clip_seconds=clip_seconds, max_clip_seconds=clip_seconds)
+        self.token = CancelToken()
+        # Dua klip tetap dari "LLM"
+        StubGroq.clips = [
+            {'start': 1.0, 'end': 1.0 + clip_seconds, 'title': 'Bench_Satu'},
+            {'start': duration / 2, 'end': duration / 2 + clip_seconds, 'title': 'Bench_Dua'},
+        ]
+        os.makedirs(self.config['output_dir'], exist_ok=True)
+
+        if not os.path.exists(self.video):
+            os.makedirs(self.media_dir, exist_ok=True)
+            core.log_info(f"Membuat video sintetis {duration}s ({WIDTH}x{HEIGHT}@{FPS})...")
+            write_synthetic_video(self.video, duration, self.transcript, seed)
+
+        self.subtitles = True
+        try:
+            core.SubtitleRasters([], 0, self.config).raster('TES', core.FORMATS['9:16'][0])
+        except Exception as e:
+            core.log_error(f"Subtitle tidak bisa dibuat ({str(e)[:60]}), benchmark render tanpa subtitle")
+            self.subtitles = False
+        self.config['enable_subtitle'] = self.subtitles
+
+
+# ==========================================
+# STAGE BENCHMARK
+# Tiap fungsi menerima (ctx, ws) dan mengembalikan (frames, detik media yang diproses)
+# ==========================================
+
+def bench_extract(ctx, ws):
+    core.extract_audio(ctx.video, ws.path("audio.wav"), ws, ctx.token)
+    return None, ctx.duration
+
+
+def bench_transcribe(ctx, ws):
+    if not whisper_model_cached():
+        raise Skip("model Whisper 'base' belum ada di cache (butuh download)")
+    audio = core.extract_audio(ctx.video, ws.path("audio.wav"), ws, ctx.token)
+    start = time.perf_counter()
+    result = core.transcribe(audio, ctx.token, ctx.config)
+    if not result:
+        raise RuntimeError("Transkripsi gagal")
+    return None, ctx.duration, time.perf_counter() - start
+
+
+def bench_track(ctx, ws):
+    track = core.track(ctx.video, 1.0, 1.0 + ctx.clip_seconds, "bench_track", ctx.token, ctx.config)
+    return len(track['centers']), ctx.clip_seconds
+
+
+def bench_smooth(ctx, ws):
+    rng = np.random.default_rng(SEED)
+    centers = synthetic_track(ctx.clip_seconds)['centers'] + rng.normal(0, 20, int(ctx.clip_seconds * FPS))
+    rounds = 200
+    for _ in range(rounds):
+        core.smooth_centers(centers)
+    return len(centers) * rounds, ctx.clip_seconds * rounds
+
+
+def _rasters(ctx, words):
+    return core.SubtitleRasters(words, 0, ctx.config)
+
+
+def bench_subtitles(ctx, ws):
+    # Raster subtitle per kata seperti di render (SubtitleRasters, cache kosong tiap repeat)
+    if not ctx.subtitles:
+        raise Skip("Renderer subtitle tidak tersedia")
+    words = ctx.words.words_between(0, ctx.clip_seconds)
+    subtitles = _rasters(ctx, words)
+    for _, _, text in subtitles.words:
+        subtitles.raster(text, core.FORMATS['9:16'][0])
+    return len(words), ctx.clip_seconds
+
+
+def _composed(ctx, first, last):
+    """Frame 9:16 berisi subtitle dari jalur render default (format_frames + SubtitleRasters)"""
+    fps = core.RENDER_PARAMS['fps']
+    subtitles = _rasters(ctx, ctx.words.words_between(0, ctx.clip_seconds))
+    frames = core.format_frames(ctx.video, 0, synthetic_track(ctx.clip_seconds), ['9:16'], first, last, ctx.config)
+    for i, out in enumerate(frames, first):
+        subtitles.draw(out['9:16'], i / fps)
+        yield out
+
+
+def bench_composite(ctx, ws):
+    total = core.clip_frame_count(0, ctx.clip_seconds)
+    frames = sum(1 for _ in _composed(ctx, 0, total))
+    return frames, ctx.clip_seconds
+
+
+def bench_encode(ctx, ws):
+    # Frame sudah jadi (1 detik, diulang) -> yang terukur hanya pipe + encoder (output + intermediate)
+    fps = core.RENDER_PARAMS['fps']
+    ready = list(_composed(ctx, 0, fps))
+    total = core.clip_frame_count(0, ctx.clip_seconds)
+    frames = (ready[i % fps] for i in range(total))
+    cleans = {'9:16': ws.path("encode_clean.mp4")} if ctx.config.get('mezzanine', True) else {}
+    core.write_frames(frames, 0, {'9:16': ws.path("encode.mp4")}, cleans, _rasters(ctx, []), ctx.token,
+                      core.meter("bench:encode", total=total))
+    return total, ctx.clip_seconds
+
+
+def bench_render(ctx, ws):
+    core.render(ctx.video, 0, ctx.clip_seconds, "bench_render", ctx.words, ctx.config, ws,
+                synthetic_track(ctx.clip_seconds), ctx.token)
+    return int(ctx.clip_seconds * core.RENDER_PARAMS['fps']), ctx.clip_seconds
+
+
+def bench_e2e(ctx, ws):
+    """Full schedule_job on the synthetic video: stub LLM, fake transcript, real tracking + render"""
+    jobs_root = os.path.join(ctx.root, "jobs")
+    shutil.rmtree(jobs_root, ignore_errors=True)
+    manifest = JobManifest.open(jobs_root, ctx.video)
+    transcript_path = manifest.file("transcript.json")
+    with open(transcript_path, 'w', encoding='utf-8') as f:
+        json.dump(ctx.transcript, f)
+    manifest.complete_stage('transcript', artifacts=[transcript_path])
+
+    config = dict(ctx.config, source_type='file', local_file=os.path.abspath(ctx.video), youtube_url='',
+                  clip_count=len(StubGroq.clips))
+    core.groq = SimpleNamespace(Groq=StubGroq)
+    with Scheduler(io_workers=cli.IO_WORKERS, cpu_workers=cli.CPU_WORKERS, log=core.log) as sched:
+        core.schedule_job(sched, manifest, config, ws, ctx.token)
+        errors = sched.run()
+    if errors:
+        raise RuntimeError(f"{len(errors)} tahap gagal: {list(errors)}")
+    seconds = sum(c['end'] - c['start'] for c in StubGroq.clips)
+    return int(seconds * core.RENDER_PARAMS['fps']), seconds
+
+
+STAGES = {
+    'extract': bench_extract,
+    'transcribe': bench_transcribe,
+    'track': bench_track,
+    'smooth': bench_smooth,
+    'subtitles': bench_subtitles,
+    'composite': bench_composite,
+    'encode': bench_encode,
+    'render': bench_render,
+    'e2e': bench_e2e,
+}
+
+
+def run_stage(ctx, name, repeat):
+    times, frames, media = [], None, None
+    job_dir = os.path.join(ctx.root, "ws", name)
+    for _ in range(repeat):
+        # Job dir dikosongkan tiap repeat: intermediate mezzanine / cache track dari repeat sebelumnya
+        # membuat render berikutnya hanya overlay ulang
+        shutil.rmtree(job_dir, ignore_errors=True)
+        with ctx.workspaces.open(job_dir) as ws:
+            start = time.perf_counter()
+            out = STAGES[name](ctx, ws)
+            elapsed = time.perf_counter() - start
+        frames, media = out[0], out[1]
+        # Stage boleh mengukur bagiannya sendiri (misal transkripsi tanpa ekstraksi audio)
+        times.append(out[2] if len(out) > 2 else elapsed)
+    best = min(times)
+    return {
+        'seconds': best,
+        'median': statistics.median(times),
+        'runs': len(times),
+        'frames': frames,
+        'media_seconds': media,
+        'fps': frames / best if frames else None,
+        's_per_media_s': best / media if media else None,
+    }
+
+
+# ==========================================
+# FACE DETECTOR (kecepatan vs akurasi per backend)
+# ==========================================
+
+def detector_frames(ctx, width):
+    """Proxy frames of the first clip at `width` px plus the synthetic face centre (x, y) per frame"""
+    start = 1.0
+    frames = list(core.source_pool(ctx.config).frames(ctx.video, start, start + ctx.clip_seconds, FPS, width))
+    scale = frames[0].shape[1] / WIDTH
+    truth = [(face_x(start + i / FPS) * WIDTH * scale, HEIGHT / 2 * scale) for i in range(len(frames))]
+    return frames, truth, scale
+
+
+def hit_rate(boxes, truth, scale):
+    """Fraction of frames whose detected box centre lies inside the drawn face"""
+    hits = 0
+    for box, (fx, fy) in zip(boxes, truth):
+        if box is not None:
+            cx, cy = box[0] + box[2] / 2, box[1] + box[3] / 2
+            hits += abs(cx - fx) < 110 * scale and abs(cy - fy) < 145 * scale
+    return hits / len(truth)
+
+
+def run_detectors(ctx, repeat):
+    """Every face detector backend on the proxy it asks for: detections/s and hit rate (deteksi tiap frame)"""
+    results, cache = {}, {}
+    for name, cls in face_detectors.DETECTORS.items():
+        core.log_info(f"Benchmark: detektor {name}")
+        try:
+            detector = face_detectors.create(name, ctx.config)
+        except Exception as e:
+            results[f"detect:{name}"] = {'skipped': str(e)[:80]}
+            continue
+        if cls.input_width not in cache:
+            cache[cls.input_width] = detector_frames(ctx, cls.input_width)
+        frames, truth, scale = cache[cls.input_width]
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            boxes = []
+            for i in range(0, len(frames), detector.batch):
+                boxes.extend(detector.boxes(frames[i:i + detector.batch]))
+            times.append(time.perf_counter() - start)
+        best = min(times)
+        results[f"detect:{name}"] = {
+            'seconds': best, 'median': statistics.median(times), 'runs': len(times),
+            'frames': len(frames), 'media_seconds': ctx.clip_seconds, 'fps': len(frames) / best,
+            's_per_media_s': best / ctx.clip_seconds, 'hit_rate': hit_rate(boxes, truth, scale),
+            'input_width': frames[0].shape[1],
+        }
+    return results
+
+
+# ==========================================
+# HISTORI
+# ==========================================
+
+def host_info():
+    return {'node': platform.node(), 'platform': platform.platform(), 'python': platform.python_version(),
+            'cpus': os.cpu_count()}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    runs = []
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    runs.append(json.loads(line))
+    return runs
+
+
+def previous_result(history, params, host, stage):
+    """Latest earlier result for `stage` with the same parameters on the same host"""
+    for run in reversed(history):
+        if run['params'] == params and run['host']['node'] == host['node'] and stage in run['results']:
+            return run['results'][stage]
+    return None
+
+
+def print_report(results, history, params, host, threshold):
+    regressions = []
+    print(f"\n{'stage':<22}{'best s':>9}{'median s':>10}{'frames/s':>10}{'s/clip-s':>10}{'vs prev':>10}")
+    for name, r in results.items():
+        if 'skipped' in r:
+            print(f"{name:<22}  dilewati: {r['skipped']}")
+            continue
+        # Dibandingkan per detik klip; hasil tanpa media (import) langsung per detik
+        metric = 's_per_media_s' if r['s_per_media_s'] else 'seconds'
+        delta = ""
+        prev = previous_result(history, params, host, name)
+        if prev and prev.get(metric):
+            change = r[metric] / prev[metric] - 1
+            delta = f"{change:+.1%}"
+            if change > threshold:
+                delta += " !"
+                regressions.append(name)
+        fps = f"{r['fps']:.1f}" if r['fps'] else "-"
+        per_clip = f"{r['s_per_media_s']:.3f}" if r['s_per_media_s'] else "-"
+        hits = f"  hit {r['hit_rate']:.0%} @{r['input_width']}px" if 'hit_rate' in r else ""
+        print(f"{name:<22}{r['seconds']:>9.2f}{r['median']:>10.2f}{fps:>10}{per_clip:>10}{delta:>10}{hits}")
+    return regressions
+
+
+# ==========================================
+# STARTUP (waktu import)
+# ==========================================
+
+STARTUP_MODULES = ("core", "main", "app", "batch", "torch", "whisper", "mediapipe", "cv2", "moviepy.editor",
+                   "yt_dlp", "groq")
+
+
+def import_seconds(module):
+    """Import time of `module` in a fresh interpreter (file cache OS sudah hangat setelah run pertama)"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__)))
+    if out.returncode != 0:
+        lines = out.stderr.strip().splitlines()
+        raise Skip(lines[-1] if lines else "import gagal")
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def run_startup(repeat):
+    """Import cost of the entry points (main/app/batch harus cepat) and of every heavy backend"""
+    results = {}
+    for module in STARTUP_MODULES:
+        core.log_info(f"Benchmark: import {module}")
+        try:
+            times = [import_seconds(module) for _ in range(repeat)]
+        except Skip as e:
+            results[f"import:{module}"] = {'skipped': str(e)}
+            continue
+        results[f"import:{module}"] = {
+            'seconds': min(times), 'median': statistics.median(times), 'runs': len(times),
+            'frames': None, 'media_seconds': None, 'fps': None, 's_per_media_s': None,
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI Auto Shorts - offline benchmark")
+    parser.add_argument('--stages', default=','.join(STAGES), help=f"Daftar stage, dipisah koma ({', '.join(STAGES)})")
+    parser.add_argument('--duration', type=int, default=30, help="Durasi video sintetis (detik)")
+    parser.add_argument('--clip', type=int, default=10, help="Durasi klip yang diproses (detik)")
+    parser.add_argument('--repeat', type=int, default=3, help="Ulangi tiap stage, ambil waktu terbaik")
+    parser.add_argument('--dir', default=BENCH_DIR, help="Folder media sintetis + history.jsonl")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Batas regresi vs run sebelumnya (0.10 = 10%%)")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit code 1 jika ada regresi")
+    parser.add_argument('--no-save', action='store_true', help="Jangan tulis ke history.jsonl")
+    parser.add_argument('--list', action='store_true', help="Tampilkan daftar stage lalu keluar")
+    parser.add_argument('--startup', action='store_true', help="Ukur waktu import module (tanpa media sintetis)")
+    parser.add_argument('--detectors', action='store_true', help="Bandingkan backend face detector (deteksi/s, hit rate)")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, fn in STAGES.items():
+            print(f"{name:<11}{(fn.__doc__ or '').strip()}")
+        return 0
+
+    host = host_info()
+    os.makedirs(args.dir, exist_ok=True)
+    if args.startup:
+        params = {'mode': 'startup'}
+        results = run_startup(args.repeat)
+    elif args.detectors:
+        ctx = BenchContext(args.dir, args.duration, args.clip)
+        params = {'mode': 'detectors', 'duration': args.duration, 'clip': args.clip,
+                  'size': f"{WIDTH}x{HEIGHT}@{FPS}"}
+        results = run_detectors(ctx, args.repeat)
+    else:
+        stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+        unknown = [s for s in stages if s not in STAGES]
+        if unknown:
+            parser.error(f"Stage tidak dikenal: {', '.join(unknown)}")
+        if args.clip * 2 + 1 > args.duration:
+            parser.error("--duration minimal 2x --clip + 1 detik (dua klip tetap dari stub LLM)")
+
+        ctx = BenchContext(args.dir, args.duration, args.clip)
+        params = {'duration': args.duration, 'clip': args.clip, 'size': f"{WIDTH}x{HEIGHT}@{FPS}",
+                  'subtitles': ctx.subtitles}
+        results = {}
+        for name in stages:
+            core.log_info(f"Benchmark: {name}")
+            try:
+                results[name] = run_stage(ctx, name, args.repeat)
+            except Skip as e:
+                results[name] = {'skipped': str(e)}
+
+    history_path = os.path.join(args.dir, "history.jsonl")
+    regressions = print_report(results, load_history(history_path), params, host, args.threshold)
+
+    if not args.no_save:
+        run = {'time': time.time(), 'git': git_revision(), 'host': host, 'params': params, 'results': results}
+        with open(history_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(run) + "\n")
+
+    if regressions:
+        core.log_error(f"Lebih lambat > {args.threshold:.0%} dari run sebelumnya: {', '.join(regressions)}")
+        return 1 if args.fail_on_regression else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
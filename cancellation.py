@@ -0,0 +1,115 @@
+"""
+Cancellation - pembatalan kooperatif di dalam tahap yang lama
+Tahap panjang (transkripsi, tracking, encode) memanggil `token.check()` di loop-nya,
+jadi tombol Stop membebaskan CPU dalam satu-dua detik tanpa menunggu tahapnya selesai.
+Token bisa dikirim ke worker process: di sana ia membaca file flag (biasanya di scratch workspace).
+"""
+
+import os
+import time
+import threading
+import subprocess
+from contextlib import contextmanager
+
+import proglog
+
+
+class Cancelled(BaseException):
+    """
+    Raised inside a stage when its job was cancelled.
+    BaseException (seperti KeyboardInterrupt) supaya tidak tertelan `except Exception`
+    yang dipakai untuk fallback, misal fallback center crop di tracking.
+    """
+
+
+class CancelToken:
+    """Thread-safe cancel flag; with `path` it also works across processes"""
+
+    def __init__(self, path=None, poll_interval=0.2):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._event = threading.Event()
+        self._next_poll = 0.0
+
+    def __reduce__(self):
+        # Di process lain event-nya baru, status dibaca dari file flag
+        return (CancelToken, (self.path, self.poll_interval))
+
+    def cancel(self):
+        self._event.set()
+        if self.path:
+            try:
+                open(self.path, 'a').close()
+            except OSError:
+                pass
+
+    def cancelled(self):
+        if self._event.is_set():
+            return True
+        if self.path:
+            # Cek file dibatasi tiap `poll_interval` detik, aman dipanggil per frame
+            now = time.monotonic()
+            if now >= self._next_poll:
+                self._next_poll = now + self.poll_interval
+                if os.path.exists(self.path):
+                    self._event.set()
+                    return True
+        return False
+
+    def check(self):
+        if self.cancelled():
+            raise Cancelled("Job dibatalkan")
+
+
+class CancelLogger(proglog.ProgressBarLogger):
+    """
+    MoviePy logger that aborts write_videofile / write_audiofile between frames.
+    Dengan `meter` (progress.Meter) juga melaporkan frame yang sudah di-encode;
+    bar 't' = frame video, 'chunk' = potongan audio.
+    """
+
+    def __init__(self, token, meter=None, bar='t'):
+        super().__init__()
+        self.token = token
+        self.meter = meter
+        self.bar = bar
+
+    def callback(self, **changes):
+        self.token.check()
+
+    def bars_callback(self, bar, attr, value, old_value=None):
+        self.token.check()
+        if self.meter is not None and bar == self.bar and attr == 'index':
+            self.meter.update(value + 1, self.bars[bar]['total'])
+
+
+def kill_encoders(error):
+    """
+    Stop the ffmpeg writers of a MoviePy write that was interrupted.
+    MoviePy tidak menutup writer-nya kalau loop frame melempar exception, jadi proses
+    ffmpeg dicari dari frame traceback lalu di-kill (bukan menunggu GC menutup pipe-nya).
+    """
+    tb = error.__traceback__
+    while tb is not None:
+        for value in list(tb.tb_frame.f_locals.values()):
+            proc = getattr(value, 'proc', None)
+            if type(value).__name__.endswith('Writer') and isinstance(proc, subprocess.Popen):
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+        tb = tb.tb_next
+
+
+@contextmanager
+def partial_output(*paths):
+    """Delete `paths` (and kill their encoder) if the block is cancelled or fails"""
+    try:
+        yield
+    except BaseException as e:
+        kill_encoders(e)
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        raise
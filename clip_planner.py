@@ -0,0 +1,124 @@
+"""
+Clip Planner - tahap antara analisis AI dan render
+Membuang klip duplikat/overlap dari output LLM lalu mengisi ulang dengan kandidat berikutnya.
+"""
+
+import bisect
+
+
+def clip_iou(a_start, a_end, b_start, b_end):
+    """Intersection-over-union of two time ranges"""
+    inter = min(a_end, b_end) - max(a_start, b_start)
+    if inter <= 0:
+        return 0.0
+    union = max(a_end, b_end) - min(a_start, b_start)
+    return inter / union if union > 0 else 0.0
+
+
+def candidate_count(num_clips):
+    """How many candidates to ask the LLM for, so there is something to backfill with"""
+    return num_clips + max(2, num_clips // 2)
+
+
+def _normalize(candidates, video_duration):
+    """Parse start/end, clamp to the video and drop broken entries (keeps LLM rank order)"""
+    clips = []
+    for rank, data in enumerate(candidates):
+        try:
+            start = max(0.0, float(data['start']))
+            end = float(data['end'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if video_duration:
+            end = min(end, video_duration)
+        if end <= start:
+            continue
+        clip = dict(data)
+        clip['start'], clip['end'], clip['rank'] = start, end, rank
+        clips.append(clip)
+    return clips
+
+
+def plan_clips(candidates, num_clips, iou_threshold=0.6, min_duration=15.0, max_duration=60.0,
+               video_duration=None, sentence_ends=None, log=None):
+    """
+    Pilih maksimal `num_clips` klip tanpa render ganda.
+
+    Kandidat diproses sesuai ranking LLM. Klip yang sudah diterima disimpan terurut
+    berdasarkan start, sehingga tetangga yang overlap dicari dengan bisect.
+    - IoU >= iou_threshold: dianggap duplikat -> digabung (union) ke klip yang sudah
+      diterima jika masih <= max_duration, selain itu dibuang.
+    - Overlap sebagian: start (hook pilihan LLM) tidak pernah diubah. Start di dalam klip
+      lain -> dibuang; selain itu end dipotong sebelum klip berikutnya, mundur ke akhir
+      kalimat terdekat (`sentence_ends`: akhir segmen transkrip) jika sisanya >= min_duration.
+    Kandidat setelah `num_clips` dipakai untuk backfill.
+    """
+    sentence_ends = sorted(sentence_ends or [])
+    log = log or (lambda level, msg: None)
+    accepted = []  # diurutkan berdasarkan start
+    starts = []
+
+    def neighbours(start, end):
+        # Klip yang diterima tidak saling overlap, jadi end juga terurut
+        i = bisect.bisect_left(starts, end)
+        j = i
+        while j > 0 and accepted[j - 1]['end'] > start:
+            j -= 1
+        return accepted[j:i]
+
+    def insert(clip):
+        i = bisect.bisect_left(starts, clip['start'])
+        starts.insert(i, clip['start'])
+        accepted.insert(i, clip)
+
+    def remove(clip):
+        i = accepted.index(clip)
+        del accepted[i]
+        del starts[i]
+
+    for clip in _normalize(candidates, video_duration):
+        if len(accepted) >= num_clips:
+            break
+
+        title = clip.get('title', 'Unknown')
+        overlapping = neighbours(clip['start'], clip['end'])
+        if not overlapping:
+            insert(clip)
+            continue
+
+        best = max(overlapping, key=lambda c: clip_iou(c['start'], c['end'], clip['start'], clip['end']))
+        iou = clip_iou(best['start'], best['end'], clip['start'], clip['end'])
+
+        if iou >= iou_threshold:
+            union_start = min(best['start'], clip['start'])
+            union_end = max(best['end'], clip['end'])
+            if len(overlapping) == 1 and union_end - union_start <= max_duration:
+                remove(best)
+                best['start'], best['end'] = union_start, union_end
+                insert(best)
+                log("INFO", f"Merged duplicate clip '{title}' into '{best.get('title', 'Unknown')}' (IoU {iou:.2f})")
+            else:
+                log("INFO", f"Dropped duplicate clip '{title}' (IoU {iou:.2f})")
+            continue
+
+        # Overlap sebagian: hook di awal klip dipertahankan, hanya ekornya yang boleh dipotong
+        free_end = min(c['start'] for c in overlapping)
+        if free_end <= clip['start']:
+            log("INFO", f"Dropped overlapping clip '{title}' (awalnya sudah ada di klip lain)")
+            continue
+        i = bisect.bisect_right(sentence_ends, free_end)
+        if i and sentence_ends[i - 1] > clip['start']:
+            free_end = sentence_ends[i - 1]
+
+        if free_end - clip['start'] >= min_duration:
+            clip['end'] = free_end
+            insert(clip)
+            log("INFO", f"Trimmed overlapping clip '{title}' to {clip['start']:.1f}s - {free_end:.1f}s")
+        else:
+            log("INFO", f"Dropped overlapping clip '{title}'")
+
+    # Urutan render tetap mengikuti ranking LLM
+    plan = sorted(accepted, key=lambda c: c['rank'])
+    for clip in plan:
+        del clip['rank']
+    return plan
@@ -0,0 +1,1453 @@
+"""
+AI Auto Shorts - Core Engine
+Satu implementasi pipeline untuk semua front-end: CLI (main.py), GUI (app.py), batch.py, benchmark.py.
+
+API per tahap (bisa dipanggil langsung, atau dirangkai scheduler lewat `schedule_job`):
+    ingest(source, job_dir, token)                      -> (video_path, durasi, ada_audio)
+    index_keyframes(video_path, config)                 -> keyframe index di config['keyframe_dir']
+    extract_audio(video_path, audio_path, ws, token)    -> audio_path (16 kHz mono)
+    transcribe(audio_path, token, config)               -> hasil whisper {'text', 'segments', 'language'}
+    plan_clips(api_key, transcript, config, duration)   -> [{'start', 'end', 'title'}]
+    track(video_path, start, end, name, token, config)  -> {'centers', 'fps', 'end'}
+    render(video_path, start, end, name, words, config, ws, track, token)  -> path output .mp4
+    render_formats(...sama dengan render...)            -> {format: path} (config['formats'], satu decode)
+    render_segment(..., index, first, last) + join_segments(...)  -> render paralel per segmen
+
+Perilaku yang dulu berbeda antara CLI dan GUI (detektor wajah, window smoothing, renderer
+subtitle, bahasa, nama file) sekarang key di `config`, default-nya di DEFAULTS.
+Log dan progress lewat `set_reporter()`: default ke console, GUI mengarahkannya ke UIChannel.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import itertools
+import subprocess
+import multiprocessing
+from contextlib import closing, contextmanager
+from functools import lru_cache
+
+import numpy as np
+from colorama import Fore, Style, init
+
+import clip_planner
+from word_index import WordIndex
+from job_manifest import params_key, job_id_for_source
+from pipeline_scheduler import Ref
+from cancellation import CancelToken, CancelLogger, Cancelled, partial_output
+from transcriber import transcribe_chunked
+from progress import Meter, format_event
+from stage_profiler import step, count, gauge
+from source_reader import SourceReaderPool, probe, video_size, audio_codec
+from keyframe_index import KeyframeIndex
+from frame_ring import FrameRing
+from face_detectors import DETECTORS, create as create_detector
+from speaker_turns import speaker_turns
+from lazy_imports import LazyModule
+
+# Backend berat di-import saat pertama dipakai (lihat lazy_imports.py)
+cv2 = LazyModule("cv2")
+mp = LazyModule("mediapipe")
+whisper = LazyModule("whisper")
+yt_dlp = LazyModule("yt_dlp")
+torch = LazyModule("torch")
+groq = LazyModule("groq")
+mpy = LazyModule("moviepy.editor")
+ffmpeg_writer = LazyModule("moviepy.video.io.ffmpeg_writer")
+mpy_config = LazyModule("moviepy.config")
+pil_image = LazyModule("PIL.Image")
+pil_draw = LazyModule("PIL.ImageDraw")
+pil_font = LazyModule("PIL.ImageFont")
+
+init(autoreset=True)
+
+# Nilai default key engine di config job; front-end menimpa yang perlu
+DEFAULTS = {
+    'language': None,               # None = auto-detect dari potongan pertama
+    'whisper_model': 'base',
+    'detector': 'mediapipe',        # 'mediapipe', 'haar' atau 'yunet' (lihat face_detectors.py)
+    'yunet_model': 'models/face_detection_yunet_2023mar.onnx',  # Di-download sekali kalau belum ada
+    'smooth_window': 15,            # Moving average posisi crop (frame)
+    'redetect_every': 15,           # Detektor penuh tiap N frame, di antaranya template tracking; 0 = detektor saja
+    'track_min_confidence': 0.6,    # Skor template matching minimum, di bawahnya deteksi ulang
+    'framing': 'follow',            # 'follow' (ikuti wajah) atau 'speaker' (kunci ke pembicara per giliran)
+    'speaker_change_audio': False,  # framing 'speaker': batas segmen dicek dengan perubahan suara
+    'min_turn_seconds': 2.0,        # Giliran bicara minimum (batas yang lebih rapat dilewati)
+    'adaptive_sampling': True,      # Interval deteksi mengikuti gerakan: shot diam jarang, gerak/cut tiap frame
+    'max_redetect_seconds': 2.0,    # Interval deteksi terpanjang saat shot diam
+    'max_readers': 4,               # Decoder video sumber yang boleh terbuka per process
+    'reader_memory_mb': 1024,       # Batas perkiraan buffer semua decoder per process
+    'keyframe_dir': 'temp/keyframes',  # Keyframe index sumber (seek per GOP); None = aturan seek MoviePy
+    'proxy_width': None,            # Lebar frame analisis (tracking), di-scale ffmpeg; None = input_width detektor
+    'decode_process': False,        # Tracking + render: decode di process terpisah, frame lewat shared memory
+    'ring_slots': 8,                # Jumlah frame di ring shared memory (decode_process)
+    'subtitle_renderer': 'textclip',  # 'textclip' (ImageMagick) atau 'pil' (tanpa ImageMagick)
+    'enable_subtitle': True,
+    'font': 'Arial-Bold',           # Nama font ImageMagick (renderer 'textclip')
+    'font_size': 70,
+    'font_color': '#FFD700',
+    'font_color_alt': '#FFFFFF',
+    'stroke_color': '#000000',
+    'stroke_width': 3,
+    'text_position': 0.75,          # <= 1: fraksi tinggi video, > 1: pixel
+    'clip_count': 10,
+    'dedupe_iou': 0.6,              # Klip AI dengan IoU di atas ini dianggap duplikat
+    'min_clip_seconds': 30,
+    'max_clip_seconds': 60,
+    'clip_name': 'Short_{n}_{title}',  # Nama file output (tanpa .mp4)
+    'save_transcript': False,       # Tulis transcript.txt ke folder output
+    'output_dir': 'hasil_shorts',
+    'mezzanine': True,              # Simpan klip bersih (tanpa subtitle) di job dir: ganti style = encode ulang saja
+    'render_segments': 1,           # > 1: satu klip di-encode paralel per segmen waktu (klip panjang, banyak core)
+    'formats': ['9:16'],            # Lebih dari satu (misal ['9:16', '4:5', '1:1']): satu decode untuk semua
+}
+
+# Parameter encode hasil akhir (dipakai juga oleh benchmark.py)
+RENDER_PARAMS = dict(codec='libx264', audio_codec='aac', fps=24, preset='fast', threads=4,
+                     ffmpeg_params=['-pix_fmt', 'yuv420p'])
+OUTPUT_SIZE = (1080, 1920)
+
+# ==========================================
+# LOG + PROGRESS
+# ==========================================
+
+_COLORS = {'INFO': Fore.CYAN, 'SUCCESS': Fore.GREEN, 'WARNING': Fore.YELLOW, 'ERROR': Fore.RED}
+
+
+def _console_log(level, message):
+    print(f"{_COLORS.get(level, '')}[{level}] {Style.RESET_ALL}{message}", flush=True)
+
+
+def _console_progress(stage, done=0, total=None, text=None):
+    if text:
+        _console_log('INFO', f"{text} {done}/{total}" if total else text)
+
+
+def _console_meter(event):
+    print(f"{Fore.MAGENTA}[PROGRESS] {Style.RESET_ALL}{format_event(event)}", flush=True)
+
+
+_reporter = {'log': _console_log, 'progress': _console_progress, 'emit': _console_meter, 'interval': 5}
+
+
+def set_reporter(log=None, progress=None, emit=None, interval=None):
+    """
+    Arahkan log (level, message), progress stage (stage, done, total, text) dan event
+    Meter ke front-end. Berlaku per process: worker process memakai console.
+    """
+    for key, value in (('log', log), ('progress', progress), ('emit', emit), ('interval', interval)):
+        if value is not None:
+            _reporter[key] = value
+
+
+def log(level, message): _reporter['log'](level, message)
+def log_info(msg): log('INFO', msg)
+def log_success(msg): log('SUCCESS', msg)
+def log_warning(msg): log('WARNING', msg)
+def log_error(msg): log('ERROR', msg)
+
+
+def progress(stage, done=0, total=None, text=None):
+    _reporter['progress'](stage, done, total, text)
+
+
+def meter(stage, unit='frames', total=None):
+    """Meter speed + ETA untuk satu task (frame tracking/encode, detik audio whisper)"""
+    return Meter(stage, total=total, unit=unit, emit=_reporter['emit'], interval=_reporter['interval'])
+
+
+def safe_filename(name):
+    """'Rahasia Sukses: Terungkap!' -> 'Rahasia_Sukses_Terungkap'"""
+    safe = "".join(c if c.isalnum() else '_' for c in name).strip('_')
+    while '__' in safe:
+        safe = safe.replace('__', '_')
+    return safe or 'clip'
+
+
+_pool = None
+
+
+def source_pool(config=None):
+    """Pool decoder video sumber milik process ini (dibuat saat pertama dipakai)"""
+    global _pool
+    if _pool is None:
+        config = dict(DEFAULTS, **(config or {}))
+        _pool = SourceReaderPool(config['max_readers'], config['reader_memory_mb'],
+                                 index_dir=config['keyframe_dir'])
+    return _pool
+
+
+def index_keyframes(source_video, config=None):
+    """Tahap keyframe index (I/O): scan sekali, disimpan di keyframe_dir untuk semua process"""
+    config = dict(DEFAULTS, **(config or {}))
+    try:
+        index = KeyframeIndex.load(source_video, config['keyframe_dir'])
+        log_info(f"Keyframe index: {len(index.times)} keyframe")
+    except Exception as e:
+        # Tanpa index reader tetap jalan dengan aturan seek bawaan MoviePy
+        log_warning(f"Keyframe index gagal: {str(e)[:80]}")
+
+
+def close_sources(path=None):
+    """Tutup decoder yang menganggur (misal setelah job selesai di GUI)"""
+    if _pool is not None:
+        _pool.close(path)
+
+
+# ==========================================
+# INGEST
+# ==========================================
+
+def _remove_raw_downloads(job_dir):
+    for file in os.listdir(job_dir):
+        if file.startswith("raw_video"):
+            os.remove(os.path.join(job_dir, file))
+
+
+def download_video(url, job_dir, token):
+    output_path = f"{job_dir}/source_video.mp4"
+    # Hapus file lama jika ada
+    if os.path.exists(output_path): os.remove(output_path)
+
+    ydl_opts = {
+        # 720p-1080p dengan audio (digabung FFmpeg), fallback ke format terbaik yang ada
+        'format': 'bestvideo[height>=720][height<=1080]+bestaudio/bestvideo+bestaudio/best',
+        'outtmpl': f"{job_dir}/raw_video.%(ext)s",
+        'merge_output_format': 'mp4',
+        'quiet': True,
+        'no_warnings': True,
+        'socket_timeout': 30,
+        'retries': 5,
+        # Dipanggil tiap potongan data: Stop menghentikan download di tengah jalan
+        'progress_hooks': [lambda d: token.check()],
+        'postprocessors': [{'key': 'FFmpegVideoConvertor', 'preferedformat': 'mp4'}],
+    }
+
+    try:
+        log_info(f"Mendownload Video: {url}")
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            ydl.download([url])
+
+        # yt-dlp kadang menamai file raw_video.mp4 atau raw_video.webm.mp4
+        for file in os.listdir(job_dir):
+            if file.startswith("raw_video"):
+                shutil.move(os.path.join(job_dir, file), output_path)
+                return output_path
+        return None
+    except BaseException as e:
+        # yt-dlp bisa membungkus exception dari progress hook, jadi cek token-nya langsung
+        if isinstance(e, Cancelled) or token.cancelled():
+            _remove_raw_downloads(job_dir)
+            raise Cancelled("Download dibatalkan")
+        if not isinstance(e, Exception): raise
+        log_error(f"Gagal Download: {e}")
+        return None
+
+
+def probe_source(source_path):
+    """Durasi + ada tidaknya audio di video sumber (cukup header, tanpa decoder)"""
+    duration, has_audio = probe(source_path)
+    return source_path, duration, has_audio
+
+
+def fetch_source(url, job_dir, token):
+    """Tahap download (I/O): unduh video lalu baca durasinya"""
+    with step("download"):
+        source_path = download_video(url, job_dir, token)
+    if not source_path:
+        raise RuntimeError("Download gagal")
+    count(download_bytes=os.path.getsize(source_path))
+    return probe_source(source_path)
+
+
+def ingest(source, job_dir, token):
+    """URL -> download ke `job_dir`; file lokal dipakai langsung. Returns (path, durasi, ada_audio)"""
+    if source.startswith(('http://', 'https://')):
+        return fetch_source(source, job_dir, token)
+    return probe_source(source)
+
+
+def extract_audio(source_path, audio_path, ws, token):
+    """Tahap ekstraksi audio (I/O, ffmpeg yang bekerja)"""
+    # Hanya stream audio yang dibuka (tanpa decoder video)
+    video = mpy.AudioFileClip(source_path)
+    # 16 kHz mono = format yang dipakai Whisper, jauh lebih kecil dari 44.1 kHz stereo
+    ws.reserve(int(video.duration * 16000 * 2))
+    with partial_output(audio_path):
+        video.write_audiofile(audio_path, fps=16000, nbytes=2, ffmpeg_params=['-ac', '1'],
+                                    verbose=False, logger=CancelLogger(token))
+    video.close()
+    return audio_path
+
+
+# ==========================================
+# TRANSKRIPSI + ANALISIS AI
+# ==========================================
+
+def transcribe(audio_path, token, config=None):
+    """Whisper per potongan ~30 detik (bisa dibatalkan); None kalau gagal"""
+    config = dict(DEFAULTS, **(config or {}))
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    log_info(f"Engine Transkripsi berjalan di: {device.upper()}")
+
+    try:
+        with step("load_model"):
+            model = whisper.load_model(config['whisper_model'], device=device)
+        audio_seconds = meter("transcribe", unit='audio s')
+        with step("whisper"):
+            result = transcribe_chunked(model, audio_path, token, language=config['language'], task='transcribe',
+                                        fp16=False, word_timestamps=True, meter=audio_seconds)
+        count(audio_seconds=audio_seconds.done)
+        return result
+    except Exception as e:
+        log_error(f"Error Transkripsi: {e}")
+        return None
+
+
+def transcript_text(whisper_result):
+    """Transkrip berformat '[start - end] kalimat' per baris, input untuk LLM"""
+    return "".join(f"[{seg['start']:.1f}s - {seg['end']:.1f}s] {seg['text']}\n" for seg in whisper_result['segments'])
+
+
+def analyze_hooks_with_groq(api_key, text, num_clips, min_seconds=30, max_seconds=60):
+    """Kandidat klip dari LLM (urut dari paling viral); durasi dipaksa ke [min_seconds, max_seconds]"""
+    client = groq.Groq(api_key=api_key)
+    safe_text = text[:25000] # Limit token
+    log_info(f"Mengirim {len(safe_text)} karakter ke AI Groq...")
+
+    prompt = f"""
+    You are a professional Video Editor specialized in creating viral short-form content.
+    Analyze this transcript and find exactly {num_clips} compelling segments for TikTok/YouTube Shorts.
+
+    DURATION RULES:
+    - Each clip MUST be {min_seconds}-{max_seconds} seconds long
+    - Duration = end - start must be between {min_seconds} and {max_seconds} seconds
+
+    CUTTING RULES (VERY IMPORTANT):
+    - Use the EXACT timestamps from the transcript to determine start/end points
+    - START each clip at the BEGINNING of a sentence (use the start timestamp of that line)
+    - END each clip at the END of a complete sentence (use the end timestamp of that line)
+    - NEVER cut in the middle of a sentence
+    - Look for natural pauses, transitions, or topic changes between lines
+
+    CONTENT CRITERIA:
+    1. Strong hook in first 3-5 seconds (question, bold statement, surprising fact)
+    2. Self-contained context - viewer should understand without prior context
+    3. Emotional impact or valuable information
+    4. Clear beginning and satisfying ending
+    5. Order the segments from most to least viral (best first)
+
+    TRANSCRIPT FORMAT: [start_time - end_time] text
+    Each line shows when that sentence starts and ends.
+
+    TRANSCRIPT:
+    {safe_text}
+
+    OUTPUT FORMAT - Return STRICT JSON ONLY:
+    [
+      {{ "start": 120.0, "end": 165.0, "title": "Rahasia Sukses Terungkap" }},
+      {{ "start": 300.5, "end": 350.0, "title": "Jangan Lakukan Ini" }}
+    ]
+
+    TITLE RULES:
+    - Create CATCHY, HOOKABLE titles that make people want to watch
+    - Use Indonesian language for titles
+    - Use NORMAL SPACES between words (NOT underscores)
+    - Keep titles short (3-6 words)
+    - Examples: "Rahasia Sukses Terungkap", "Jangan Lakukan Ini", "Fakta Mengejutkan"
+
+    Make sure each segment starts and ends at natural speech boundaries!
+    """
+
+    try:
+        chat_completion = client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant that outputs only valid JSON. "
+                                              f"Each clip MUST be {min_seconds}-{max_seconds} seconds long."},
+                {"role": "user", "content": prompt}
+            ],
+            model="llama-3.3-70b-versatile",
+            temperature=0.6,
+            response_format={"type": "json_object"},
+        )
+        data = json.loads(chat_completion.choices[0].message.content)
+    except Exception as e:
+        log_error(f"Groq API Error: {e}")
+        return []
+
+    clips = []
+    if isinstance(data, list):
+        clips = data
+    elif isinstance(data, dict):
+        clips = next((v for v in data.values() if isinstance(v, list)), [])
+
+    valid_clips = []
+    for clip in clips:
+        try:
+            start, end = float(clip.get('start', 0)), float(clip.get('end', 0))
+        except (TypeError, ValueError, AttributeError):
+            continue
+        duration = end - start
+        if duration < min_seconds:
+            log_warning(f"Klip '{clip.get('title', '?')}' terlalu pendek ({duration:.1f}s), diperpanjang ke {min_seconds}s")
+            clip['end'] = start + min_seconds
+        elif duration > max_seconds:
+            log_warning(f"Klip '{clip.get('title', '?')}' terlalu panjang ({duration:.1f}s), dipotong ke {max_seconds}s")
+            clip['end'] = start + max_seconds
+        valid_clips.append(clip)
+    return valid_clips
+
+
+def select_clips(candidates, config, video_duration=None, segments=None):
+    """
+    Buang klip duplikat/overlap dari kandidat LLM, isi ulang dengan kandidat berikutnya.
+    `segments` ([(start, end)] segmen Whisper): klip yang dipotong berakhir di akhir kalimat
+    """
+    return clip_planner.plan_clips(candidates, config['clip_count'], iou_threshold=config['dedupe_iou'],
+                                   min_duration=config['min_clip_seconds'], max_duration=config['max_clip_seconds'],
+                                   video_duration=video_duration, sentence_ends=[end for _, end in segments or ()],
+                                   log=log)
+
+
+def plan_clips(api_key, whisper_result, config=None, video_duration=None):
+    """Transkrip -> daftar klip final (LLM + dedupe)"""
+    config = dict(DEFAULTS, **(config or {}))
+    candidates = analyze_hooks_with_groq(api_key, transcript_text(whisper_result),
+                                         clip_planner.candidate_count(config['clip_count']),
+                                         config['min_clip_seconds'], config['max_clip_seconds'])
+    segments = [(seg['start'], seg['end']) for seg in whisper_result['segments']]
+    return select_clips(candidates, config, video_duration, segments)
+
+
+# ==========================================
+# FACE TRACKING
+# ==========================================
+
+class HybridTracker:
+    """
+    Detektor penuh hanya tiap `redetect_every` frame; di antaranya wajah diikuti template matching
+    (NCC di sekitar posisi terakhir, jauh lebih murah dari scan multi-scale). Skor match di bawah
+    `min_confidence` = tracking gagal -> detektor langsung dijalankan lagi di frame itu.
+    redetect_every=0: detektor saja, tiap `detector.every` frame (perilaku lama).
+
+    Sampling adaptif (`max_interval` frame diisi): energi beda antar frame (thumbnail abu-abu)
+    di sekitar wajah menentukan interval deteksi. Wajah diam -> interval dilipatgandakan sampai
+    `max_interval` dan template matching pun dilewati; gerakan -> deteksi tiap frame;
+    cut (beda besar di seluruh frame) -> deteksi saat itu juga.
+    """
+    still_threshold = 0.015   # Rata-rata |beda| piksel (0-1) di bawah ini = shot diam
+    motion_threshold = 0.04   # Di atas ini = kamera/orang bergerak
+    cut_threshold = 0.15      # Di atas ini = pergantian shot
+    thumb_width = 96
+
+    def __init__(self, detector, redetect_every=15, min_confidence=0.6, max_interval=None):
+        self.detector = detector
+        self.redetect_every = redetect_every
+        self.min_confidence = min_confidence
+        self.max_interval = max_interval if redetect_every else None
+        self.interval = detector.every
+        self.template = None
+        self.box = None
+        self.since_detect = self.interval  # frame pertama selalu dideteksi
+        self.thumb = None
+        self.peak_motion = 0.0
+        self.locked = False
+        self.detections = 0
+        self.redetects = 0  # deteksi karena skor tracking turun atau cut
+
+    def update(self, frame):
+        """Face box for this frame (frame pixels), or None if unknown"""
+        self.since_detect += 1
+        due = self.since_detect > self.interval
+        gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY) if self.redetect_every else None
+        motion, cut = self._motion(gray) if self.max_interval else (None, None)
+        if motion is not None:
+            self.peak_motion = max(self.peak_motion, motion)
+            if cut >= self.cut_threshold and not due:
+                self.redetects += 1
+                due = True
+        if not due:
+            if self.template is None:
+                return None
+            if motion is not None and motion < self.still_threshold:
+                return self.box  # Shot diam: posisi tidak berubah, template matching pun dilewati
+            if self._follow(gray):
+                return self.box
+            self.redetects += 1
+        return self._detect(frame, gray)
+
+    def _motion(self, gray):
+        """(gerakan di sekitar wajah, gerakan seluruh frame), rata-rata |beda| piksel 0-1"""
+        h, w = gray.shape
+        thumb = cv2.resize(gray, (self.thumb_width, max(1, h * self.thumb_width // w)),
+                           interpolation=cv2.INTER_AREA).astype(np.int16)
+        previous, self.thumb = self.thumb, thumb
+        if previous is None:
+            return 1.0, 1.0
+        diff = np.abs(thumb - previous)
+        whole = float(diff.mean()) / 255
+        if self.box is None:
+            return whole, whole
+        # Kotak wajah + margin setengah ukurannya, di koordinat thumbnail
+        scale = self.thumb_width / w
+        x, y, bw, bh = self.box
+        x0, y0 = int((x - bw / 2) * scale), int((y - bh / 2) * scale)
+        x1, y1 = int((x + bw * 1.5) * scale) + 1, int((y + bh * 1.5) * scale) + 1
+        roi = diff[max(0, y0):y1, max(0, x0):x1]
+        return (float(roi.mean()) / 255 if roi.size else whole), whole
+
+    def lock(self, frame, box):
+        """Follow `box` from this frame on; later re-detections pick the face nearest to it"""
+        self.locked = True
+        self.detections += 1  # `box` berasal dari deteksi pemanggil (misal active_speaker)
+        self.since_detect = 1
+        self._set_box(cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY) if self.redetect_every else None, box)
+        self._adapt()
+        return self.box
+
+    def _detect(self, frame, gray):
+        self.detections += 1
+        self.since_detect = 1
+        if self.locked and self.box is not None:
+            # Tetap di wajah yang dikunci (framing 'speaker'), bukan wajah terbesar
+            x, y, w, h = self.box
+            faces = self.detector.faces(frame)
+            box = min(faces, key=lambda f: abs(f[0] + f[2] / 2 - x - w / 2)) if faces else None
+        else:
+            box = self.detector.box(frame)
+        self._set_box(gray, box)
+        self._adapt()
+        return self.box
+
+    def _set_box(self, gray, box):
+        self.template = self.box = None
+        if box is not None:
+            x, y, w, h = (int(round(v)) for v in box)
+            x, y = max(0, x), max(0, y)
+            self.box = (x, y, w, h)
+            if self.redetect_every and w >= 8 and h >= 8:
+                self.template = gray[y:y + h, x:x + w].copy()
+                self.box = (x, y) + self.template.shape[::-1]
+
+    def _adapt(self):
+        # Interval deteksi berikutnya dari gerakan terbesar sejak deteksi sebelumnya
+        if not self.redetect_every:
+            return
+        if not self.max_interval:
+            self.interval = self.redetect_every if self.template is not None else self.detector.every
+        elif self.peak_motion >= self.motion_threshold:
+            self.interval = 1
+        elif self.peak_motion < self.still_threshold:
+            self.interval = min(self.max_interval, max(self.interval, 1) * 2)
+        else:
+            # Sedikit gerakan: turun bertahap ke interval normal, tidak langsung reset
+            self.interval = max(self.interval // 2, min(self.max_interval, self.redetect_every))
+        self.peak_motion = 0.0
+
+    def _follow(self, gray):
+        # Cari template di jendela sekitar kotak terakhir (margin setengah ukuran wajah)
+        x, y, w, h = self.box
+        mx, my = w // 2 + 1, h // 2 + 1
+        x0, y0 = max(0, x - mx), max(0, y - my)
+        window = gray[y0:y + h + my, x0:x + w + mx]
+        if window.shape[0] < h or window.shape[1] < w:
+            return False
+        scores = cv2.matchTemplate(window, self.template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (dx, dy) = cv2.minMaxLoc(scores)
+        if score < self.min_confidence:
+            return False
+        self.box = (x0 + dx, y0 + dy, w, h)
+        return True
+
+
+def active_speaker(detector, frames):
+    """
+    Kotak wajah (di frames[0]) yang paling banyak gerak mulutnya selama `frames` (awal giliran bicara):
+    beda antar frame di separuh bawah tiap kotak. Satu wajah / tidak ada gerakan -> wajah terbaik detektor.
+    """
+    faces = detector.faces(frames[0])
+    if len(faces) < 2:
+        return faces[0] if faces else None
+    grays = [cv2.cvtColor(f, cv2.COLOR_RGB2GRAY).astype(np.int16) for f in frames]
+    scores = []
+    for x, y, w, h in faces:
+        x0, x1 = int(max(0, x)), int(x + w)
+        y0, y1 = int(max(0, y + h / 2)), int(y + h)
+        mouth = [g[y0:y1, x0:x1] for g in grays]
+        scores.append(sum(float(np.abs(b - a).mean()) for a, b in zip(mouth, mouth[1:]) if a.size))
+    best = max(range(len(faces)), key=scores.__getitem__)
+    return faces[best] if scores[best] > 0 else faces[0]
+
+
+def speaker_boxes(frames, tracker, turn_starts, lookahead):
+    """
+    Kotak wajah per frame untuk framing 'speaker': di awal tiap giliran (index frame di `turn_starts`)
+    `lookahead` frame ditahan untuk memilih pembicara, lalu wajah itu dikunci sampai giliran selesai.
+    """
+    def lock_turn(buffered):
+        yield tracker.lock(buffered[0], active_speaker(tracker.detector, buffered))
+        for buffered_frame in buffered[1:]:
+            yield tracker.update(buffered_frame)
+
+    starts = set(turn_starts)
+    buffered = None
+    for i, frame in enumerate(frames):
+        if i in starts:
+            if buffered:
+                yield from lock_turn(buffered)
+            buffered = []
+        if buffered is not None:
+            buffered.append(frame.copy())  # View ring/decoder hanya valid sampai frame berikutnya
+            if len(buffered) >= lookahead:
+                yield from lock_turn(buffered)
+                buffered = None
+            continue
+        yield tracker.update(frame)
+    if buffered:
+        yield from lock_turn(buffered)
+
+
+def _decode_to_ring(ring, source_video, start_t, end_t, fps, config, width):
+    """Process decoder: tulis frame sumber ke ring, berhenti kalau consumer membatalkan"""
+    try:
+        with closing(source_pool(config).frames(source_video, start_t, end_t, fps, width)) as decoded:
+            for frame in decoded:
+                ring.put(frame)
+        ring.close()
+    except Cancelled:
+        pass
+    except BaseException:
+        ring.abort()
+        raise
+    finally:
+        close_sources()
+        ring.release()
+
+
+@contextmanager
+def decoded_frames(source_video, start_t, end_t, fps, config, width=None):
+    """
+    Frame RGB sumber untuk [start_t, end_t), selebar `width` (None = resolusi asli; di-scale ffmpeg
+    saat decode, bukan resize per frame di Python): langsung dari decoder di process ini, atau kalau
+    `decode_process` aktif dari process decoder terpisah lewat FrameRing (view read-only, tanpa
+    copy/pickle), jadi decode dan deteksi wajah / crop + encode berjalan di core berbeda.
+    """
+    pool = source_pool(config)
+    if not config['decode_process']:
+        with closing(pool.frames(source_video, start_t, end_t, fps, width)) as frames:
+            yield frames
+        return
+
+    with pool.clip(source_video, audio=False, width=width) as clip:
+        frame_w, frame_h = clip.size
+    # spawn, bukan fork: GUI (dan worker scheduler) punya thread lain, fork hanya menyalin thread ini
+    ctx = multiprocessing.get_context('spawn')
+    ring = FrameRing((frame_h, frame_w, 3), slots=config['ring_slots'], ctx=ctx)
+    decoder = ctx.Process(target=_decode_to_ring, name="decoder", daemon=True,
+                          args=(ring, source_video, start_t, end_t, fps, config, width))
+    decoder.start()
+    frames = ring.frames()
+    try:
+        yield frames
+    finally:
+        frames.close()
+        ring.abort()  # Consumer berhenti lebih awal (batal/error): hentikan decoder juga
+        decoder.join(5)
+        if decoder.is_alive():
+            decoder.terminate()
+        ring.unlink()
+
+
+def smooth_centers(centers, window=15, cuts=()):
+    """Moving average posisi wajah supaya crop tidak bergetar; tidak melewati index `cuts` (pindah langsung)"""
+    centers = np.asarray(centers, dtype=np.float64)
+    out = np.empty_like(centers)
+    bounds = [0] + [c for c in sorted(cuts) if 0 < c < len(centers)] + [len(centers)]
+    for a, b in zip(bounds, bounds[1:]):
+        part = centers[a:b]
+        if len(part) > window:
+            # Tepi diisi nilai ujung, supaya awal/akhir potongan tidak ditarik ke 0
+            padded = np.pad(part, (window // 2, window - 1 - window // 2), mode='edge')
+            part = np.convolve(padded, np.ones(window) / window, mode='valid')
+        out[a:b] = part
+    return out
+
+
+def track(source_video, start_t, end_t, clip_name, token, config=None, segments=None):
+    """
+    Tahap tracking (CPU): posisi tengah crop per frame, sudah di-smooth.
+    framing 'speaker' + `segments` ([(start, end)] segmen Whisper): crop dikunci ke pembicara per giliran
+    """
+    config = dict(DEFAULTS, **(config or {}))
+    log_info(f"Tracking: {clip_name}")
+    pool = source_pool(config)
+    if not config['proxy_width']:
+        # Proxy selebar input yang paling cocok untuk detektornya
+        config['proxy_width'] = getattr(DETECTORS.get(config['detector']), 'input_width', 320)
+
+    # Analisis di proxy kecil; posisi crop tetap dalam pixel sumber untuk render
+    with pool.clip(source_video, audio=False, width=config['proxy_width']) as clip:
+        fps, proxy_w = clip.fps, clip.size[0]
+        end_t = min(end_t, clip.duration)
+    width = video_size(source_video)[0]
+    frames = meter(f"track:{clip_name}", total=int(round((end_t - start_t) * fps)))
+
+    # Giliran bicara: deteksi hanya di awal giliran, antar giliran crop pindah langsung (bukan pan)
+    cuts = []
+    if config['framing'] == 'speaker' and segments is not None:
+        samples = None
+        if config['speaker_change_audio']:
+            samples = pool.audio(source_video, start_t, end_t, fps=16000).mean(axis=1)
+        turns = speaker_turns(segments, start_t, end_t, samples, 16000, config['min_turn_seconds'])
+        cuts = [int(round((turn_start - start_t) * fps)) for turn_start, _ in turns]
+        log_info(f"Framing {clip_name}: {len(turns)} giliran bicara")
+
+    # Frame dibaca langsung dari decoder sumber yang di-pool (tanpa encode file sementara)
+    centers = []
+    with step("detect"), decoded_frames(source_video, start_t, end_t, fps, config, config['proxy_width']) as decoded:
+        try:
+            detector = create_detector(config['detector'], config)
+            if cuts:
+                # Dalam satu giliran wajah diikuti template; deteksi ulang hanya kalau tracking gagal
+                tracker = HybridTracker(detector, frames.total + 1, config['track_min_confidence'])
+                boxes = speaker_boxes(decoded, tracker, cuts, max(2, int(0.4 * fps)))
+            else:
+                max_interval = int(config['max_redetect_seconds'] * fps) if config['adaptive_sampling'] else None
+                tracker = HybridTracker(detector, config['redetect_every'], config['track_min_confidence'],
+                                        max_interval)
+                boxes = map(tracker.update, decoded)
+            max_jump = detector.max_jump
+            turn_starts = set(cuts)
+            last_x, found = width / 2, 0
+            for box in boxes:
+                # Cancelled bukan Exception, jadi tidak jatuh ke fallback center crop di bawah
+                token.check()
+                if box is not None:
+                    x_c = (box[0] + box[2] / 2) / proxy_w * width
+                    if max_jump and len(centers) not in turn_starts:
+                        # Transisi halus: jangan lompat terlalu jauh per frame
+                        limit = width * max_jump
+                        x_c = last_x + max(-limit, min(limit, x_c - last_x))
+                    last_x = x_c
+                    found += 1
+                # Tanpa wajah: posisi terakhir dipertahankan
+                centers.append(last_x)
+                frames.update(len(centers))
+            count(detections=tracker.detections, redetections=tracker.redetects)
+            log_info(f"Face tracking {clip_name}: {len(centers)} frame, wajah di {found}, "
+                     f"{tracker.detections} kali deteksi")
+        except Exception as e:
+            log_warning(f"Face tracking gagal, pakai center crop: {str(e)[:50]}")
+            centers = [width // 2] * max(1, frames.total)
+    count(frames=len(centers))
+    gauge(**pool.metrics())
+
+    if not centers: centers = [width//2]
+    centers = smooth_centers(centers, config['smooth_window'], cuts)
+
+    return {'centers': np.asarray(centers, dtype=np.float32), 'fps': fps, 'end': end_t}
+
+
+# ==========================================
+# SUBTITLE + RENDER
+# ==========================================
+
+def _hex_rgb(color):
+    color = color.lstrip('#')
+    return tuple(int(color[i:i+2], 16) for i in (0, 2, 4))
+
+
+@lru_cache(maxsize=8)
+def _pil_font(size):
+    for path in ("C:/Windows/Fonts/impact.ttf", "C:/Windows/Fonts/arial.ttf"):
+        if os.path.exists(path):
+            return pil_font.truetype(path, size)
+    return pil_font.load_default()
+
+
+def _pil_text_array(text, color, config):
+    """RGBA array teks + stroke (renderer 'pil')"""
+    font = _pil_font(config['font_size'])
+    bbox = pil_draw.Draw(pil_image.new('RGBA', (1, 1))).textbbox((0, 0), text, font=font)
+    img = pil_image.new('RGBA', (bbox[2] - bbox[0] + 20, bbox[3] - bbox[1] + 20), (0, 0, 0, 0))
+    draw = pil_draw.Draw(img)
+    x, y = 10, 10
+    stroke_w = config['stroke_width']
+    for dx in range(-stroke_w, stroke_w+1):
+        for dy in range(-stroke_w, stroke_w+1):
+            draw.text((x+dx, y+dy), text, font=font, fill=_hex_rgb(config['stroke_color']))
+    draw.text((x, y), text, font=font, fill=_hex_rgb(color))
+    return np.array(img)
+
+
+def create_hormozi_subtitle(word_data, vid_w, vid_h, config):
+    raw_text = word_data.get('word', word_data.get('text', '')).strip()
+    if not raw_text: return None
+
+    text = raw_text.upper()
+    color = config['font_color_alt'] if len(text) <= 3 else config['font_color']
+
+    # Kalkulasi posisi Y (jika float, anggap persentase)
+    text_y = config['text_position']
+    pos_y = text_y if text_y > 1 else int(vid_h * text_y)
+
+    if config.get('subtitle_renderer') == 'pil':
+        clip = mpy.ImageClip(_pil_text_array(text, color, config), ismask=False)
+    else:
+        clip = mpy.TextClip(
+            text,
+            fontsize=config['font_size'],
+            color=color,
+            font=config.get('font', DEFAULTS['font']),
+            stroke_color=config['stroke_color'],
+            stroke_width=config['stroke_width'],
+            method='caption', # Menggunakan method caption agar auto-wrap jika terlalu panjang
+            size=(int(vid_w * 0.9), None)
+        )
+    return (clip.set_position(('center', pos_y))
+            .set_start(word_data['start'])
+            .set_end(word_data['end']))
+
+
+def compose(clip, start_t, end_t, word_index, config, track):
+    """Crop 9:16 mengikuti hasil tracking + subtitle -> klip 1080x1920 yang siap di-encode"""
+    centers, fps = track['centers'], track['fps']
+
+    def crop_fn(get_frame, t):
+        idx = int(t * fps)
+        safe_idx = min(idx, len(centers)-1)
+        cx = centers[safe_idx]
+        img = get_frame(t)
+        h, w = img.shape[:2]
+        # Rasio 9:16, lebar genap (wajib untuk H.264)
+        target_width = int(h * 9/16)
+        target_width -= target_width % 2
+
+        # Hitung koordinat crop (pastikan tidak keluar batas gambar)
+        x1 = int(cx - target_width/2)
+        x1 = max(0, min(w - target_width, x1))
+
+        return img[:, x1:x1+target_width]
+
+    final_clip = clip.fl(crop_fn, apply_to=['mask']).resize(OUTPUT_SIZE)
+
+    # Subtitles
+    subs = []
+    vid_w, vid_h = final_clip.w, final_clip.h
+    valid_words = word_index.words_between(start_t, end_t) if config.get('enable_subtitle', True) else []
+
+    with step("subtitles"):
+        for w in valid_words:
+            word_data = {
+                'word': w.get('word', w.get('text', '')),
+                'start': w['start'] - start_t,
+                'end': w['end'] - start_t
+            }
+            try:
+                txt_clip = create_hormozi_subtitle(word_data, vid_w, vid_h, config)
+                if txt_clip: subs.append(txt_clip)
+            except Exception as e:
+                # Kadang error font tidak ditemukan
+                log_warning(f"Sub Error: {str(e)[:80]}")
+                continue
+
+    return mpy.CompositeVideoClip([final_clip] + subs)
+
+
+def render(source_video, start_t, end_t, clip_name, word_index, config, ws, track, token):
+    """Tahap render (CPU): crop 9:16 mengikuti hasil tracking + subtitle, lalu encode"""
+    config = dict(DEFAULTS, **config)
+    if config['mezzanine']:
+        # Pipeline frame render_formats: sekalian menyimpan intermediate bersih untuk ganti style
+        fmt = config['formats'][0]
+        return render_formats(source_video, start_t, end_t, clip_name, word_index, dict(config, formats=[fmt]),
+                              ws, track, token)[fmt]
+    log_info(f"Render: {clip_name}")
+    end_t = track['end']
+
+    safe_name = safe_filename(clip_name)
+    output_filename = f"{config['output_dir']}/{safe_name}.mp4"
+    temp_audio = ws.path(f"{safe_name}_audio.m4a")
+    encoded = meter(f"render:{clip_name}")
+
+    # Decoder sumber dipinjam dari pool; klip turunannya tidak di-close (reader-nya dipakai ulang)
+    pool = source_pool(config)
+    with pool.clip(source_video, audio=False, start_t=start_t) as full_clip, \
+            partial_output(output_filename, temp_audio):
+        with step("audio"):
+            write_clip_audio(source_video, start_t, end_t, temp_audio)
+        final = compose(full_clip.subclip(start_t, end_t), start_t, end_t, word_index, config, track)
+        # Dibatalkan -> ffmpeg di-kill dan file setengah jadi di folder output dihapus
+        with step("encode"):
+            # audio = nama file: MoviePy me-mux-nya apa adanya (-acodec copy), tidak di-decode ulang
+            final.write_videofile(output_filename, **RENDER_PARAMS, audio=temp_audio,
+                                  logger=CancelLogger(token, encoded))
+    count(frames=encoded.done)
+    gauge(**pool.metrics())
+
+    log_success(f"Disimpan: {output_filename}")
+    return output_filename
+
+
+# Format output multi-platform: rasio -> ukuran akhir (lebar sama, jadi raster subtitle dipakai bersama)
+FORMATS = {'9:16': (1080, 1920), '4:5': (1080, 1350), '1:1': (1080, 1080)}
+
+
+def format_output(config, safe_name, fmt):
+    """Path output per format: format pertama tanpa akhiran, lainnya misal Short_1_1x1.mp4"""
+    suffix = "" if fmt == config['formats'][0] else "_" + fmt.replace(':', 'x')
+    return f"{config['output_dir']}/{safe_name}{suffix}.mp4"
+
+
+def crop_window(frame_w, frame_h, out_w, out_h, cx):
+    """(x1, y1, w, h) crop dengan rasio out_w:out_h, berpusat di cx, di dalam frame, ukuran genap"""
+    w, h = int(frame_h * out_w / out_h), frame_h
+    if w > frame_w:
+        w, h = frame_w, int(frame_w * out_h / out_w)
+    w, h = w - w % 2, h - h % 2
+    x1 = max(0, min(frame_w - w, int(cx - w / 2)))
+    return x1, (frame_h - h) // 2, w, h
+
+
+class SubtitleRasters:
+    """
+    Subtitle per kata sebagai RGBA array, dirasterisasi sekali per (teks, warna) lalu ditempel
+    ke frame semua format. Posisi Y mengikuti `text_position` relatif ke tinggi tiap format.
+    """
+
+    def __init__(self, words, start_t, config):
+        self.config = config
+        self.cache = {}
+        self.failed = set()
+        self.words = []
+        for w in words:
+            text = w.get('word', w.get('text', '')).strip().upper()
+            if text:
+                self.words.append((w['start'] - start_t, w['end'] - start_t, text))
+
+    def raster(self, text, width):
+        color = self.config['font_color_alt'] if len(text) <= 3 else self.config['font_color']
+        key = (text, color, width)
+        if key not in self.cache:
+            with step("subtitles"):
+                if self.config.get('subtitle_renderer') == 'pil':
+                    rgba = _pil_text_array(text, color, self.config)
+                else:
+                    word = create_hormozi_subtitle({'word': text, 'start': 0, 'end': 1}, width, width, self.config)
+                    rgb = word.get_frame(0)
+                    alpha = word.mask.get_frame(0) * 255 if word.mask is not None else np.full(rgb.shape[:2], 255)
+                    rgba = np.dstack([rgb, alpha]).astype(np.uint8)
+            self.cache[key] = rgba
+        return self.cache[key]
+
+    def draw(self, frame, t):
+        """Alpha-blend the words active at clip time `t` onto `frame` (in place)"""
+        out_h, out_w = frame.shape[:2]
+        text_y = self.config['text_position']
+        pos_y = int(text_y if text_y > 1 else out_h * text_y)
+        for start, end, text in self.words:
+            if not start <= t < end or text in self.failed:
+                continue
+            try:
+                rgba = self.raster(text, out_w)
+            except Exception as e:
+                log_warning(f"Sub Error: {str(e)[:80]}")
+                self.failed.add(text)
+                continue
+            h, w = rgba.shape[:2]
+            x = (out_w - w) // 2
+            # Bagian raster yang keluar frame dipotong
+            fx0, fy0 = max(0, x), max(0, pos_y)
+            fx1, fy1 = min(out_w, x + w), min(out_h, pos_y + h)
+            if fx0 >= fx1 or fy0 >= fy1:
+                continue
+            src = rgba[fy0 - pos_y:fy1 - pos_y, fx0 - x:fx1 - x]
+            alpha = src[..., 3:4].astype(np.float32) / 255
+            region = frame[fy0:fy1, fx0:fx1]
+            region[:] = (region * (1 - alpha) + src[..., :3] * alpha).astype(np.uint8)
+
+
+# Intermediate bersih (crop + scale, tanpa subtitle) per klip/format: ganti style subtitle cukup
+# overlay + encode ulang dari file ini. Kualitas tinggi supaya encode kedua tidak terlihat.
+MEZZANINE_PARAMS = dict(codec='libx264', preset='veryfast', ffmpeg_params=['-crf', '14', '-pix_fmt', 'yuv420p'])
+
+
+def mezzanine_key(source_video, start_t, end_t, track, size):
+    """Key intermediate: identitas sumber, rentang waktu, hash jalur crop, ukuran dan setelan encode"""
+    centers = np.ascontiguousarray(track['centers'], dtype=np.float32)
+    return params_key({
+        'source': job_id_for_source(source_video), 'start': start_t, 'end': track['end'],
+        'track': hashlib.sha1(centers.tobytes()).hexdigest(), 'track_fps': track['fps'],
+        'size': list(size), 'fps': RENDER_PARAMS['fps'], 'encode': MEZZANINE_PARAMS,
+    })
+
+
+def _video_writer(path, size, audiofile=None, params=None, gop=None):
+    params = dict(RENDER_PARAMS, **(params or {}))
+    ffmpeg_params = params['ffmpeg_params'] + (['-g', str(gop), '-keyint_min', str(gop)] if gop else [])
+    return ffmpeg_writer.FFMPEG_VideoWriter(path, size, params['fps'], codec=params['codec'], audiofile=audiofile,
+                                            preset=params['preset'], threads=RENDER_PARAMS['threads'],
+                                            ffmpeg_params=ffmpeg_params)
+
+
+def _clip_paths(source_video, start_t, clip_name, config, ws, track):
+    """(outputs, intermediates, audio) klip: {fmt: output}, {fmt: mezzanine} (kosong kalau mati), path audio"""
+    safe_name = safe_filename(clip_name)
+    outputs = {fmt: format_output(config, safe_name, fmt) for fmt in config['formats']}
+    if not config['mezzanine']:
+        return outputs, {}, ws.path(f"{safe_name}_audio.m4a")
+    mezz = {}
+    for fmt in config['formats']:
+        key = mezzanine_key(source_video, start_t, track['end'], track, FORMATS[fmt])
+        mezz[fmt] = os.path.join(ws.job_dir, f"mezzanine_{key}.mp4")
+    audio_key = params_key({'source': job_id_for_source(source_video), 'start': start_t, 'end': track['end']})
+    return outputs, mezz, os.path.join(ws.job_dir, f"mezzanine_{audio_key}.m4a")
+
+
+def _part(path, tag="part"):
+    return f"{path[:-len('.mp4')]}.{tag}.mp4"
+
+
+def clip_frame_count(start_t, end_t):
+    return int(round((end_t - start_t) * RENDER_PARAMS['fps']))
+
+
+def format_frames(source_video, start_t, track, formats, first, last, config, mezz=None):
+    """
+    {fmt: frame RGB} tanpa subtitle untuk frame klip [first, last) pada fps render.
+    `mezz` ({fmt: path} intermediate yang sudah ada): frame dibaca dari sana, sumber tidak dibuka.
+    """
+    fps = RENDER_PARAMS['fps']
+    if mezz:
+        # Intermediate dipakai sekali per render, jadi dibuka langsung (bukan lewat pool sumber)
+        cleans = [mpy.VideoFileClip(mezz[fmt], audio=False) for fmt in formats]
+        try:
+            streams = [c.subclip(first / fps, min(last / fps, c.duration)).iter_frames(fps=fps, dtype='uint8')
+                       for c in cleans]
+            for frames in itertools.islice(zip(*streams), last - first):
+                yield {fmt: frame.copy() for fmt, frame in zip(formats, frames)}
+        finally:
+            for clean in cleans:
+                clean.close()
+        return
+
+    centers, track_fps = track['centers'], track['fps']
+    # decode_process: frame resolusi penuh datang dari process decoder lewat FrameRing
+    with decoded_frames(source_video, start_t + first / fps, start_t + last / fps, fps, config) as decoded:
+        for i, frame in enumerate(itertools.islice(decoded, last - first), first):
+            cx = centers[min(int(i / fps * track_fps), len(centers) - 1)]
+            out = {}
+            for fmt in formats:
+                x1, y1, w, h = crop_window(frame.shape[1], frame.shape[0], *FORMATS[fmt], cx)
+                out[fmt] = cv2.resize(frame[y1:y1 + h, x1:x1 + w], FORMATS[fmt], interpolation=cv2.INTER_AREA)
+            yield out
+
+
+def write_frames(frames, first, outputs, cleans, subtitles, token, encoded, audiofile=None, gop=None):
+    """
+    Encode hasil format_frames: tiap format ke encoder ffmpeg sendiri (berjalan paralel),
+    versi bersihnya ke `cleans` ({fmt: path}) sebelum subtitle ditempel.
+    """
+    fps = RENDER_PARAMS['fps']
+    writers, clean_writers = {}, {}
+    try:
+        for fmt, path in outputs.items():
+            writers[fmt] = _video_writer(path, FORMATS[fmt], audiofile, gop=gop)
+        for fmt, path in cleans.items():
+            clean_writers[fmt] = _video_writer(path, FORMATS[fmt], params=MEZZANINE_PARAMS, gop=gop)
+        for i, out in enumerate(frames, first):
+            token.check()
+            for fmt, frame in out.items():
+                if fmt in clean_writers:
+                    clean_writers[fmt].write_frame(frame)
+                subtitles.draw(frame, i / fps)
+                writers[fmt].write_frame(frame)
+            encoded.update(i - first + 1)
+    except BaseException:
+        for writer in [*writers.values(), *clean_writers.values()]:
+            writer.proc.kill()  # Pipe ffmpeg yang setengah jalan tidak ditunggu selesai
+        raise
+    finally:
+        frames.close()
+    for writer in [*writers.values(), *clean_writers.values()]:
+        writer.close()
+
+
+def write_clip_audio(source_video, start_t, end_t, path):
+    """
+    Audio klip [start_t, end_t) -> `path` (.m4a) langsung oleh ffmpeg, tanpa sampel lewat Python:
+    sumber AAC di-copy (tanpa generation loss), codec lain di-encode sekali ke AAC.
+    """
+    codec = audio_codec(source_video)
+    if codec is None:
+        raise RuntimeError(f"Video tidak memiliki audio track: {source_video}")
+    # Copy tetap pas di start_t: ffmpeg menulis edit list untuk sisa paket AAC pertama
+    encode = ['-c:a', 'copy'] if codec == 'aac' else ['-c:a', RENDER_PARAMS['audio_codec'], '-b:a', '192k']
+    cmd = [mpy_config.get_setting("FFMPEG_BINARY"), '-y', '-v', 'error', '-ss', f"{start_t:.3f}", '-i', source_video,
+           '-t', f"{end_t - start_t:.3f}", '-map', '0:a:0', '-vn', *encode, path]
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg audio gagal: {result.stderr.decode(errors='replace')[-300:]}")
+
+
+def render_formats(source_video, start_t, end_t, clip_name, word_index, config, ws, track, token):
+    """
+    Tahap render multi-format (CPU): klip di-decode sekali, tiap frame di-crop/scale/diberi subtitle
+    untuk semua `config['formats']` lalu dikirim ke satu encoder ffmpeg per format (berjalan paralel).
+    Audio di-encode sekali dan di-mux ke semua output. -> {format: path output}
+
+    config['mezzanine']: versi bersih tiap format ikut ditulis ke job dir (mezzanine_<key>.mp4 + audio .m4a).
+    Run berikutnya dengan crop path yang sama (misal hanya style subtitle berubah) tidak membuka sumber
+    sama sekali: frame dibaca dari intermediate, cukup overlay subtitle + encode.
+    """
+    config = dict(DEFAULTS, **config)
+    formats = config['formats']
+    log_info(f"Render {', '.join(formats)}: {clip_name}")
+    end_t = track['end']
+    total = clip_frame_count(start_t, end_t)
+
+    outputs, mezz, audio_path = _clip_paths(source_video, start_t, clip_name, config, ws, track)
+    encoded = meter(f"render:{clip_name}", total=total)
+    words = word_index.words_between(start_t, end_t) if config.get('enable_subtitle', True) else []
+    subtitles = SubtitleRasters(words, start_t, config)
+
+    reuse = bool(mezz) and os.path.exists(audio_path) and all(os.path.exists(p) for p in mezz.values())
+    if reuse:
+        log_info(f"Intermediate {clip_name} sudah ada, hanya overlay subtitle + encode")
+    # Intermediate ditulis ke .part lalu di-rename, jadi file setengah jadi tidak pernah dipakai ulang
+    parts = {} if reuse else {fmt: _part(path) for fmt, path in mezz.items()}
+    cleanup = [*outputs.values()] if reuse else [audio_path, *outputs.values(), *parts.values()]
+    with partial_output(*cleanup):
+        if not reuse:
+            with step("audio"):
+                write_clip_audio(source_video, start_t, end_t, audio_path)
+        frames = format_frames(source_video, start_t, track, formats, 0, total, config, mezz if reuse else None)
+        with step("encode"):
+            write_frames(frames, 0, outputs, parts, subtitles, token, encoded, audiofile=audio_path)
+        for fmt, part in parts.items():
+            os.replace(part, mezz[fmt])
+    count(frames=encoded.done * len(outputs))
+    gauge(**source_pool(config).metrics())
+
+    for path in outputs.values():
+        log_success(f"Disimpan: {path}")
+    return outputs
+
+
+# ==========================================
+# RENDER PARALEL PER SEGMEN
+# ==========================================
+# Satu klip dipotong per kelipatan GOP menjadi beberapa segmen waktu yang di-encode di process
+# berbeda dengan setelan sama (tiap segmen mulai di keyframe), lalu digabung tanpa re-encode.
+# Audio tidak ikut dipotong: di-encode sekali dan di-mux saat penggabungan, jadi tidak ada jeda.
+
+RENDER_GOP = 2 * RENDER_PARAMS['fps']  # Jarak keyframe (frame) di mode segmen
+
+
+def segment_bounds(start_t, end_t, segments):
+    """[(first, last)] frame klip per segmen, batas di kelipatan RENDER_GOP"""
+    total = clip_frame_count(start_t, end_t)
+    gops = -(-total // RENDER_GOP)
+    segments = max(1, min(segments, gops))
+    cuts = [round(k * gops / segments) * RENDER_GOP for k in range(segments)] + [total]
+    return [(first, min(last, total)) for first, last in zip(cuts, cuts[1:]) if first < last]
+
+
+def render_segment(source_video, start_t, end_t, clip_name, word_index, config, ws, track, token, index, first, last):
+    """
+    Tahap render satu segmen (CPU): frame klip [first, last) semua format -> file video tanpa audio
+    di scratch. -> ({fmt: segmen output}, {fmt: segmen intermediate})
+    """
+    config = dict(DEFAULTS, **config)
+    formats = config['formats']
+    last = min(last, clip_frame_count(start_t, track['end']))
+    outputs, mezz, _ = _clip_paths(source_video, start_t, clip_name, config, ws, track)
+    reuse = bool(mezz) and all(os.path.exists(p) for p in mezz.values())
+
+    seg_name = f"{safe_filename(clip_name)}_seg{index}"
+    parts = {fmt: ws.path(f"{seg_name}_{fmt.replace(':', 'x')}.mp4") for fmt in formats}
+    cleans = {} if reuse else {fmt: ws.path(f"{seg_name}_{fmt.replace(':', 'x')}_clean.mp4") for fmt in mezz}
+    encoded = meter(f"render:{clip_name}:{index}", total=last - first)
+    words = word_index.words_between(start_t, track['end']) if config.get('enable_subtitle', True) else []
+    subtitles = SubtitleRasters(words, start_t, config)
+
+    with partial_output(*parts.values(), *cleans.values()):
+        frames = format_frames(source_video, start_t, track, formats, first, last, config, mezz if reuse else None)
+        with step("encode"):
+            write_frames(frames, first, parts, cleans, subtitles, token, encoded, gop=RENDER_GOP)
+    count(frames=encoded.done * len(parts))
+    gauge(**source_pool(config).metrics())
+    return parts, cleans
+
+
+def concat_videos(paths, output, audiofile=None):
+    """Gabung segmen ber-setelan sama tanpa re-encode (concat demuxer ffmpeg), audio opsional di-mux"""
+    list_path = output + ".txt"
+    with open(list_path, 'w', encoding='utf-8') as f:
+        for path in paths:
+            f.write("file '{}'\n".format(os.path.abspath(path).replace("'", "'\\''")))
+    cmd = [mpy_config.get_setting("FFMPEG_BINARY"), '-y', '-v', 'error', '-f', 'concat', '-safe', '0',
+           '-i', list_path]
+    if audiofile:
+        cmd += ['-i', audiofile, '-map', '0:v', '-map', '1:a']
+    cmd += ['-c', 'copy', '-movflags', '+faststart', output]
+    try:
+        result = subprocess.run(cmd, capture_output=True)
+    finally:
+        os.remove(list_path)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg concat gagal: {result.stderr.decode(errors='replace')[-300:]}")
+
+
+def join_segments(source_video, start_t, end_t, clip_name, config, ws, track, token, *segments):
+    """
+    Tahap gabung (I/O): audio klip di-encode sekali, segmen digabung + di-mux per format,
+    segmen bersih menjadi intermediate. -> {format: path output}
+    """
+    config = dict(DEFAULTS, **config)
+    outputs, mezz, audio_path = _clip_paths(source_video, start_t, clip_name, config, ws, track)
+    parts = [seg for seg, _ in segments]
+    cleans = [clean for _, clean in segments]
+    token.check()
+
+    with partial_output(*outputs.values()):
+        if not os.path.exists(audio_path):
+            with step("audio"), partial_output(audio_path):
+                write_clip_audio(source_video, start_t, track['end'], audio_path)
+        with step("concat"):
+            for fmt, output in outputs.items():
+                concat_videos([seg[fmt] for seg in parts], output, audio_path)
+            for fmt in cleans[0]:
+                concat_videos([clean[fmt] for clean in cleans], _part(mezz[fmt]))
+                os.replace(_part(mezz[fmt]), mezz[fmt])
+    for seg in parts + cleans:
+        for path in seg.values():
+            os.remove(path)
+
+    for path in outputs.values():
+        log_success(f"Disimpan: {path}")
+    return outputs
+
+
+# ==========================================
+# JOB
+# ==========================================
+
+def job_source(config):
+    """URL YouTube atau path file lokal dari config job"""
+    return config['youtube_url'] if config['source_type'] == 'youtube' else config['local_file']
+
+
+def write_transcript_txt(path, whisper_result, word_index):
+    """transcript.txt yang bisa dibaca manusia: segmen + contoh timestamp per kata"""
+    language = whisper_result.get('language') or 'unknown'
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("=== WHISPER TRANSCRIPT ===\n")
+        f.write(f"Language: {language.upper()}\n\n")
+        f.write("--- SEGMENTS ---\n")
+        f.write(transcript_text(whisper_result))
+        f.write("\n--- WORD TIMESTAMPS (for subtitle) ---\n")
+        for word in word_index.iter_words(limit=50):  # 50 kata pertama sebagai contoh
+            f.write(f"[{word['start']:.2f} - {word['end']:.2f}] {word['word']}\n")
+        if len(word_index) > 50:
+            f.write(f"... and {len(word_index) - 50} more words\n")
+        f.write(f"\n=== TOTAL WORDS: {len(word_index)} ===\n")
+
+
+def schedule_job(sched, manifest, config, ws, token=None):
+    """
+    Daftarkan tahap-tahap satu job ke scheduler.
+    Tahap yang sudah selesai menurut manifest langsung di-skip; tahap berikutnya
+    didaftarkan dari callback `then` begitu input-nya tersedia.
+    `token` (CancelToken) diperiksa di dalam tahap-tahap yang lama.
+    Returns a list that fills with the output paths of this run's clips (rendered or already
+    up to date) as they finish; manifest juga menyimpan output dari run dengan config lain.
+    """
+    config = dict(DEFAULTS, **config)
+    job = manifest.job_id
+    token = token or CancelToken(ws.path("cancel"))
+    state = {}
+    outputs = []
+    os.makedirs(config['output_dir'], exist_ok=True)
+    # Transkrip di-cache per model + bahasa; plan memakai key yang sama karena dibuat dari transkrip itu
+    transcript_params = {k: config[k] for k in ('whisper_model', 'language')}
+
+    def on_source(result):
+        source_path, duration, has_audio = result
+        if not has_audio:
+            raise RuntimeError("Video tidak memiliki audio track! Coba video lain.")
+        manifest.complete_stage('source', artifacts=[source_path], path=source_path, duration=duration,
+                                has_audio=has_audio)
+        state['source'] = source_path
+        log_success("Video sumber siap")
+        schedule_index()
+
+    def schedule_index():
+        # Index keyframe dibuat sekali sebelum klip dijadwalkan, dipakai tracking + render
+        if not config['keyframe_dir']:
+            state['keyframes'] = True
+            schedule_clips_if_ready()
+            return
+        sched.add(f"{job}:keyframes", index_keyframes, state['source'], config, pool='io', then=on_keyframes)
+
+    def on_keyframes(_):
+        state['keyframes'] = True
+        schedule_clips_if_ready()
+
+    def on_transcript(whisper_result):
+        if not whisper_result:
+            raise RuntimeError("Transkripsi gagal")
+        transcript_path = manifest.file("transcript.json")
+        with open(transcript_path, 'w', encoding='utf-8') as f:
+            json.dump(whisper_result, f, ensure_ascii=False, default=float)
+        manifest.complete_stage('transcript', artifacts=[transcript_path], params=transcript_params)
+        schedule_plan(whisper_result)
+
+    def schedule_plan(whisper_result):
+        # Disimpan ke disk supaya worker process cukup mmap, bukan menerima salinan
+        state['words'] = WordIndex.from_segments(whisper_result['segments'])
+        state['segments'] = [(seg['start'], seg['end']) for seg in whisper_result['segments']]
+        state['words'].save(manifest.file("words"))
+        log_success(f"Transkripsi selesai ({(whisper_result.get('language') or '?').upper()}): "
+                    f"{len(state['words'])} kata")
+        if config['save_transcript']:
+            transcript_txt = os.path.join(config['output_dir'], "transcript.txt")
+            write_transcript_txt(transcript_txt, whisper_result, state['words'])
+            log_info(f"Transkrip disimpan ke: {transcript_txt}")
+
+        plan_params = {'clip_count': config['clip_count'], 'iou': config['dedupe_iou'],
+                       'seconds': [config['min_clip_seconds'], config['max_clip_seconds']],
+                       'transcript': transcript_params}
+        if manifest.stage_done('plan', plan_params):
+            log_info("Rencana klip sudah ada, skip analisis AI")
+            state['plan'] = manifest.stage_data('plan', 'clips')
+            schedule_clips_if_ready()
+            return
+
+        def on_plan(candidates):
+            clips_data = select_clips(candidates, config, manifest.stage_data('source', 'duration'), state['segments'])
+            if not clips_data:
+                raise RuntimeError("AI tidak menemukan klip.")
+            manifest.complete_stage('plan', params=plan_params, clips=clips_data)
+            state['plan'] = clips_data
+            schedule_clips_if_ready()
+
+        progress('plan', text="AI sedang mencari Hooks...")
+        sched.add(f"{job}:plan", analyze_hooks_with_groq, config['api_key'], transcript_text(whisper_result),
+                  clip_planner.candidate_count(config['clip_count']), config['min_clip_seconds'],
+                  config['max_clip_seconds'], pool='io', then=on_plan)
+
+    def save_track(path, result):
+        # Tulis atomik, file .part tidak pernah dibaca sebagai cache
+        part = path[:-len(".npz")] + ".part.npz"
+        np.savez(part, **result)
+        os.replace(part, path)
+
+    def schedule_clips_if_ready():
+        # Klip butuh source (+ index) dan plan; mana yang selesai duluan tidak masalah
+        if 'keyframes' not in state or 'plan' not in state or state.get('clips_scheduled'):
+            return
+        state['clips_scheduled'] = True
+        clips_data = state['plan']
+        total = len(clips_data)
+        done = {'clips': 0}
+        log_success(f"Ditemukan {total} Klip!")
+        segments = state['segments'] if config['framing'] == 'speaker' else None
+        # Hasil tracking disimpan di job dir: ganti style subtitle tidak perlu tracking ulang
+        track_params = {k: config.get(k) for k in (
+            'detector', 'smooth_window', 'framing', 'proxy_width', 'redetect_every', 'track_min_confidence',
+            'adaptive_sampling', 'max_redetect_seconds', 'speaker_change_audio', 'min_turn_seconds')}
+
+        def on_rendered(output, key):
+            # Multi-format: {format: path}, tiap format dicatat sebagai output sendiri
+            rendered = output.items() if isinstance(output, dict) else [(None, output)]
+            for fmt, path in rendered:
+                manifest.record_clip(f"{key}:{fmt}" if fmt else key, path)
+                outputs.append(path)
+            done['clips'] += 1
+            progress('clips', done['clips'], total, "Klip selesai")
+
+        # Klip yang output-nya sudah ada dan hash-nya cocok tidak dirender ulang. Key-nya memuat
+        # track_params juga, jadi setting tracking yang berubah selalu ikut merender ulang klip
+        style = dict(track_params, **{k: config.get(k) for k in (
+            'enable_subtitle', 'font_size', 'font_color', 'font_color_alt', 'stroke_color', 'stroke_width',
+            'font', 'text_position', 'output_dir', 'subtitle_renderer')})
+        multi = len(config['formats']) > 1
+        fmt0 = config['formats'][0]
+        render_fn = render_formats if multi else render
+        for i, data in enumerate(clips_data):
+            clip_name = config['clip_name'].format(n=i+1, title=data.get('title') or f"Clip_{i+1}")
+            clip_key = params_key({'start': data['start'], 'end': data['end'], 'name': clip_name, 'style': style})
+            keys = [f"{clip_key}:{fmt}" for fmt in config['formats']] if multi else [clip_key]
+            if all(manifest.clip_done(key) for key in keys):
+                log_info(f"Skip {clip_name}, sudah ada: {manifest.clip_output(keys[0])}")
+                outputs.extend(manifest.clip_output(key) for key in keys)
+                done['clips'] += 1
+                continue
+
+            log_info(f"Antri klip {i+1}/{total}: {clip_name}")
+            start_t, end_t = float(data['start']), float(data['end'])
+            track_path = manifest.file(f"track_{params_key({'start': start_t, 'end': end_t, **track_params})}.npz")
+            if os.path.exists(track_path):
+                with np.load(track_path) as cached:
+                    clip_track = {'centers': cached['centers'], 'fps': float(cached['fps']),
+                                  'end': float(cached['end'])}
+            else:
+                # Prioritas = urutan klip: render klip i didahulukan dari tracking klip i+1
+                track_task = sched.add(f"{job}:track:{i}", track, state['source'], start_t, end_t, clip_name,
+                                       token, config, segments, pool='cpu', priority=i,
+                                       then=lambda result, path=track_path: save_track(path, result))
+                clip_track = Ref(track_task)
+            if config['render_segments'] > 1:
+                # Segmen satu klip di-encode di worker CPU berbeda, lalu digabung di thread I/O
+                seg_end = min(end_t, manifest.stage_data('source', 'duration') or end_t)
+                segment_tasks = [
+                    sched.add(f"{job}:render:{i}:{k}", render_segment, state['source'], start_t, end_t, clip_name,
+                              state['words'], config, ws, clip_track, token, k, first, last, pool='cpu',
+                              priority=i)
+                    for k, (first, last) in enumerate(segment_bounds(start_t, seg_end, config['render_segments']))]
+                sched.add(f"{job}:join:{i}", join_segments, state['source'], start_t, end_t, clip_name, config, ws,
+                          clip_track, token, *map(Ref, segment_tasks), pool='io', priority=i,
+                          then=lambda output, key=clip_key: on_rendered(output if multi else output[fmt0], key))
+                continue
+            sched.add(f"{job}:render:{i}", render_fn, state['source'], start_t, end_t, clip_name,
+                      state['words'], config, ws, clip_track, token, pool='cpu', priority=i,
+                      then=lambda output, key=clip_key: on_rendered(output, key))
+        progress('clips', done['clips'], total, "Memproses klip...")
+
+    # 1. Video sumber
+    source_task = None
+    if manifest.stage_done('source'):
+        log_info("Video sudah ada, skip download")
+        state['source'] = manifest.stage_data('source', 'path')
+        schedule_index()
+    elif config['source_type'] == 'youtube':
+        progress('source', text="Download video...")
+        source_task = sched.add(f"{job}:source", fetch_source, config['youtube_url'], manifest.job_dir, token,
+                                pool='io', then=on_source)
+    else:
+        # File lokal dipakai langsung (tanpa copy), manifest mencatat ukuran + mtime-nya
+        progress('source', text="Membaca file lokal...")
+        source_task = sched.add(f"{job}:source", probe_source, config['local_file'], pool='io', then=on_source)
+
+    # 2. Transkrip (hanya butuh audio, bisa jalan sebelum klip lain dijadwalkan)
+    transcript_path = manifest.file("transcript.json")
+    if manifest.stage_done('transcript', transcript_params):
+        log_info("Transkrip sudah ada, skip transkripsi")
+        with open(transcript_path, 'r', encoding='utf-8') as f:
+            schedule_plan(json.load(f))
+        return outputs
+
+    # Audio hanya dibutuhkan untuk transkripsi, jadi cukup di scratch workspace
+    audio_path = ws.path("source_audio.wav")
+    if config['source_type'] == 'youtube':
+        source_path = state.get('source') or manifest.file("source_video.mp4")
+    else:
+        source_path = config['local_file']
+    audio_task = sched.add(f"{job}:audio", extract_audio, source_path, audio_path, ws, token, pool='io',
+                           deps=[source_task] if source_task else [],
+                           then=lambda path: progress('transcribe', text="Transkripsi audio..."))
+
+    sched.add(f"{job}:transcribe", transcribe, Ref(audio_task), token, config, pool='cpu', then=on_transcript)
+    return outputs
@@ -0,0 +1,146 @@
+"""
+Face Detectors - backend deteksi wajah yang bisa dipilih per job (config['detector'])
+    haar       OpenCV Haar cascade: tanpa model tambahan, tapi lambat dan sering false positive
+    mediapipe  MediaPipe face detection (short/full range)
+    yunet      OpenCV DNN YuNet (ONNX ~230 KB, di-download sekali ke models/)
+
+Semua backend menerima frame RGB ukuran apa pun: `box()` mengembalikan kotak wajah terbaik
+(x, y, w, h) dalam pixel frame itu atau None, `faces()` semua wajah (terbaik dulu, dipakai framing
+'speaker' untuk memilih yang sedang bicara). Tiap backend mendeklarasikan:
+    input_width  lebar frame yang paling cocok - tracking meminta proxy selebar ini dari decoder
+    batch        jumlah frame per panggilan `boxes()` (benchmark; tracking mendeteksi jarang-jarang)
+    every        interval deteksi saat wajah belum ditemukan
+    max_jump     batas geser posisi crop per frame (fraksi lebar), None = bebas
+
+Backend baru: subclass FaceDetector lalu `@register("nama")`. Bandingkan di host sendiri dengan
+`python benchmark.py --detectors`.
+"""
+
+import os
+import urllib.request
+
+from lazy_imports import LazyModule
+
+cv2 = LazyModule("cv2")
+mp = LazyModule("mediapipe")
+
+DETECTORS = {}
+
+
+def register(name):
+    def add(cls):
+        cls.name = name
+        DETECTORS[name] = cls
+        return cls
+    return add
+
+
+def create(name, config=None):
+    """Detector instance for backend `name` (config: key engine, lihat core.DEFAULTS)"""
+    if name not in DETECTORS:
+        raise ValueError(f"Detektor wajah tidak dikenal: {name} (pilihan: {', '.join(DETECTORS)})")
+    return DETECTORS[name](config or {})
+
+
+class FaceDetector:
+    """Base class: implement `_faces(frame)` (best first) on a frame already fitted to `input_width`"""
+    name = None
+    input_width = 320
+    batch = 1
+    every = 1
+    max_jump = None
+
+    def __init__(self, config):
+        self.config = config
+
+    def faces(self, frame):
+        small, scale = self._fit(frame)
+        return [tuple(v / scale for v in box) for box in self._faces(small)]
+
+    def box(self, frame):
+        faces = self.faces(frame)
+        return faces[0] if faces else None
+
+    def boxes(self, frames):
+        return [self.box(frame) for frame in frames]
+
+    def _fit(self, frame):
+        # Frame lebih lebar dari input_width (proxy dimatikan) dikecilkan dulu
+        scale = min(1.0, self.input_width / frame.shape[1])
+        if scale < 1:
+            frame = cv2.resize(frame, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return frame, scale
+
+    def _faces(self, frame):
+        raise NotImplementedError
+
+
+@register("haar")
+class HaarFaces(FaceDetector):
+    """OpenCV Haar cascade, terbesar dulu; saat mencari tiap frame ke-2, geser maks 5% lebar"""
+    input_width = 480
+    every = 2
+    max_jump = 0.05
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+
+    def _faces(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        faces = self.cascade.detectMultiScale(gray, scaleFactor=1.05, minNeighbors=4, minSize=(20, 20))
+        return sorted((tuple(f) for f in faces), key=lambda f: -f[2] * f[3])
+
+
+@register("mediapipe")
+class MediaPipeFaces(FaceDetector):
+    """MediaPipe face detection (model full range), urutan dari MediaPipe"""
+    input_width = 320  # Model memakai input 192x192, frame lebih besar tidak menambah akurasi
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.detector = mp.solutions.face_detection.FaceDetection(model_selection=1, min_detection_confidence=0.6)
+
+    def _faces(self, frame):
+        results = self.detector.process(frame)
+        h, w = frame.shape[:2]
+        boxes = []
+        for detection in results.detections or ():
+            bbox = detection.location_data.relative_bounding_box
+            boxes.append((bbox.xmin * w, bbox.ymin * h, bbox.width * w, bbox.height * h))
+        return boxes
+
+
+YUNET_URL = ("https://github.com/opencv/opencv_zoo/raw/main/models/face_detection_yunet/"
+             "face_detection_yunet_2023mar.onnx")
+
+
+def yunet_model(path):
+    """Path model YuNet, di-download sekali kalau belum ada"""
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        urllib.request.urlretrieve(YUNET_URL, path + ".part")
+        os.replace(path + ".part", path)
+    return path
+
+
+@register("yunet")
+class YuNetFaces(FaceDetector):
+    """OpenCV DNN YuNet (butuh opencv >= 4.8), skor tertinggi dulu"""
+    input_width = 320
+
+    def __init__(self, config):
+        super().__init__(config)
+        model = yunet_model(config.get('yunet_model', "models/face_detection_yunet_2023mar.onnx"))
+        self.detector = cv2.FaceDetectorYN.create(model, "", (self.input_width, self.input_width), 0.8)
+        self.size = None
+
+    def _faces(self, frame):
+        h, w = frame.shape[:2]
+        if self.size != (w, h):
+            self.size = (w, h)
+            self.detector.setInputSize(self.size)
+        _, faces = self.detector.detect(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+        if faces is None:
+            return []
+        return [tuple(float(v) for v in f[:4]) for f in sorted(faces, key=lambda f: -f[-1])]
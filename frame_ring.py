@@ -0,0 +1,155 @@
+"""
+Frame Ring - transport frame antar process lewat shared memory (tanpa pickle)
+Frame 1080p RGB ~6 MB; lewat Queue biasa tiap frame di-pickle + disalin dua kali.
+Ring ini berisi `slots` frame berukuran tetap di satu blok multiprocessing.shared_memory:
+producer menyalin frame hasil decode ke slot berikutnya, consumer (detektor wajah, crop/encode)
+membaca NumPy view langsung dari slot itu.
+
+Slot didaur ulang berurutan: frame ke-n baru ditimpa frame ke-(n + slots) setelah SEMUA consumer
+selesai dengan frame n. View dari `frames()` hanya valid sampai iterasi berikutnya - salin
+(`view.copy()`) kalau perlu disimpan.
+
+    ring = FrameRing((h, w, 3), slots=8, consumers=2)
+    # process decoder                       # process lain (consumer 0 / 1)
+    for frame in decoded:                   for frame in ring.frames(0):
+        ring.put(frame)                         detect(frame)
+    ring.close()
+    ...
+    ring.unlink()                           # sekali, oleh pembuat ring
+"""
+
+import sys
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cancellation import Cancelled
+
+# Layout header (int64): [frame yang sudah ditulis, state, cursor consumer 0, 1, ...]
+_WRITTEN, _STATE, _CURSORS = 0, 1, 2
+_OPEN, _CLOSED, _ABORTED = 0, 1, 2
+
+
+class FrameRing:
+    """Fixed-slot ring of equally shaped frames in shared memory, one producer, N consumers"""
+
+    def __init__(self, shape, dtype=np.uint8, slots=8, consumers=1, ctx=None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+        self.consumers = consumers
+        self.frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self._header_bytes = 8 * (_CURSORS + consumers)
+        ctx = ctx or multiprocessing.get_context()
+        # Condition hanya bisa dibagi saat process dibuat (argumen Process), bukan lewat Queue
+        self._cond = ctx.Condition()
+        self._shm = shared_memory.SharedMemory(create=True, size=self._header_bytes + slots * self.frame_bytes)
+        self._owner = True
+        self._attach()
+        self._header[:] = 0
+
+    def _attach(self):
+        buf = self._shm.buf
+        self._header = np.ndarray((_CURSORS + self.consumers,), np.int64, buf)
+        self._frames = np.ndarray((self.slots,) + self.shape, self.dtype, buf, offset=self._header_bytes)
+
+    def __getstate__(self):
+        state = {k: v for k, v in self.__dict__.items() if k not in ('_shm', '_header', '_frames')}
+        state['_name'] = self._shm.name
+        state['_owner'] = False
+        return state
+
+    def __setstate__(self, state):
+        name = state.pop('_name')
+        self.__dict__.update(state)
+        # Registrasi resource_tracker hanya milik pembuat ring (tracker-nya dipakai bersama child
+        # spawn/fork): child tidak boleh unregister, kalau tidak unlink() di parent gagal (KeyError)
+        # dan blok tidak dibersihkan saat parent crash. 3.13+: attach tanpa tracking sama sekali
+        if sys.version_info >= (3, 13):
+            self._shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._attach()
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    # ---------------- producer ----------------
+
+    def put(self, frame, timeout=None):
+        """Copy `frame` into the next slot, waiting while that slot is still being read"""
+        with self._cond:
+            n = int(self._header[_WRITTEN])
+            if not self._cond.wait_for(lambda: self._header[_STATE] == _ABORTED
+                                       or n - int(self._header[_CURSORS:].min()) < self.slots, timeout):
+                raise TimeoutError("Frame ring: consumer tidak membaca")
+            if self._header[_STATE] == _ABORTED:
+                raise Cancelled("Frame ring dibatalkan consumer")
+        # Slot n % slots tidak dibaca siapa pun sampai _WRITTEN dinaikkan, jadi salin di luar lock
+        self._frames[n % self.slots] = frame
+        with self._cond:
+            self._header[_WRITTEN] = n + 1
+            self._cond.notify_all()
+
+    def close(self):
+        """No more frames; consumers finish the ones already written"""
+        self._set_state(_CLOSED)
+
+    def abort(self):
+        """Stop producer and consumers (error or cancel on either side)"""
+        self._set_state(_ABORTED)
+
+    def _set_state(self, state):
+        with self._cond:
+            if self._header[_STATE] != _ABORTED:
+                self._header[_STATE] = state
+            self._cond.notify_all()
+
+    # ---------------- consumer ----------------
+
+    def frames(self, consumer=0, timeout=None):
+        """Yield read-only views of frames in order; each slot is released when the next is requested"""
+        cursor = _CURSORS + consumer
+        try:
+            while True:
+                with self._cond:
+                    n = int(self._header[cursor])
+                    if not self._cond.wait_for(lambda: self._header[_WRITTEN] > n
+                                               or self._header[_STATE] != _OPEN, timeout):
+                        raise TimeoutError("Frame ring: producer tidak menulis")
+                    if self._header[_STATE] == _ABORTED:
+                        raise RuntimeError("Frame ring: producer berhenti sebelum selesai")
+                    if self._header[_WRITTEN] <= n:
+                        return  # closed dan semua frame sudah dibaca
+                view = self._frames[n % self.slots]
+                view.flags.writeable = False
+                yield view
+                with self._cond:
+                    self._header[cursor] = n + 1
+                    self._cond.notify_all()
+        finally:
+            # Consumer berhenti lebih awal: lepas semua slot supaya producer tidak menunggu selamanya
+            with self._cond:
+                self._header[cursor] = np.iinfo(np.int64).max // 2
+                self._cond.notify_all()
+
+    # ---------------- lifecycle ----------------
+
+    def release(self):
+        """Detach this process's mapping (views from frames() become invalid)"""
+        self._header = self._frames = None
+        self._shm.close()
+
+    def unlink(self):
+        """Release and free the shared block (creator only)"""
+        self.release()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink()
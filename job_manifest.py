@@ -0,0 +1,136 @@
+"""
+Job Manifest - catatan progres per job di disk
+Menyimpan status tiap tahap (source, audio, transcript, plan, klip) supaya job yang
+crash/dibatalkan bisa dilanjutkan tanpa mengulang tahap yang sudah selesai.
+"""
+
+import os
+import json
+import time
+import hashlib
+
+
+def _fingerprint(path):
+    """Cheap identity of a (possibly huge) file: size + mtime"""
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime': int(st.st_mtime)}
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Content hash, used for finished clip outputs"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def params_key(params):
+    """Stable hash of a JSON-serialisable dict of parameters"""
+    blob = json.dumps(params, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha1(blob).hexdigest()[:16]
+
+
+def job_id_for_source(source):
+    """Job id dari URL YouTube, atau path + ukuran + mtime untuk file lokal"""
+    if os.path.exists(source):
+        ident = {'path': os.path.abspath(source), **_fingerprint(source)}
+    else:
+        ident = {'url': source.strip()}
+    return params_key(ident)
+
+
+class JobManifest:
+    """Per-job manifest.json recording finished stages and their artifacts"""
+
+    def __init__(self, job_dir, source):
+        self.job_dir = job_dir
+        self.path = os.path.join(job_dir, 'manifest.json')
+        os.makedirs(job_dir, exist_ok=True)
+
+        self.data = {'source': source, 'stages': {}, 'clips': {}}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError):
+                # Manifest rusak (misal crash saat menulis) -> mulai dari awal
+                pass
+
+    @classmethod
+    def open(cls, jobs_root, source):
+        job_dir = os.path.join(jobs_root, job_id_for_source(source))
+        return cls(job_dir, source)
+
+    @property
+    def job_id(self):
+        return os.path.basename(self.job_dir)
+
+    def file(self, name):
+        """Path for an artifact stored inside the job directory"""
+        return os.path.join(self.job_dir, name)
+
+    def save(self):
+        # Tulis atomik: file sementara lalu replace
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    # ---- stages ----
+
+    def stage_done(self, name, params=None):
+        """True if the stage finished with the same params and its artifacts are intact"""
+        entry = self.data['stages'].get(name)
+        if not entry:
+            return False
+        if entry.get('params') != params_key(params or {}):
+            return False
+        for path, fp in entry.get('artifacts', {}).items():
+            if not os.path.exists(path):
+                return False
+            if fp and _fingerprint(path) != fp:
+                return False
+        return True
+
+    def complete_stage(self, name, artifacts=(), params=None, **data):
+        """Mark a stage finished, remembering artifact fingerprints and small result data"""
+        self.data['stages'][name] = {
+            'params': params_key(params or {}),
+            'artifacts': {path: _fingerprint(path) for path in artifacts},
+            'data': data,
+            'finished_at': time.time(),
+        }
+        self.save()
+
+    def stage_data(self, name, key, default=None):
+        entry = self.data['stages'].get(name) or {}
+        return entry.get('data', {}).get(key, default)
+
+    def invalidate(self, name):
+        if self.data['stages'].pop(name, None) is not None:
+            self.save()
+
+    # ---- clips ----
+
+    def clip_done(self, key):
+        """True if the clip output exists and still matches its recorded hash"""
+        entry = self.data['clips'].get(key)
+        if not entry or not os.path.exists(entry['output']):
+            return False
+        if os.path.getsize(entry['output']) != entry['size']:
+            return False
+        return file_sha256(entry['output']) == entry['sha256']
+
+    def clip_output(self, key):
+        entry = self.data['clips'].get(key)
+        return entry['output'] if entry else None
+
+    def record_clip(self, key, output_path):
+        self.data['clips'][key] = {
+            'output': output_path,
+            'size': os.path.getsize(output_path),
+            'sha256': file_sha256(output_path),
+            'finished_at': time.time(),
+        }
+        self.save()
@@ -0,0 +1,98 @@
+"""
+Job Queue - antrian job lokal yang persisten (SQLite)
+Dipakai mode batch: job yang belum selesai tetap ada walau proses mati di tengah jalan.
+"""
+
+import json
+import time
+import sqlite3
+import threading
+
+
+class JobQueue:
+    """Persistent queue of (source, config) jobs with pending/running/done/failed states"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                config TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                created_at REAL,
+                updated_at REAL
+            )
+        """)
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    def enqueue(self, source, config, force=False):
+        """Add a job; identical pending/running/done jobs are not added twice unless `force`"""
+        blob = json.dumps(config, sort_keys=True)
+        with self._lock:
+            if not force:
+                row = self.db.execute(
+                    "SELECT id FROM jobs WHERE source = ? AND config = ? AND status != 'failed'",
+                    (source, blob)).fetchone()
+                if row:
+                    return row['id'], False
+            now = time.time()
+            cur = self.db.execute(
+                "INSERT INTO jobs (source, config, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (source, blob, now, now))
+            self.db.commit()
+            return cur.lastrowid, True
+
+    def recover(self):
+        """Jobs left 'running' by a crashed run go back to 'pending' (the manifest resumes them)"""
+        with self._lock:
+            cur = self.db.execute("UPDATE jobs SET status = 'pending' WHERE status = 'running'")
+            self.db.commit()
+            return cur.rowcount
+
+    def retry_failed(self):
+        with self._lock:
+            cur = self.db.execute("UPDATE jobs SET status = 'pending', error = NULL WHERE status = 'failed'")
+            self.db.commit()
+            return cur.rowcount
+
+    def claim(self, exclude_sources=()):
+        """Mark the oldest pending job as running and return it (or None)"""
+        with self._lock:
+            rows = self.db.execute("SELECT * FROM jobs WHERE status = 'pending' ORDER BY id").fetchall()
+            for row in rows:
+                if row['source'] in exclude_sources:
+                    continue
+                self.db.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (time.time(), row['id']))
+                self.db.commit()
+                return {'id': row['id'], 'source': row['source'], 'config': json.loads(row['config'])}
+            return None
+
+    def finish(self, job_id, result=None, error=None):
+        status = 'failed' if error else 'done'
+        with self._lock:
+            self.db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id))
+            self.db.commit()
+
+    def counts(self):
+        with self._lock:
+            rows = self.db.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row['status']: row['n'] for row in rows}
+
+    def jobs(self):
+        with self._lock:
+            rows = self.db.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+        return [dict(row) for row in rows]
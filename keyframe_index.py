@@ -0,0 +1,107 @@
+"""
+Keyframe Index - daftar timestamp keyframe video sumber, dibuat sekali lalu disimpan
+MoviePy memutuskan seek/lanjut decode dengan aturan tetap (seek kalau loncat > 100 frame) dan
+seek-nya mulai 1 detik sebelum target. Dengan index, reader pool tahu GOP mana yang berisi
+target: lanjut decode kalau tidak ada keyframe di antaranya, kalau ada seek langsung ke target
+(ffmpeg mulai dari keyframe sebelumnya dan hanya men-decode sisa GOP itu).
+
+Index dibaca dari paket container (ffmpeg -c copy, tanpa decode) dan disimpan sebagai JSON di
+`index_dir`, dengan nama dari path + ukuran + mtime sumber, jadi dipakai bersama oleh process
+tracking dan render serta run berikutnya.
+
+    index = KeyframeIndex.load(path, "temp/keyframes")
+    index.before(t)   # keyframe terakhir <= t
+"""
+
+import os
+import json
+import bisect
+import subprocess
+
+from job_manifest import job_id_for_source
+from lazy_imports import LazyModule
+
+mpy_config = LazyModule("moviepy.config")
+
+
+_NOPTS = -0x8000000000000000  # AV_NOPTS_VALUE, ditulis framecrc untuk paket tanpa timestamp
+_VERSION = 2                   # Naikkan kalau arti timestamp di index berubah
+
+
+def _timestamp(field):
+    try:
+        value = int(field)
+    except ValueError:
+        return None
+    return None if value == _NOPTS else value
+
+
+def scan_keyframes(path):
+    """
+    Sorted keyframe timestamps (seconds) of the first video stream, from packet flags.
+    Waktu relatif terhadap awal stream video (pts terkecil), sama dengan t=0 di MoviePy, jadi
+    sumber dengan start_time bukan nol (MPEG-TS, potongan stream) tidak bergeser.
+    """
+    cmd = [mpy_config.get_setting("FFMPEG_BINARY"), '-hide_banner', '-v', 'error', '-i', path,
+           '-map', '0:v:0', '-c', 'copy', '-f', 'framecrc', '-']
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg keyframe scan gagal: {result.stderr.decode(errors='replace')[-300:]}")
+
+    time_base, start, keyframes = 1.0, None, []
+    for line in result.stdout.decode(errors='replace').splitlines():
+        if line.startswith('#tb 0:'):
+            num, den = line.split(':', 1)[1].strip().split('/')
+            time_base = int(num) / int(den)
+        elif not line.startswith('#'):
+            # stream, dts, pts, duration, size, hash[, F=flags] - F hanya ditulis kalau bukan keyframe biasa
+            fields = [f.strip() for f in line.split(',')]
+            if len(fields) < 6:
+                continue
+            # Paket tanpa pts (NOPTS): pakai dts; tanpa keduanya tidak bisa diposisikan, lewati
+            pts = _timestamp(fields[2])
+            if pts is None:
+                pts = _timestamp(fields[1])
+            if pts is None:
+                continue
+            start = pts if start is None else min(start, pts)
+            flags = int(fields[6][2:], 16) if len(fields) > 6 and fields[6].startswith('F=') else 1
+            if flags & 1:
+                keyframes.append(pts)
+    return sorted((pts - start) * time_base for pts in keyframes)
+
+
+class KeyframeIndex:
+    """Keyframe timestamps of one source"""
+
+    def __init__(self, times):
+        self.times = list(times) or [0.0]
+
+    def before(self, t):
+        """Last keyframe at or before `t` (first keyframe if `t` is earlier)"""
+        i = bisect.bisect_right(self.times, t + 1e-6)
+        return self.times[max(0, i - 1)]
+
+    @staticmethod
+    def path_for(source, index_dir):
+        return os.path.join(index_dir, f"{job_id_for_source(source)}.json")
+
+    @classmethod
+    def load(cls, source, index_dir):
+        """Index tersimpan untuk `source`, di-scan dan disimpan dulu kalau belum ada"""
+        path = cls.path_for(source, index_dir)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == _VERSION:
+                return cls(data['keyframes'])
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        index = cls(scan_keyframes(source))
+        os.makedirs(index_dir, exist_ok=True)
+        # Tulis atomik: process lain yang membaca bersamaan tidak melihat file setengah jadi
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': _VERSION, 'source': os.path.abspath(source), 'keyframes': index.times}, f)
+        os.replace(tmp, path)
+        return index
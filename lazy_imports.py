@@ -0,0 +1,81 @@
+"""
+Lazy Imports - backend berat (torch, whisper, mediapipe, cv2, moviepy, yt_dlp, groq) baru
+di-import saat pertama dipakai, jadi GUI/CLI langsung tampil. `prewarm()` meng-import-nya
+di background thread selagi user masih mengisi form atau video masih di-download.
+Waktu import pertama tiap module dicatat di `import_times` (lihat juga benchmark.py --startup).
+
+Import di thread + fork process pool: fork ditahan sampai import lazy yang sedang berjalan selesai,
+kalau tidak process anak bisa mewarisi lock import yang tidak pernah dilepas (deadlock).
+"""
+
+import os
+import sys
+import time
+import importlib
+import threading
+
+import_times = {}  # module -> detik import pertama (di process ini)
+_lock = threading.RLock()
+
+
+def _reset_lock():
+    global _lock
+    _lock = threading.RLock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=lambda: _lock.acquire(), after_in_parent=lambda: _lock.release(),
+                        after_in_child=_reset_lock)
+
+
+def load(name):
+    """Import `name` and record how long the first import took"""
+    if name in import_times:
+        return sys.modules[name]
+    with _lock:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        import_times.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+class LazyModule:
+    """Stand-in for a module that imports it on first attribute access (`cv2 = LazyModule("cv2")`)"""
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            module = self.__dict__['_module'] = load(self.__dict__['_name'])
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __reduce__(self):
+        return (LazyModule, (self.__dict__['_name'],))
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__['_module'] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def prewarm(*names, log=None):
+    """Import `names` in a daemon thread; import errors are only logged (dipakai nanti akan error lagi)"""
+    def run():
+        for name in names:
+            try:
+                load(name)
+            except Exception as e:
+                if log:
+                    log(f"Prewarm {name} gagal: {e}")
+
+    thread = threading.Thread(target=run, name="prewarm", daemon=True)
+    thread.start()
+    return thread
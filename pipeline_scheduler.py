@@ -0,0 +1,230 @@
+"""
+Pipeline Scheduler - menjalankan tahap-tahap job sebagai DAG
+Tiap task mendeklarasikan input (task lain yang harus selesai) dan executor-nya:
+'io' (thread: download, Groq, ffmpeg) atau 'cpu' (process pool: whisper, tracking, render).
+Task yang saling independen berjalan bersamaan, misal tracking klip 2 sambil render klip 1.
+"""
+
+import os
+import heapq
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from cancellation import Cancelled
+
+
+class Ref:
+    """Placeholder argument, replaced by the result of another task when it runs"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"Ref({self.name!r})"
+
+
+class TaskFailed(Exception):
+    """Raised for tasks that could not run because a dependency failed"""
+
+
+class _Task:
+    def __init__(self, name, fn, args, kwargs, deps, pool, priority, then, seq):
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.deps = deps
+        self.pool = pool
+        self.priority = priority
+        self.then = then
+        self.seq = seq
+        self.waiting = 0        # dependency yang belum selesai
+        self.dependents = []    # task yang menunggu hasil task ini
+        self.consumers = 0      # dependents yang belum selesai memakai hasilnya
+
+
+class Scheduler:
+    """
+    Small DAG scheduler over an I/O thread pool and a CPU pool.
+
+    Backpressure: setiap pool hanya menerima task sebanyak jumlah worker-nya; sisanya
+    menunggu di antrian prioritas (hanya deskriptor task, bukan data). Hasil task
+    dibuang begitu semua dependents-nya selesai, jadi memori tidak menumpuk.
+    """
+
+    def __init__(self, io_workers=4, cpu_workers=None, cpu_processes=True, log=None, profiler=None):
+        cpu_workers = cpu_workers or max(1, (os.cpu_count() or 2) // 2)
+        cpu_pool = ProcessPoolExecutor(cpu_workers) if cpu_processes else \
+            ThreadPoolExecutor(cpu_workers, thread_name_prefix='cpu')
+        self.pools = {'io': ThreadPoolExecutor(io_workers, thread_name_prefix='io'), 'cpu': cpu_pool}
+        self.limits = {'io': io_workers, 'cpu': cpu_workers}
+        self.running = {'io': 0, 'cpu': 0}
+        self.ready = {'io': [], 'cpu': []}
+        self.log = log or (lambda level, msg: None)
+        self.profiler = profiler  # stage_profiler.Profiler (opt-in)
+
+        self.tasks = {}
+        self.results = {}
+        self.errors = {}
+        self.done = set()
+        self.futures = {}
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def add(self, name, fn, *args, deps=(), pool='io', priority=0, then=None, **kwargs):
+        """
+        Daftarkan task. Argumen Ref('nama') otomatis menjadi dependency dan diganti
+        dengan hasil task tersebut. `then(result)` dipanggil di thread scheduler setelah
+        task selesai dan boleh menambah task baru (misal task per-klip setelah plan).
+        """
+        with self._lock:
+            if name in self.tasks:
+                raise ValueError(f"Duplicate task name: {name}")
+
+            refs = [a.name for a in list(args) + list(kwargs.values()) if isinstance(a, Ref)]
+            task = _Task(name, fn, args, kwargs, tuple(dict.fromkeys(list(deps) + refs)),
+                         pool, priority, then, next(self._seq))
+            self.tasks[name] = task
+
+            # Dependency sudah gagal: task langsung gagal sebelum consumer mana pun dihitung,
+            # jadi tidak ada hasil dependency lain yang ikut dilepas
+            failed = next((dep for dep in task.deps if dep in self.errors), None)
+            if failed is not None:
+                self.errors[name] = TaskFailed(f"dependency '{failed}' failed")
+                self.done.add(name)
+                return name
+
+            for dep in task.deps:
+                parent = self.tasks.get(dep)
+                if parent is None:
+                    raise KeyError(f"Unknown dependency '{dep}' for task '{name}'")
+                if dep in self.done and dep not in self.results and dep in refs:
+                    raise KeyError(f"Result of '{dep}' was already released")
+                parent.consumers += 1
+                if dep not in self.done:
+                    task.waiting += 1
+                    parent.dependents.append(task)
+
+            if task.waiting == 0:
+                self._make_ready(task)
+        return name
+
+    def result(self, name):
+        if name in self.errors:
+            raise self.errors[name]
+        return self.results[name]
+
+    def _make_ready(self, task):
+        heapq.heappush(self.ready[task.pool], (task.priority, task.seq, task.name))
+
+    def _resolve(self, value):
+        return self.results[value.name] if isinstance(value, Ref) else value
+
+    def _dispatch(self):
+        for pool, heap in self.ready.items():
+            while heap and self.running[pool] < self.limits[pool]:
+                _, _, name = heapq.heappop(heap)
+                task = self.tasks[name]
+                args = [self._resolve(a) for a in task.args]
+                kwargs = {k: self._resolve(v) for k, v in task.kwargs.items()}
+                if self.profiler is not None:
+                    fn, args = self.profiler.wrap(task.fn, name, args, kwargs)
+                    future = self.pools[pool].submit(fn, *args)
+                else:
+                    future = self.pools[pool].submit(task.fn, *args, **kwargs)
+                self.futures[future] = name
+                self.running[pool] += 1
+
+    def _release_inputs(self, task):
+        # Hasil dependency dibuang setelah konsumen terakhirnya selesai
+        for dep in task.deps:
+            parent = self.tasks[dep]
+            parent.consumers -= 1
+            if parent.consumers == 0 and parent.dependents:
+                self.results.pop(dep, None)
+
+    def _fail(self, task, error):
+        self.errors[task.name] = error
+        self.done.add(task.name)
+        self._release_inputs(task)
+        for child in task.dependents:
+            if child.name not in self.done:
+                self._fail(child, TaskFailed(f"dependency '{task.name}' failed"))
+
+    def _complete(self, name, future):
+        task = self.tasks[name]
+        self.running[task.pool] -= 1
+        try:
+            result = future.result()
+            if self.profiler is not None:
+                result = self.profiler.collect(name, result)
+            if task.then is not None:
+                task.then(result)
+        except Cancelled as e:
+            self.log("WARNING", f"Task {name} cancelled")
+            self._fail(task, e)
+            return
+        except Exception as e:
+            self.log("ERROR", f"Task {name} failed: {e}")
+            self._fail(task, e)
+            return
+
+        self.results[name] = result
+        self.done.add(name)
+        self._release_inputs(task)
+        for child in task.dependents:
+            child.waiting -= 1
+            if child.waiting == 0 and child.name not in self.done:
+                self._make_ready(child)
+
+    def pending(self, prefix=''):
+        """Number of unfinished tasks whose name starts with `prefix` (e.g. one job's tasks)"""
+        with self._lock:
+            return sum(1 for name in self.tasks if name.startswith(prefix) and name not in self.done)
+
+    def errors_for(self, prefix=''):
+        with self._lock:
+            return {name: e for name, e in self.errors.items() if name.startswith(prefix)}
+
+    def run(self, cancel=None, tick=None):
+        """
+        Run until every task has finished (or `cancel()` returns True). Returns failed task errors.
+        `tick()` dipanggil tiap iterasi dan boleh menambah task (misal job baru dari antrian batch).
+        """
+        while True:
+            with self._lock:
+                if tick is not None:
+                    tick()
+                self._dispatch()
+                if not self.futures:
+                    break
+
+            finished, _ = wait(list(self.futures), timeout=0.5, return_when=FIRST_COMPLETED)
+
+            with self._lock:
+                for future in finished:
+                    self._complete(self.futures.pop(future), future)
+
+                if cancel and cancel():
+                    # Task yang belum mulai dibatalkan; yang sedang jalan berhenti sendiri
+                    # lewat CancelToken-nya (lihat cancellation.py)
+                    for heap in self.ready.values():
+                        heap.clear()
+                    for future in list(self.futures):
+                        future.cancel()
+                    break
+
+        return dict(self.errors)
+
+    def shutdown(self):
+        for future in list(self.futures):
+            future.cancel()
+        for pool in self.pools.values():
+            pool.shutdown(wait=True)
@@ -0,0 +1,67 @@
+"""
+Progress - laporan throughput per task (frame/detik, detik audio/detik) + ETA
+Dipakai tracking, transkripsi, dan encode. Event dikirim ke `emit(event)`: GUI meneruskannya
+ke UIChannel, mode headless mencetaknya ke console (juga dari worker process).
+"""
+
+import time
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return ""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def format_event(event):
+    """'track:Short_1: 120/900 frames, 45.2 frames/s, ETA 0:17'"""
+    text = f"{event['stage']}: {event['done']:.0f}"
+    if event['total']:
+        text += f"/{event['total']:.0f}"
+    text += f" {event['unit']}"
+    if event['rate']:
+        text += f", {event['rate']:.1f} {event['unit']}/s"
+    if event['eta'] is not None:
+        text += f", ETA {format_eta(event['eta'])}"
+    return text
+
+
+class Meter:
+    """Counts units done by one task and emits throttled progress events with rate and ETA"""
+
+    def __init__(self, stage, total=None, unit='frames', emit=None, interval=1.0):
+        self.stage = stage
+        self.total = total
+        self.unit = unit
+        self.emit = emit
+        self.interval = interval
+        self.done = 0
+        self._start = time.monotonic()
+        self._last = self._start
+
+    def update(self, done, total=None):
+        if total:
+            self.total = total
+        self.done = done
+        if self.emit is None:
+            return
+        now = time.monotonic()
+        finished = self.total is not None and done >= self.total
+        if now - self._last < self.interval and not finished:
+            return
+        self._last = now
+        self.emit(self.event(now))
+
+    def event(self, now=None):
+        elapsed = max((now or time.monotonic()) - self._start, 1e-6)
+        rate = self.done / elapsed
+        eta = None
+        if self.total and rate > 0:
+            eta = max(0.0, (self.total - self.done) / rate)
+        return {
+            'stage': self.stage, 'done': self.done, 'total': self.total, 'unit': self.unit,
+            'rate': rate, 'eta': eta, 'elapsed': elapsed,
+        }
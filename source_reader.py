@@ -0,0 +1,266 @@
+"""
+Source Reader Pool - decoder video sumber yang dipakai ulang antar klip
+Membuka VideoFileClip = proses ffmpeg baru + probe file + buffer audio, jadi untuk sumber
+3 jam dengan banyak klip paralel memori ikut membengkak. Pool ini menyimpan beberapa reader
+per process (LRU), meminjamkannya secara eksklusif ke satu task, dan menahan task baru
+kalau perkiraan buffer semua reader melewati batas memori.
+
+    with pool.clip(path) as clip:                  # VideoFileClip (jangan di-close)
+    for frame in pool.frames(path, start, end):    # frame RGB berurutan
+    pool.frames(path, start, end, width=320)       # proxy: ffmpeg yang mengecilkan, bukan Python
+    with pool.clip(path, start_t=t) as clip:       # reader diposisikan di t (lihat keyframe_index.py)
+    samples = pool.audio(path, start, end)         # audio float, (n, channels)
+    audio_codec(path)                              # 'aac' -> audio klip bisa di-copy tanpa encode
+"""
+
+import re
+import time
+import threading
+import subprocess
+from contextlib import contextmanager
+from functools import lru_cache
+
+from keyframe_index import KeyframeIndex
+from lazy_imports import LazyModule
+
+mpy = LazyModule("moviepy.editor")
+ffmpeg_reader = LazyModule("moviepy.video.io.ffmpeg_reader")
+mpy_config = LazyModule("moviepy.config")
+
+
+def probe(path):
+    """(duration, has_audio) dari header file, tanpa membuka decoder"""
+    infos = ffmpeg_reader.ffmpeg_parse_infos(path)
+    return infos['duration'], bool(infos.get('audio_found'))
+
+
+@lru_cache(maxsize=32)
+def video_size(path):
+    """(width, height) sumber dari header - untuk memetakan koordinat proxy ke resolusi asli"""
+    return tuple(ffmpeg_reader.ffmpeg_parse_infos(path)['video_size'])
+
+
+@lru_cache(maxsize=32)
+def audio_codec(path):
+    """Codec stream audio pertama ('aac', 'opus', ...) dari header, None kalau tidak ada audio"""
+    result = subprocess.run([mpy_config.get_setting("FFMPEG_BINARY"), '-hide_banner', '-i', path],
+                            capture_output=True)
+    match = re.search(r"Stream #\S+.*?: Audio: (\w+)", result.stderr.decode(errors='replace'))
+    return match.group(1) if match else None
+
+
+def estimate_bytes(clip):
+    """Perkiraan buffer yang dipegang reader MoviePy: frame terakhir + pipe ffmpeg, buffer audio (float64)"""
+    w, h = clip.size
+    total = 2 * w * h * 3
+    if clip.audio is not None:
+        reader = clip.audio.reader
+        total += reader.buffersize * reader.nchannels * 8
+    return total
+
+
+class _Reader:
+    def __init__(self, path, audio, width):
+        self.path = path
+        self.audio = audio
+        self.width = width
+        # target_resolution = filter scale di ffmpeg: frame sudah kecil saat keluar dari pipe
+        self.clip = mpy.VideoFileClip(path, audio=audio, target_resolution=(None, width) if width else None)
+        self.bytes = estimate_bytes(self.clip)
+        self.last_used = time.monotonic()
+        self.in_use = True
+        self.retire = False
+
+    def frames_to(self, t, index):
+        """(frame yang di-decode untuk sampai ke t, lanjut decode?) - seek = dari keyframe sebelum t"""
+        video = self.clip.reader
+        last_t = (video.pos - 1) / video.fps  # frame terakhir yang dibaca
+        keyframe = index.before(t)
+        if video.proc and keyframe <= last_t <= t:
+            return (t - last_t) * video.fps, True  # Masih satu GOP di depan posisi sekarang
+        return (t - keyframe) * video.fps, False
+
+    def seek(self, t):
+        """Restart the decoder at `t` with a single accurate input seek (MoviePy seeks 1 s earlier)"""
+        video = self.clip.reader
+        video.close()
+        cmd = [mpy_config.get_setting("FFMPEG_BINARY"), '-ss', f"{t:.6f}", '-i', self.path, '-loglevel', 'error',
+               '-f', 'image2pipe', '-vf', 'scale=%d:%d' % tuple(video.size), '-sws_flags', video.resize_algo,
+               '-pix_fmt', video.pix_fmt, '-vcodec', 'rawvideo', '-']
+        video.proc = subprocess.Popen(cmd, bufsize=video.bufsize, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                      stdin=subprocess.DEVNULL)
+        # get_frame(t) membaca frame berikutnya dari pipe = frame pertama setelah seek
+        video.pos = int(video.fps * t + 0.00001)
+
+
+class SourceReaderPool:
+    """
+    Per-process pool of seekable source decoders.
+    `max_readers` membatasi jumlah proses ffmpeg, `memory_mb` total perkiraan buffer;
+    reader yang menganggur lebih dari `idle_seconds` ditutup.
+    """
+
+    def __init__(self, max_readers=4, memory_mb=1024, idle_seconds=120, index_dir=None):
+        self.max_readers = max_readers
+        self.memory_limit = int(memory_mb * 1024 * 1024)
+        self.idle_seconds = idle_seconds
+        self.index_dir = index_dir  # Folder KeyframeIndex; None = aturan seek bawaan MoviePy
+        self._indexes = {}
+        self._readers = []
+        self._opening = 0
+        self._reserved = 0  # perkiraan bytes reader yang sedang dibuka
+        self._sizes = {}  # (path, audio, width) -> bytes reader terakhir, untuk cek batas sebelum membuka
+        self._cond = threading.Condition()
+        self.stats = {'opened': 0, 'reused': 0, 'evicted': 0, 'waits': 0, 'peak_buffered_bytes': 0,
+                      'seeks': 0, 'continued': 0}
+
+    @contextmanager
+    def clip(self, path, audio=True, width=None, start_t=None):
+        """
+        Borrow a VideoFileClip of `path`, scaled to `width` px if given (exclusive until the block ends).
+        `start_t`: waktu frame pertama yang akan dibaca - dipilih reader terdekat dan decoder-nya
+        diposisikan dengan keyframe index.
+        """
+        index = self.keyframes(path) if start_t is not None else None
+        reader = self._checkout(path, audio, width, start_t, index)
+        try:
+            if index is not None:
+                self._position(reader, start_t, index)
+            yield reader.clip
+        finally:
+            self._checkin(reader)
+
+    def frames(self, path, start_t, end_t, fps=None, width=None):
+        """RGB frames in [start_t, end_t) at the source fps (or `fps`), decoded sequentially"""
+        with self.clip(path, audio=False, width=width, start_t=start_t) as clip:
+            fps = fps or clip.fps
+            end_t = min(end_t, clip.duration)
+            for i in range(int(round((end_t - start_t) * fps))):
+                yield clip.get_frame(start_t + i / fps)
+
+    def audio(self, path, start_t, end_t, fps=16000):
+        """Audio samples of [start_t, end_t) as float array (n, channels), hanya rentang itu yang dibaca"""
+        with self.clip(path, audio=True) as clip:
+            end_t = min(end_t, clip.duration)
+            return clip.audio.subclip(start_t, end_t).to_soundarray(fps=fps)
+
+    def keyframes(self, path):
+        """KeyframeIndex of `path` (loaded once per process), None if disabled"""
+        if self.index_dir is None:
+            return None
+        if path not in self._indexes:
+            try:
+                self._indexes[path] = KeyframeIndex.load(path, self.index_dir)
+            except (OSError, RuntimeError, ValueError):
+                self._indexes[path] = None  # Sumber tidak bisa di-scan: aturan seek MoviePy
+        return self._indexes[path]
+
+    def _position(self, reader, t, index):
+        video = reader.clip.reader
+        target = int(video.fps * t + 0.00001) + 1
+        if target == video.pos:
+            return
+        _, forward = reader.frames_to(t, index)
+        if forward:
+            # Tidak ada keyframe di antaranya: lanjut decode lebih murah dari seek, berapa pun jaraknya
+            video.skip_frames(target - 1 - video.pos)
+            self.stats['continued'] += 1
+        else:
+            reader.seek(t)
+            self.stats['seeks'] += 1
+
+    def metrics(self):
+        with self._cond:
+            return {
+                'open_readers': len(self._readers),
+                'readers_in_use': sum(r.in_use for r in self._readers),
+                'buffered_bytes': self._buffered(),
+                'memory_limit': self.memory_limit,
+                **self.stats,
+            }
+
+    def close(self, path=None):
+        """Close idle readers (of `path`, or all); readers in use close when returned"""
+        with self._cond:
+            for reader in list(self._readers):
+                if path is None or reader.path == path:
+                    if reader.in_use:
+                        reader.retire = True
+                    else:
+                        self._close(reader)
+
+    def _buffered(self):
+        return sum(r.bytes for r in self._readers)
+
+    def _close(self, reader):
+        self._readers.remove(reader)
+        reader.clip.close()
+        self._cond.notify_all()
+
+    def _has_room(self, key):
+        if not self._readers and not self._opening:
+            return True  # Satu reader selalu boleh, walau melebihi batas
+        if len(self._readers) + self._opening >= self.max_readers:
+            return False
+        # Ukuran reader baru dari reader sebelumnya; belum ada sama sekali -> tunggu yang sedang dibuka
+        estimate = self._sizes.get(key, max(self._sizes.values(), default=None))
+        if estimate is None:
+            return not self._opening
+        return self._buffered() + self._reserved + estimate <= self.memory_limit
+
+    def _checkout(self, path, audio, width=None, start_t=None, index=None):
+        key = (path, audio, width)
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                for reader in list(self._readers):
+                    if not reader.in_use and now - reader.last_used > self.idle_seconds:
+                        self._close(reader)
+                        self.stats['evicted'] += 1
+                idle = [r for r in self._readers if not r.in_use and r.path == path and r.width == width
+                        and (r.audio or not audio)]
+                if idle:
+                    # Beberapa reader sumber yang sama: yang paling sedikit decode untuk sampai ke start_t
+                    reader = min(idle, key=lambda r: r.frames_to(start_t, index)[0]) if index else idle[0]
+                    reader.in_use = True
+                    self.stats['reused'] += 1
+                    return reader
+                if self._has_room(key):
+                    break
+                # Tutup reader menganggur paling lama, kalau tidak ada tunggu reader dikembalikan
+                idle = [r for r in self._readers if not r.in_use]
+                if idle:
+                    self._close(min(idle, key=lambda r: r.last_used))
+                    self.stats['evicted'] += 1
+                else:
+                    self.stats['waits'] += 1
+                    self._cond.wait(1.0)
+            reserved = self._sizes.get(key, max(self._sizes.values(), default=0))
+            self._opening += 1
+            self._reserved += reserved
+
+        # Probe + start ffmpeg di luar lock
+        try:
+            reader = _Reader(path, audio, width)
+        except BaseException:
+            with self._cond:
+                self._opening -= 1
+                self._reserved -= reserved
+                self._cond.notify_all()
+            raise
+        with self._cond:
+            self._opening -= 1
+            self._reserved -= reserved
+            self._readers.append(reader)
+            self._sizes[key] = reader.bytes
+            self.stats['opened'] += 1
+            self.stats['peak_buffered_bytes'] = max(self.stats['peak_buffered_bytes'], self._buffered())
+        return reader
+
+    def _checkin(self, reader):
+        with self._cond:
+            reader.in_use = False
+            reader.last_used = time.monotonic()
+            if reader.retire or (self._buffered() > self.memory_limit and len(self._readers) > 1):
+                self._close(reader)
+            self._cond.notify_all()
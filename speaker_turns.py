@@ -0,0 +1,65 @@
+"""
+Speaker Turns - membagi klip menjadi giliran bicara untuk framing 'speaker'
+Batas kandidat = jeda antar segmen Whisper. Opsional dicek dengan audio: spektrum (log energi
+per band) sebelum dan sesudah batas dibandingkan, batas dengan suara yang mirip digabung.
+Batas yang membuat giliran lebih pendek dari `min_turn` dilewati.
+"""
+
+import numpy as np
+
+
+def segment_boundaries(segments, start_t, end_t):
+    """Midpoints of the gaps between consecutive Whisper segments inside (start_t, end_t)"""
+    bounds = []
+    for (_, prev_end), (next_start, _) in zip(segments, segments[1:]):
+        t = (prev_end + next_start) / 2
+        if start_t < t < end_t:
+            bounds.append(t)
+    return bounds
+
+
+def _band_energies(samples, sr, bands=24):
+    """Mean log energy per (log-spaced) frequency band, 25 ms frames"""
+    size = int(sr * 0.025)
+    frames = len(samples) // size
+    if frames < 2:
+        return None
+    spec = np.abs(np.fft.rfft(samples[:frames * size].reshape(frames, size) * np.hanning(size), axis=1)) ** 2
+    edges = np.unique(np.geomspace(2, spec.shape[1] - 1, bands + 1).astype(int))
+    energy = np.add.reduceat(spec, edges[:-1], axis=1)
+    return np.log(energy + 1e-9).mean(axis=0)
+
+
+def change_score(samples, sr, t, window=1.5):
+    """Spectral distance between the `window` seconds before and after sample time `t` (0 = sama)"""
+    i = int(t * sr)
+    w = int(window * sr)
+    before = _band_energies(samples[max(0, i - w):i], sr)
+    after = _band_energies(samples[i:i + w], sr)
+    if before is None or after is None:
+        return 0.0
+    # Bentuk spektrum saja (dikurangi rata-rata), jadi perubahan volume tidak dihitung ganti pembicara
+    before, after = before - before.mean(), after - after.mean()
+    return float(np.sqrt(np.mean((before - after) ** 2)))
+
+
+def speaker_turns(segments, start_t, end_t, samples=None, sr=16000, min_turn=2.0, threshold=1.0):
+    """
+    [(start, end)] giliran bicara yang menutupi [start_t, end_t].
+    `segments`: [(start, end)] segmen Whisper (detik sumber); `samples`: audio mono klip
+    (mulai di start_t) untuk mengecek ganti pembicara, None = semua batas segmen dipakai.
+    """
+    bounds = segment_boundaries(segments, start_t, end_t)
+    if samples is not None:
+        bounds = [t for t in bounds if change_score(samples, sr, t - start_t) >= threshold]
+
+    turns, turn_start = [], start_t
+    for t in bounds:
+        if t - turn_start >= min_turn:  # Batas yang terlalu dekat dilewati (giliran diperpanjang)
+            turns.append((turn_start, t))
+            turn_start = t
+    if turns and end_t - turn_start < min_turn:
+        turns[-1] = (turns[-1][0], end_t)
+    else:
+        turns.append((turn_start, end_t))
+    return turns
@@ -0,0 +1,298 @@
+"""
+Stage Profiler - laporan waktu + resource per tahap job (opt-in)
+Tiap task scheduler dijalankan lewat `run_profiled` di worker-nya (thread atau process):
+wall time, CPU time, peak RSS, byte baca/tulis, waktu antri, dan counter (frame, detik audio).
+Sub-langkah di dalam task dicatat dengan `with step("encode"):`, counter dengan `count(frames=n)`,
+level (maksimum) dengan `gauge(open_readers=n)`; semuanya no-op kalau profiling tidak aktif.
+Hasilnya JSON per job + summary.json gabungan semua job di folder report.
+
+Catatan: RSS dan byte I/O adalah counter per process, jadi tahap yang berjalan bersamaan
+di process yang sama ikut tercampur. CPU time = CPU thread task + CPU proses anak (ffmpeg)
+yang selesai selama tahap itu.
+"""
+
+import os
+import re
+import json
+import time
+import glob
+import fnmatch
+import cProfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+_local = threading.local()
+
+
+def _rss():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _io():
+    """(bytes read, bytes written) by this process, including pipes to ffmpeg"""
+    if psutil is not None:
+        try:
+            c = psutil.Process().io_counters()
+            return getattr(c, 'read_chars', c.read_bytes), getattr(c, 'write_chars', c.write_bytes)
+        except (AttributeError, psutil.Error):
+            return None
+    try:
+        with open('/proc/self/io') as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+        return int(fields['rchar']), int(fields['wchar'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _cpu():
+    t = os.times()
+    return time.thread_time() + t.children_user + t.children_system
+
+
+class _Measure:
+    """Measures one stage or step; peak RSS is sampled in a background thread"""
+
+    def __init__(self, name, interval=0.1):
+        self.record = {'name': name, 'counters': {}, 'gauges': {}, 'steps': {}}
+        self.interval = interval
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            rss = _rss()
+            if rss is not None and rss > (self.record['peak_rss'] or 0):
+                self.record['peak_rss'] = rss
+
+    def __enter__(self):
+        self.record['started'] = time.time()
+        self.record['peak_rss'] = _rss()
+        self._wall, self._cpu, self._io = time.perf_counter(), _cpu(), _io()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        return self.record
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._sampler.join()
+        rec = self.record
+        rec['wall'] = time.perf_counter() - self._wall
+        rec['cpu'] = _cpu() - self._cpu
+        io = _io()
+        if io is not None and self._io is not None:
+            rec['read_bytes'], rec['write_bytes'] = io[0] - self._io[0], io[1] - self._io[1]
+        else:
+            rec['read_bytes'] = rec['write_bytes'] = None
+        return False
+
+
+@contextmanager
+def step(name):
+    """Time a sub-step of the current task (no-op when the task is not profiled)"""
+    parent = getattr(_local, 'record', None)
+    if parent is None:
+        yield
+        return
+    with _Measure(name) as rec:
+        yield
+    # Step yang sama bisa terjadi berkali-kali (misal per kata): dijumlahkan
+    total = parent['steps'].setdefault(name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'peak_rss': None})
+    total['calls'] += 1
+    total['wall'] += rec['wall']
+    total['cpu'] += rec['cpu']
+    total['peak_rss'] = max(filter(None, (total['peak_rss'], rec['peak_rss'])), default=None)
+
+
+def count(**counters):
+    """Add counters (frames=..., audio_seconds=...) to the current task's record"""
+    record = getattr(_local, 'record', None)
+    if record is not None:
+        for key, value in counters.items():
+            record['counters'][key] = record['counters'].get(key, 0) + value
+
+
+def gauge(**values):
+    """Record levels (open readers, buffered bytes) on the current task; the maximum is kept"""
+    record = getattr(_local, 'record', None)
+    if record is not None:
+        for key, value in values.items():
+            record['gauges'][key] = max(record['gauges'].get(key, value), value)
+
+
+def run_profiled(fn, name, capture, args, kwargs):
+    """
+    Worker-side wrapper: returns (result, error, record) instead of raising, so the
+    record of a failed task reaches the scheduler too. `capture` = (path, tool) or None.
+    """
+    measure = _Measure(name)
+    result = error = None
+    with measure as record:
+        _local.record = record
+        try:
+            if capture is None:
+                result = fn(*args, **kwargs)
+            else:
+                result = _run_captured(fn, args, kwargs, *capture)
+            record['status'] = 'ok'
+        except BaseException as e:
+            error = e
+            record['status'] = type(e).__name__
+        finally:
+            _local.record = None
+    return result, error, record
+
+
+def _run_captured(fn, args, kwargs, path, tool):
+    if tool == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler as Instrument
+        except ImportError:
+            tool = 'cprofile'
+        else:
+            profiler = Instrument()
+            profiler.start()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.stop()
+                with open(path + '.html', 'w', encoding='utf-8') as f:
+                    f.write(profiler.output_html())
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args, **kwargs)
+    finally:
+        profiler.dump_stats(path + '.prof')
+
+
+def task_name(name):
+    """'<job_id>:render:3' -> 'render:3' (nama task tanpa prefix job)"""
+    return re.sub(r'^[0-9a-f]{16}:', '', name)
+
+
+def stage_kind(name):
+    """'<job_id>:render:3' -> 'render', juga task segmen '<job_id>:render:3:1'"""
+    return re.sub(r'(:\d+)+$', '', task_name(name))
+
+
+class Profiler:
+    """
+    Parent-side collector used by Scheduler(profiler=...).
+    `capture` = pola nama task (fnmatch, misal "render:0" atau "*transcribe") yang dijalankan
+    di bawah cProfile / pyinstrument; hasilnya disimpan di `report_dir`.
+    """
+
+    def __init__(self, report_dir="profiles", capture=None, capture_tool='cprofile'):
+        self.report_dir = report_dir
+        self.capture = capture
+        self.capture_tool = capture_tool
+        self.records = {}
+        self._submitted = {}
+        self._lock = threading.Lock()
+        os.makedirs(report_dir, exist_ok=True)
+
+    def wrap(self, fn, name, args, kwargs):
+        """(fn, args) to submit to the pool instead of the bare task"""
+        capture = None
+        if self.capture and (fnmatch.fnmatch(name, self.capture) or fnmatch.fnmatch(task_name(name), self.capture)):
+            safe = re.sub(r'[^\w.-]', '_', name)
+            capture = (os.path.join(self.report_dir, f"{safe}-{int(time.time())}"), self.capture_tool)
+        with self._lock:
+            self._submitted[name] = time.time()
+        return run_profiled, (fn, name, capture, tuple(args), dict(kwargs))
+
+    def collect(self, name, payload):
+        """Store the worker's record; return the task result or re-raise its error"""
+        result, error, record = payload
+        with self._lock:
+            record['queued'] = max(0.0, record['started'] - self._submitted.pop(name, record['started']))
+            self.records[name] = record
+        if error is not None:
+            raise error
+        return result
+
+    def job_report(self, job_id, prefix='', **meta):
+        with self._lock:
+            stages = [r for name, r in self.records.items() if name.startswith(prefix)]
+        stages.sort(key=lambda r: r['started'])
+        started = min((r['started'] for r in stages), default=time.time())
+        finished = max((r['started'] + r['wall'] for r in stages), default=started)
+        return {
+            'job_id': job_id,
+            'created_at': time.time(),
+            'wall': finished - started,  # Wall time job (tahap paralel tidak dijumlah)
+            'busy': sum(r['wall'] for r in stages),
+            'cpu': sum(r['cpu'] for r in stages),
+            'peak_rss': max((r['peak_rss'] or 0 for r in stages), default=0),
+            'by_kind': _aggregate(stages),
+            'stages': stages,
+            **meta,
+        }
+
+    def write_report(self, job_id, prefix='', **meta):
+        """Write `<report_dir>/<job_id>-<time>.json` and refresh summary.json; returns the path"""
+        report = self.job_report(job_id, prefix, **meta)
+        path = os.path.join(self.report_dir, f"{job_id}-{int(report['created_at'])}.json")
+        _write_json(path, report)
+        self.write_summary()
+        return path
+
+    def write_summary(self):
+        """Aggregate every job report in `report_dir` into summary.json"""
+        jobs, stages = [], []
+        for path in sorted(glob.glob(os.path.join(self.report_dir, "*-*.json"))):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    report = json.load(f)
+            except (OSError, ValueError):
+                continue
+            stages.extend(report['stages'])
+            jobs.append({k: report.get(k) for k in ('job_id', 'created_at', 'wall', 'busy', 'cpu', 'peak_rss', 'source')})
+        summary = {'jobs': len(jobs), 'by_kind': _aggregate(stages), 'runs': jobs}
+        _write_json(os.path.join(self.report_dir, "summary.json"), summary)
+        return summary
+
+
+def _aggregate(stages):
+    kinds = {}
+    for r in stages:
+        k = kinds.setdefault(stage_kind(r['name']), {
+            'count': 0, 'wall': 0.0, 'cpu': 0.0, 'queued': 0.0, 'peak_rss': 0,
+            'read_bytes': 0, 'write_bytes': 0, 'counters': {}, 'gauges': {}, 'steps': {}})
+        k['count'] += 1
+        k['wall'] += r['wall']
+        k['cpu'] += r['cpu']
+        k['queued'] += r.get('queued', 0.0)
+        k['peak_rss'] = max(k['peak_rss'], r['peak_rss'] or 0)
+        k['read_bytes'] += r.get('read_bytes') or 0
+        k['write_bytes'] += r.get('write_bytes') or 0
+        for key, value in r['counters'].items():
+            k['counters'][key] = k['counters'].get(key, 0) + value
+        for key, value in r.get('gauges', {}).items():
+            k['gauges'][key] = max(k['gauges'].get(key, value), value)
+        for name, s in r['steps'].items():
+            agg = k['steps'].setdefault(name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0})
+            agg['calls'] += s['calls']
+            agg['wall'] += s['wall']
+            agg['cpu'] += s['cpu']
+    for k in kinds.values():
+        k['mean_wall'] = k['wall'] / k['count']
+        if 'frames' in k['counters'] and k['wall']:
+            k['fps'] = k['counters']['frames'] / k['wall']
+    return kinds
+
+
+def _write_json(path, data):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp, path)
@@ -0,0 +1,34 @@
+from clip_planner import plan_clips
+
+
+def clip(start, end, title):
+    return {'start': start, 'end': end, 'title': title}
+
+
+def test_partial_overlap_keeps_llm_start():
+    candidates = [clip(80, 120, 'a'), clip(50, 100, 'b')]
+    plan = plan_clips(candidates, 2, min_duration=15, max_duration=60, sentence_ends=[62, 78.5, 85])
+    kept = {c['title']: c for c in plan}
+    assert kept['b']['start'] == 50
+    assert kept['b']['end'] == 78.5  # mundur ke akhir kalimat sebelum klip 'a'
+    assert (kept['a']['start'], kept['a']['end']) == (80, 120)
+
+
+def test_partial_overlap_starting_inside_accepted_clip_is_dropped():
+    candidates = [clip(0, 40, 'a'), clip(5, 45, 'b'), clip(30, 80, 'c'), clip(100, 140, 'd')]
+    plan = plan_clips(candidates, 4, min_duration=15, max_duration=60)
+    assert [(c['title'], c['start'], c['end']) for c in plan] == [('a', 0, 45), ('d', 100, 140)]
+
+
+def test_containing_clip_is_trimmed_to_gap_before_contained_clip():
+    # Klip besar yang memuat klip lain tidak dirender ganda: ekornya dipotong, start tetap
+    candidates = [clip(40, 55, 'small'), clip(30, 90, 'big')]
+    plan = plan_clips(candidates, 2, min_duration=5, max_duration=60)
+    big = next(c for c in plan if c['title'] == 'big')
+    assert (big['start'], big['end']) == (30, 40)
+
+
+def test_containing_clip_is_dropped_when_gap_is_too_short():
+    candidates = [clip(40, 55, 'small'), clip(30, 90, 'big')]
+    plan = plan_clips(candidates, 2, min_duration=15, max_duration=60)
+    assert [(c['title'], c['start'], c['end']) for c in plan] == [('small', 40, 55)]
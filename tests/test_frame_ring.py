@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dijalankan sebagai script: child spawn meng-import ulang __main__ dari file ini
+SCRIPT = textwrap.dedent("""
+    import multiprocessing
+    import numpy as np
+    from frame_ring import FrameRing
+
+    def consume(ring):
+        total = sum(int(frame[0, 0]) for frame in ring.frames(timeout=30))
+        ring.release()
+        assert total == 6
+
+    if __name__ == '__main__':
+        ctx = multiprocessing.get_context('spawn')
+        ring = FrameRing((2, 2), slots=2, ctx=ctx)
+        child = ctx.Process(target=consume, args=(ring,))
+        child.start()
+        for value in (1, 2, 3):
+            ring.put(np.full((2, 2), value, np.uint8), timeout=30)
+        ring.close()
+        child.join(30)
+        assert child.exitcode == 0
+        ring.unlink()
+""")
+
+
+def test_unlink_after_spawned_child_attach_is_clean(tmp_path):
+    script = tmp_path / "ring_child.py"
+    script.write_text(SCRIPT)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    result = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, timeout=120, env=env)
+    assert result.returncode == 0, result.stderr
+    assert result.stderr == ''
@@ -0,0 +1,29 @@
+import types
+
+import keyframe_index
+
+FRAMECRC = """#tb 0: 1/1000
+#media_type 0: video
+0,       1400,       1400,       40,     5171, 0xb3cfad6f
+0,       1440, -9223372036854775808,  40,     2477, 0x9870d926, F=0x0
+0,       1480,       1480,       40,     1399, 0xb1a4b4e9, F=0x0
+0, -9223372036854775808, -9223372036854775808, 40, 987, 0x5692f8c8
+0,       3400,       3400,       40,     5909, 0x9eae8081
+0,       3440,       3440,       40,     2393, 0xa2648d54, F=0x0
+"""
+
+
+def _fake_ffmpeg(monkeypatch, stdout):
+    monkeypatch.setattr(keyframe_index, 'mpy_config', types.SimpleNamespace(get_setting=lambda key: 'ffmpeg'))
+    monkeypatch.setattr(keyframe_index.subprocess, 'run',
+                        lambda cmd, **kw: types.SimpleNamespace(returncode=0, stdout=stdout.encode(), stderr=b''))
+
+
+def test_scan_keyframes_relative_to_stream_start(monkeypatch):
+    _fake_ffmpeg(monkeypatch, FRAMECRC)
+    assert keyframe_index.scan_keyframes('src.mp4') == [0.0, 2.0]
+
+
+def test_scan_keyframes_uses_dts_without_pts(monkeypatch):
+    _fake_ffmpeg(monkeypatch, "#tb 0: 1/10\n0, 5, -9223372036854775808, 1, 10, 0x0\n0, 25, 25, 1, 10, 0x0\n")
+    assert keyframe_index.scan_keyframes('src.mp4') == [0.0, 2.0]
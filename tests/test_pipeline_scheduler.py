@@ -0,0 +1,31 @@
+import pytest
+
+from pipeline_scheduler import Scheduler, Ref, TaskFailed
+
+
+def boom():
+    raise RuntimeError("boom")
+
+
+def value(x):
+    return x
+
+
+def test_add_after_dependency_failed_keeps_other_results():
+    with Scheduler(io_workers=1, cpu_workers=1, cpu_processes=False) as sched:
+        sched.add('B', boom)
+        sched.run()
+        assert isinstance(sched.errors['B'], RuntimeError)
+
+        sched.add('A', value, 1)
+        sched.add('D', value, 0, deps=['B', 'A'])
+        sched.add('C1', value, Ref('A'))
+        sched.add('C2', value, Ref('A'))
+        errors = sched.run()
+
+        assert isinstance(errors['D'], TaskFailed)
+        assert 'C1' not in errors and 'C2' not in errors
+        assert sched.result('C1') == 1
+        assert sched.result('C2') == 1
+        with pytest.raises(TaskFailed):
+            sched.result('D')
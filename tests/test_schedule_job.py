@@ -0,0 +1,92 @@
+import json
+import types
+
+import numpy as np
+import pytest
+
+import core
+from job_manifest import JobManifest
+from pipeline_scheduler import Scheduler
+
+TRANSCRIPT = {'text': 'halo dunia', 'language': 'id', 'segments': [
+    {'start': 0.0, 'end': 2.0, 'text': 'halo dunia',
+     'words': [{'word': 'halo', 'start': 0.0, 'end': 1.0}, {'word': 'dunia', 'start': 1.0, 'end': 2.0}]}]}
+
+
+@pytest.fixture
+def job(tmp_path, monkeypatch):
+    """Job yang source, transkrip dan plan-nya sudah selesai; track/render dicatat, bukan dijalankan"""
+    source = tmp_path / "source.mp4"
+    source.write_bytes(b'video')
+    config = dict(core.DEFAULTS, api_key='', source_type='file', local_file=str(source), youtube_url='',
+                  keyframe_dir=None, output_dir=str(tmp_path / "out"), clip_count=1)
+
+    manifest = JobManifest(str(tmp_path / "job"), str(source))
+    manifest.complete_stage('source', artifacts=[str(source)], path=str(source), duration=60.0, has_audio=True)
+    with open(manifest.file("transcript.json"), 'w', encoding='utf-8') as f:
+        json.dump(TRANSCRIPT, f)
+    transcript_params = {'whisper_model': config['whisper_model'], 'language': config['language']}
+    manifest.complete_stage('transcript', artifacts=[manifest.file("transcript.json")], params=transcript_params)
+    manifest.complete_stage('plan', params={'clip_count': 1, 'iou': config['dedupe_iou'],
+                                            'seconds': [config['min_clip_seconds'], config['max_clip_seconds']],
+                                            'transcript': transcript_params},
+                            clips=[{'start': 0.0, 'end': 2.0, 'title': 'halo'}])
+
+    calls = []
+    transcribed = []
+
+    def fake_extract_audio(source_path, audio_path, ws, token):
+        return audio_path
+
+    def fake_transcribe(audio_path, token, config=None):
+        transcribed.append(config['language'])
+        return TRANSCRIPT
+
+    def fake_hooks(api_key, text, num_clips, min_seconds=30, max_seconds=60):
+        return [{'start': 0.0, 'end': 2.0, 'title': 'halo'}]
+
+    def fake_track(source_video, start_t, end_t, clip_name, token, config=None, segments=None):
+        return {'centers': np.zeros(2, np.float32), 'fps': 25.0, 'end': end_t}
+
+    def fake_render(source_video, start_t, end_t, clip_name, word_index, config, ws, track, token):
+        calls.append(config)
+        path = core.format_output(config, clip_name, config['formats'][0])
+        with open(path, 'wb') as f:
+            f.write(b'clip')
+        return path
+
+    monkeypatch.setattr(core, 'track', fake_track)
+    monkeypatch.setattr(core, 'render', fake_render)
+    monkeypatch.setattr(core, 'extract_audio', fake_extract_audio)
+    monkeypatch.setattr(core, 'transcribe', fake_transcribe)
+    monkeypatch.setattr(core, 'analyze_hooks_with_groq', fake_hooks)
+    ws = types.SimpleNamespace(path=lambda name: str(tmp_path / name), job_dir=manifest.job_dir)
+
+    def run(**overrides):
+        del calls[:], transcribed[:]
+        with Scheduler(io_workers=1, cpu_workers=1, cpu_processes=False) as sched:
+            outputs = core.schedule_job(sched, manifest, dict(config, **overrides), ws)
+            assert sched.run() == {}
+        return outputs, len(calls), list(transcribed)
+
+    return run
+
+
+def test_resume_skips_finished_clip(job):
+    assert job()[1] == 1
+    outputs, rendered, _ = job()
+    assert rendered == 0
+    assert len(outputs) == 1
+
+
+def test_resume_rerenders_clip_after_tracking_change(job):
+    assert job()[1] == 1
+    assert job(redetect_every=5)[1] == 1
+
+
+def test_resume_skips_transcript_with_same_settings(job):
+    assert job()[2] == []
+
+
+def test_resume_retranscribes_after_language_change(job):
+    assert job(language='en')[2] == ['en']
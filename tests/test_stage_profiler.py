@@ -0,0 +1,11 @@
+from stage_profiler import stage_kind
+
+
+def test_stage_kind_strips_clip_index():
+    assert stage_kind("0123456789abcdef:render:3") == 'render'
+    assert stage_kind("0123456789abcdef:source") == 'source'
+
+
+def test_stage_kind_strips_segment_index():
+    assert stage_kind("0123456789abcdef:render:3:1") == 'render'
+    assert stage_kind("0123456789abcdef:join:12") == 'join'
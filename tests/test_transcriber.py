@@ -0,0 +1,49 @@
+import types
+
+import numpy as np
+import pytest
+
+import transcriber
+from cancellation import CancelToken, Cancelled
+
+
+class FakeModule:
+    """Minimal stand-in for a torch module: runs forward pre-hooks on every call"""
+
+    def __init__(self):
+        self.hooks = {}
+
+    def register_forward_pre_hook(self, hook):
+        key = object()
+        self.hooks[key] = hook
+        return types.SimpleNamespace(remove=lambda: self.hooks.pop(key))
+
+    def __call__(self):
+        for hook in list(self.hooks.values()):
+            hook(self, ())
+
+
+class FakeModel:
+    def __init__(self, token, cancel_at):
+        self.encoder, self.decoder = FakeModule(), FakeModule()
+        self.token, self.cancel_at, self.steps = token, cancel_at, 0
+
+    def transcribe(self, audio, **options):
+        self.encoder()
+        for _ in range(10):
+            self.steps += 1
+            if self.steps == self.cancel_at:
+                self.token.cancel()
+            self.decoder()
+        return {'text': 'halo', 'segments': [], 'language': 'id'}
+
+
+def test_cancel_inside_chunk(monkeypatch):
+    monkeypatch.setattr(transcriber, 'whisper', types.SimpleNamespace(
+        load_audio=lambda path: np.zeros(transcriber.SAMPLE_RATE * 60, np.float32)))
+    token = CancelToken()
+    model = FakeModel(token, cancel_at=3)
+    with pytest.raises(Cancelled):
+        transcriber.transcribe_chunked(model, 'audio.wav', token)
+    assert model.steps == 3
+    assert not model.encoder.hooks and not model.decoder.hooks
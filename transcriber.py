@@ -0,0 +1,92 @@
+"""
+Transcriber - Whisper dijalankan per potongan audio (~30 detik, satu window Whisper).
+Pembatalan dicek di antara potongan dan juga di dalam decode (hook di encoder/decoder
+Whisper, tiap token), jadi tombol Stop tidak menunggu potongan 30 detik selesai.
+Batas potongan dipilih di titik paling hening supaya kata tidak terpotong; teks potongan
+sebelumnya dipakai sebagai prompt, dan timestamp digeser kembali ke waktu asli.
+"""
+
+from contextlib import contextmanager
+
+import numpy as np
+
+from lazy_imports import LazyModule
+
+whisper = LazyModule("whisper")
+
+SAMPLE_RATE = 16000  # = whisper.audio.SAMPLE_RATE (konstan, supaya import module ini tidak memuat torch)
+PROMPT_CHARS = 200  # Konteks dari potongan sebelumnya (mirip condition_on_previous_text)
+
+
+def _quiet_cut(audio, target, search):
+    """Sample index of the quietest 50 ms frame in [target - search, target]"""
+    lo = max(0, target - search)
+    hop = SAMPLE_RATE // 20
+    n = (target - lo) // hop
+    if n == 0:
+        return target
+    frames = audio[lo:lo + n * hop].reshape(n, hop)
+    energy = np.square(frames).mean(axis=1)
+    return lo + int(np.argmin(energy)) * hop + hop // 2
+
+
+def _shift(segment, offset, seg_id):
+    segment = dict(segment, id=seg_id, start=segment['start'] + offset, end=segment['end'] + offset)
+    if 'words' in segment:
+        segment['words'] = [dict(w, start=w['start'] + offset, end=w['end'] + offset) for w in segment['words']]
+    return segment
+
+
+@contextmanager
+def _cancel_hooks(model, token):
+    """Check `token` before every encoder / decoder forward pass of a Whisper model"""
+    handles = []
+    if token is not None:
+        for module in (getattr(model, 'encoder', None), getattr(model, 'decoder', None)):
+            if hasattr(module, 'register_forward_pre_hook'):
+                handles.append(module.register_forward_pre_hook(lambda module, args: token.check()))
+    try:
+        yield
+    finally:
+        for handle in handles:
+            handle.remove()
+
+
+def transcribe_chunked(model, audio_path, token=None, chunk_seconds=30, search_seconds=4,
+                       language=None, meter=None, **options):
+    """
+    Same result shape as `model.transcribe` ({'text', 'segments', 'language'}),
+    but checks `token` before every chunk and every decoded token, and reports
+    audio seconds done to `meter`.
+    Language is detected on the first chunk (jika `language` None) lalu dipakai
+    untuk potongan berikutnya.
+    """
+    audio = whisper.load_audio(audio_path)
+    total = len(audio)
+    chunk = int(chunk_seconds * SAMPLE_RATE)
+    search = int(search_seconds * SAMPLE_RATE)
+
+    segments, texts = [], []
+    prompt = options.pop('initial_prompt', None)
+    pos = 0
+    with _cancel_hooks(model, token):
+        while pos < total:
+            if token is not None:
+                token.check()
+            end = total if total - pos <= chunk else _quiet_cut(audio, pos + chunk, search)
+
+            result = model.transcribe(audio[pos:end], language=language, initial_prompt=prompt, **options)
+            language = language or result.get('language')
+            offset = pos / SAMPLE_RATE
+            for seg in result['segments']:
+                segments.append(_shift(seg, offset, len(segments)))
+
+            text = result['text'].strip()
+            if text:
+                texts.append(text)
+                prompt = text[-PROMPT_CHARS:]
+            pos = end
+            if meter is not None:
+                meter.update(pos / SAMPLE_RATE, total / SAMPLE_RATE)
+
+    return {'text': ' '.join(texts), 'segments': segments, 'language': language or 'unknown'}
@@ -0,0 +1,67 @@
+"""
+UI Channel - saluran log + progress dari worker ke GUI
+Worker hanya menaruh event ke antrian (tidak pernah menyentuh widget Tk, tidak pernah blok).
+GUI mengambil semua event sekali per tick: log digabung jadi satu insert dan progress cukup
+event terakhir per stage (scrollback dibatasi di textbox GUI, lihat app.py LOG_MAX_LINES).
+"""
+
+import time
+import queue
+import threading
+
+
+class UIChannel:
+    """Thread-safe log + structured progress channel, drained by the GUI main loop"""
+
+    def __init__(self, max_events_per_tick=2000):
+        self._events = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._stage_started = {}
+        self.max_events_per_tick = max_events_per_tick
+
+    def log(self, level, message):
+        self._events.put(('log', level, str(message)))
+
+    def progress(self, stage, done=0, total=None, text=None, rate=None, unit=None):
+        """
+        Progress event: `done` dari `total` unit (klip, frame, detik audio) untuk satu stage.
+        ETA dari `rate` (unit/detik, dari progress.Meter) atau dari laju sejak event pertama stage.
+        """
+        now = time.monotonic()
+        with self._lock:
+            started = self._stage_started.setdefault(stage, now)
+        eta = None
+        if total and rate:
+            eta = max(0.0, (total - done) / rate)
+        elif total and done:
+            eta = (now - started) * (total - done) / done
+        self._events.put(('progress', {
+            'stage': stage, 'done': done, 'total': total, 'text': text, 'eta': eta,
+            'rate': rate, 'unit': unit, 'time': now,
+        }))
+
+    def meter_event(self, event):
+        """`emit` target for progress.Meter"""
+        self.progress(event['stage'], event['done'], event['total'], rate=event['rate'], unit=event['unit'])
+
+    def reset(self):
+        """Forget stage start times (new job)"""
+        with self._lock:
+            self._stage_started.clear()
+
+    def drain(self):
+        """
+        Take pending events (at most `max_events_per_tick`, sisanya tick berikutnya).
+        Returns (new log lines [(level, message)], {stage: latest progress event}).
+        """
+        lines, latest = [], {}
+        for _ in range(self.max_events_per_tick):
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == 'log':
+                lines.append(event[1:])
+            else:
+                latest[event[1]['stage']] = event[1]
+        return lines, latest
@@ -0,0 +1,108 @@
+"""
+Word Index - penyimpanan kata hasil Whisper dalam bentuk kolom (NumPy)
+Dibangun sekali setelah transkripsi, lalu dipakai semua klip untuk query rentang waktu.
+"""
+
+import os
+import json
+import numpy as np
+
+
+class WordIndex:
+    """Columnar word-timestamp store: start/end arrays + interned string table"""
+
+    def __init__(self, starts, ends, ids, vocab, path=None):
+        self.starts = starts
+        self.ends = ends
+        self.ids = ids
+        self.vocab = vocab
+        self.path = path
+
+        # Read-only: index dibagi ke banyak klip/worker, jangan sampai diubah
+        for arr in (self.starts, self.ends, self.ids):
+            if isinstance(arr, np.ndarray) and arr.flags.writeable:
+                arr.flags.writeable = False
+
+    @classmethod
+    def from_words(cls, words):
+        """Build index from a list of whisper word dicts"""
+        vocab = []
+        lookup = {}
+        starts = np.empty(len(words), dtype=np.float64)
+        ends = np.empty(len(words), dtype=np.float64)
+        ids = np.empty(len(words), dtype=np.int32)
+
+        for i, w in enumerate(words):
+            text = w.get('word', w.get('text', ''))
+            idx = lookup.get(text)
+            if idx is None:
+                idx = len(vocab)
+                lookup[text] = idx
+                vocab.append(text)
+            starts[i] = w['start']
+            ends[i] = w['end']
+            ids[i] = idx
+
+        # searchsorted butuh urutan start yang monoton
+        order = np.argsort(starts, kind='stable')
+        return cls(starts[order], ends[order], ids[order], vocab)
+
+    @classmethod
+    def from_segments(cls, segments):
+        """Build index directly from whisper_result['segments']"""
+        return cls.from_words([w for seg in segments for w in seg.get('words', [])])
+
+    def __len__(self):
+        return len(self.starts)
+
+    def range_slice(self, start_t, end_t):
+        """Return (lo, hi) bounds of words that start inside [start_t, end_t]"""
+        lo = int(np.searchsorted(self.starts, start_t, side='left'))
+        hi = int(np.searchsorted(self.starts, end_t, side='right'))
+        return lo, hi
+
+    def words_between(self, start_t, end_t):
+        """Words fully inside [start_t, end_t], as whisper-style dicts"""
+        lo, hi = self.range_slice(start_t, end_t)
+        if hi <= lo:
+            return []
+
+        ends = self.ends[lo:hi]
+        keep = np.nonzero(ends <= end_t)[0] + lo
+        return [
+            {'word': self.vocab[self.ids[i]], 'start': float(self.starts[i]), 'end': float(self.ends[i])}
+            for i in keep
+        ]
+
+    def iter_words(self, limit=None):
+        """Iterate words in time order (optionally only the first `limit`)"""
+        n = len(self) if limit is None else min(limit, len(self))
+        for i in range(n):
+            yield {'word': self.vocab[self.ids[i]], 'start': float(self.starts[i]), 'end': float(self.ends[i])}
+
+    def save(self, directory):
+        """Persist index as .npy files so worker processes can mmap it read-only"""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'starts.npy'), self.starts)
+        np.save(os.path.join(directory, 'ends.npy'), self.ends)
+        np.save(os.path.join(directory, 'ids.npy'), self.ids)
+        with open(os.path.join(directory, 'vocab.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.vocab, f, ensure_ascii=False)
+        self.path = directory
+        return directory
+
+    @classmethod
+    def load(cls, directory):
+        """Open a saved index; arrays are memory-mapped, not copied"""
+        starts = np.load(os.path.join(directory, 'starts.npy'), mmap_mode='r')
+        ends = np.load(os.path.join(directory, 'ends.npy'), mmap_mode='r')
+        ids = np.load(os.path.join(directory, 'ids.npy'), mmap_mode='r')
+        with open(os.path.join(directory, 'vocab.json'), 'r', encoding='utf-8') as f:
+            vocab = json.load(f)
+        return cls(starts, ends, ids, vocab, path=directory)
+
+    def __reduce__(self):
+        # Jika sudah disimpan ke disk, kirim path saja ke worker (mmap ulang di sana)
+        if self.path:
+            return (WordIndex.load, (self.path,))
+        return (WordIndex, (np.asarray(self.starts), np.asarray(self.ends), np.asarray(self.ids), self.vocab))
@@ -0,0 +1,182 @@
+"""
+Workspace Manager - direktori kerja terisolasi per job
+- Job dir (disk, persisten): manifest, video sumber, transkrip -> untuk resume
+- Scratch dir (tmpfs jika muat): audio WAV, file temp per klip -> selalu dihapus
+  saat job selesai, gagal, atau dibatalkan
+Satu job hanya boleh dipakai satu proses sekaligus (file lock di job dir).
+"""
+
+import os
+import sys
+import time
+import uuid
+import shutil
+from contextlib import contextmanager
+
+MB = 1024 * 1024
+
+
+class WorkspaceBusy(RuntimeError):
+    """The job is already being processed by another process / GUI instance"""
+
+
+class WorkspaceFull(RuntimeError):
+    """Writing the requested bytes would exceed the scratch budget or free disk space"""
+
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _lock_file(f):
+    """Non-blocking exclusive lock, released by the OS if the process dies"""
+    try:
+        if sys.platform == 'win32':
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock_file(f):
+    try:
+        if sys.platform == 'win32':
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    except OSError:
+        pass
+
+
+class Workspace:
+    """One job's persistent dir plus its private scratch dir"""
+
+    def __init__(self, job_dir, scratch_dir, budget_bytes, on_tmpfs):
+        self.job_dir = job_dir
+        self.scratch_dir = scratch_dir
+        self.budget_bytes = budget_bytes
+        self.on_tmpfs = on_tmpfs
+
+    def path(self, name):
+        """Path for a scratch file (deleted when the job ends)"""
+        return os.path.join(self.scratch_dir, name)
+
+    def usage(self):
+        return _dir_size(self.scratch_dir)
+
+    def reserve(self, nbytes):
+        """Check that `nbytes` more scratch data fits in the budget and on the device"""
+        used = self.usage()
+        if used + nbytes > self.budget_bytes:
+            raise WorkspaceFull(
+                f"Scratch budget exceeded: {used // MB} MB used + {nbytes // MB} MB > {self.budget_bytes // MB} MB")
+        free = shutil.disk_usage(self.scratch_dir).free
+        if nbytes > free:
+            raise WorkspaceFull(f"Not enough free space in {self.scratch_dir}: need {nbytes // MB} MB")
+
+    def remove(self, name):
+        path = self.path(name)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class WorkspaceManager:
+    """
+    Membuat workspace unik per job. Scratch ditaruh di tmpfs (/dev/shm) jika ruang
+    kosongnya cukup untuk estimasi job + cadangan, selain itu di `root`/scratch.
+    Cache video sumber di job dir dibatasi `cache_budget_mb` (LRU).
+    """
+
+    def __init__(self, root="temp", scratch_budget_mb=4096, cache_budget_mb=20480,
+                 use_tmpfs=True, tmpfs_path="/dev/shm", tmpfs_reserve_mb=512):
+        self.root = root
+        self.jobs_root = os.path.join(root, "jobs")
+        self.scratch_root = os.path.join(root, "scratch")
+        self.scratch_budget = scratch_budget_mb * MB
+        self.cache_budget = cache_budget_mb * MB
+        self.tmpfs_path = tmpfs_path if use_tmpfs and os.path.isdir(tmpfs_path) else None
+        self.tmpfs_reserve = tmpfs_reserve_mb * MB
+        os.makedirs(self.jobs_root, exist_ok=True)
+        os.makedirs(self.scratch_root, exist_ok=True)
+
+    def _scratch_parent(self, estimate_bytes):
+        if self.tmpfs_path:
+            try:
+                free = shutil.disk_usage(self.tmpfs_path).free
+                if free - estimate_bytes >= self.tmpfs_reserve:
+                    return self.tmpfs_path, True
+            except OSError:
+                pass
+        return self.scratch_root, False
+
+    @contextmanager
+    def open(self, job_dir, estimate_bytes=0):
+        """Lock the job, create its scratch dir, and always clean the scratch dir up on exit"""
+        os.makedirs(job_dir, exist_ok=True)
+        lock = open(os.path.join(job_dir, ".lock"), "a+")
+        if not _lock_file(lock):
+            lock.close()
+            raise WorkspaceBusy(f"Job {os.path.basename(job_dir)} sedang diproses oleh proses lain")
+
+        parent, on_tmpfs = self._scratch_parent(estimate_bytes)
+        scratch = os.path.join(parent, f"autoshorts-{os.path.basename(job_dir)}-{uuid.uuid4().hex[:8]}")
+        os.makedirs(scratch)
+        ws = Workspace(job_dir, scratch, self.scratch_budget, on_tmpfs)
+        try:
+            yield ws
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+            # Tandai job terakhir dipakai (untuk LRU cache sumber)
+            os.utime(job_dir, None)
+            _unlock_file(lock)
+            lock.close()
+            self.prune_cache(keep=job_dir)
+
+    def prune_cache(self, keep=None):
+        """Delete cached source videos of least recently used, unlocked jobs until under budget"""
+        jobs = []
+        for name in os.listdir(self.jobs_root):
+            job_dir = os.path.join(self.jobs_root, name)
+            if os.path.isdir(job_dir):
+                jobs.append((os.path.getmtime(job_dir), job_dir, _dir_size(job_dir)))
+
+        total = sum(size for _, _, size in jobs)
+        for _, job_dir, size in sorted(jobs):
+            if total <= self.cache_budget:
+                break
+            if keep and os.path.abspath(job_dir) == os.path.abspath(keep):
+                continue
+            with open(os.path.join(job_dir, ".lock"), "a+") as lock:
+                if not _lock_file(lock):
+                    continue  # sedang dipakai
+                # Manifest + transkrip kecil, tetap disimpan; sumber + intermediate render yang besar dibuang
+                # (tahap 'source' di manifest otomatis dianggap belum selesai)
+                for fname in os.listdir(job_dir):
+                    if fname.startswith(("source_video", "raw_video", "mezzanine_")):
+                        path = os.path.join(job_dir, fname)
+                        total -= os.path.getsize(path)
+                        os.remove(path)
+                _unlock_file(lock)
+
+    def cleanup_stale_scratch(self, max_age_hours=24):
+        """Remove scratch dirs left behind by processes that were killed"""
+        for parent in filter(None, (self.scratch_root, self.tmpfs_path)):
+            for name in os.listdir(parent):
+                path = os.path.join(parent, name)
+                if name.startswith("autoshorts-") and time.time() - os.path.getmtime(path) > max_age_hours * 3600:
+                    shutil.rmtree(path, ignore_errors=True)